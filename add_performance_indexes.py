@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Script to add the composite indexes declared in models.py for the hot query shapes
+(keyset pagination, active skill listings, per-user exchange and notification lookups)
+"""
+
+from sqlalchemy import inspect
+from database import engine
+from models import User, Skill, SkillExchangeRequest, Notification
+
+# Indexes added after the initial schema, by table
+PERFORMANCE_INDEXES = {
+    "users": ["ix_users_created_at_id"],
+    "skills": ["ix_skills_created_at_id", "ix_skills_active_category_created_at", "ix_skills_user_active"],
+    "skill_exchange_requests": ["ix_skill_exchange_requests_requester_created_at_id", "ix_skill_exchange_requests_owner_created_at_id"],
+    "notifications": ["ix_notifications_user_created_at_id", "ix_notifications_user_is_read"],
+}
+
+def get_performance_indexes():
+    """Index objects from the model metadata, in PERFORMANCE_INDEXES order"""
+    tables = {model.__tablename__: model.__table__ for model in (User, Skill, SkillExchangeRequest, Notification)}
+    indexes = []
+    for table_name, index_names in PERFORMANCE_INDEXES.items():
+        by_name = {index.name: index for index in tables[table_name].indexes}
+        indexes.extend(by_name[name] for name in index_names)
+    return indexes
+
+def add_performance_indexes(bind=engine):
+    """Create any missing performance index"""
+    try:
+        inspector = inspect(bind)
+        for index in get_performance_indexes():
+            existing = {ix["name"] for ix in inspector.get_indexes(index.table.name)}
+            if index.name in existing:
+                print(f"SUCCESS: '{index.name}' already exists")
+                continue
+            print(f"Creating index '{index.name}' on {index.table.name}...")
+            index.create(bind=bind)
+        print("SUCCESS: All performance indexes are in place")
+    except Exception as e:
+        print(f"ERROR: Error adding performance indexes: {e}")
+        raise
+
+if __name__ == "__main__":
+    add_performance_indexes()
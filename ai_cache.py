@@ -0,0 +1,192 @@
+"""
+Content-addressed cache for Gemini responses
+Keys are a SHA-256 of the operation, the model, the prompt version and the exact inputs,
+so byte-identical analyses are answered without a model call. Parsed JSON results live
+in an in-memory LRU (per worker) in front of a SQLite file shared by all workers on the
+host; both tiers expire entries after AI_CACHE_TTL_SECONDS.
+
+Only successful model responses are stored, never the keyword fallbacks, so a quota or
+network failure is retried on the next request. Disk errors are logged and treated as
+misses: the cache can never fail an AI request.
+
+Configuration (database.Settings, from the environment or .env):
+- AI_CACHE_TTL_SECONDS (default 7 days, 0 disables caching)
+- AI_CACHE_MAX_ENTRIES: in-memory entries per worker
+- AI_CACHE_DISK_MAX_ENTRIES: rows kept in the SQLite tier, least recently used go first
+- AI_CACHE_PATH: SQLite file, empty for memory only
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+from database import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when prompts change so answers to old prompts are not served
+PROMPT_VERSION = 1
+# Evict over-limit disk rows every this many writes rather than on each one
+DISK_EVICTION_INTERVAL = 100
+
+class AIResponseCache:
+    """Two-tier (memory LRU + SQLite) TTL cache of parsed model responses"""
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int,
+        path: Optional[str] = None,
+        disk_max_entries: int = 100000,
+        clock: Callable[[], float] = time.time
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path or None
+        self.disk_max_entries = disk_max_entries
+        # Wall-clock seconds, shared with other workers through the expires_at column
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(operation: str, model: str, *inputs) -> str:
+        payload = json.dumps([operation, model, PROMPT_VERSION, inputs], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # SQLite tier
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets workers read while another writes"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS ai_responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_ai_responses_accessed_at ON ai_responses (accessed_at)")
+            self._local.connection = connection
+        return connection
+
+    def _disk_get(self, key: str):
+        try:
+            connection = self._connection()
+            row = connection.execute("SELECT value, expires_at FROM ai_responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = self.clock()
+            if row[1] <= now:
+                connection.execute("DELETE FROM ai_responses WHERE key = ?", (key,))
+                return None
+            connection.execute("UPDATE ai_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(row[0]), row[1]
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"AI cache read failed: {e}")
+            return None
+
+    def _disk_put(self, key: str, value: Any, expires_at: float):
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO ai_responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at, self.clock())
+            )
+            with self._lock:
+                self._writes += 1
+                evict = self._writes % DISK_EVICTION_INTERVAL == 0
+            if evict:
+                self._disk_evict(connection)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"AI cache write failed: {e}")
+
+    def _disk_evict(self, connection: sqlite3.Connection):
+        """Drop expired rows, then the least recently used ones beyond disk_max_entries"""
+        connection.execute("DELETE FROM ai_responses WHERE expires_at <= ?", (self.clock(),))
+        connection.execute(
+            "DELETE FROM ai_responses WHERE key IN ("
+            "SELECT key FROM ai_responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_max_entries,)
+        )
+
+    # Memory tier
+    def _remember(self, key: str, value: Any, expires_at: float):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached response for key, as a copy the caller may modify, or None"""
+        if self.ttl_seconds <= 0:
+            return None
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return copy.deepcopy(entry[0])
+        if self.path:
+            stored = self._disk_get(key)
+            if stored is not None:
+                self._remember(key, stored[0], stored[1])
+                with self._lock:
+                    self.disk_hits += 1
+                return copy.deepcopy(stored[0])
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any):
+        """Store a parsed model response; call only for real model output, not fallbacks"""
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = self.clock() + self.ttl_seconds
+        self._remember(key, copy.deepcopy(value), expires_at)
+        if self.path:
+            self._disk_put(key, value, expires_at)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            try:
+                self._connection().execute("DELETE FROM ai_responses")
+            except sqlite3.Error as e:
+                logger.warning(f"AI cache clear failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "disk_path": self.path,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+ai_cache = AIResponseCache(
+    ttl_seconds=settings.ai_cache_ttl_seconds,
+    max_entries=settings.ai_cache_max_entries,
+    path=settings.ai_cache_path,
+    disk_max_entries=settings.ai_cache_disk_max_entries
+)
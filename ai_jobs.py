@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+AI work run as background jobs (job_queue.py)
+/api/ai/analyze-skill and /api/ai/suggest-skills with background=true queue these and
+return the job id; GET /api/ai/jobs/{id} returns the result once a worker ran it.
+"""
+
+from typing import Any, Dict, List
+from database import SessionLocal
+from gemini_service import gemini_service
+from job_queue import job_queue, run_coroutine
+from models import Skill
+
+def user_skills_for_suggestions(db, user_id: int) -> List[Dict[str, str]]:
+    """The user's skills in the shape GeminiAIService.suggest_skills takes (blocking query)"""
+    return [
+        {
+            "title": skill.title,
+            "description": skill.description,
+            "category": skill.category,
+            "proficiency_level": skill.proficiency_level
+        }
+        for skill in db.query(Skill).filter(Skill.user_id == user_id).all()
+    ]
+
+async def skill_suggestions(user_skills: List[Dict[str, str]]) -> Dict[str, Any]:
+    """Suggestions for these skills, as /api/ai/suggest-skills returns them"""
+    result = await gemini_service.suggest_skills(user_skills)
+    if user_skills:
+        result = dict(result, based_on_skills=len(user_skills))
+    return result
+
+@job_queue.handler("analyze_skill")
+async def run_analyze_skill(payload: Dict) -> Dict[str, Any]:
+    return await gemini_service.analyze_skill_description(payload["title"], payload["description"], payload.get("category", ""))
+
+@job_queue.handler("suggest_skills")
+def run_suggest_skills(payload: Dict) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        user_skills = user_skills_for_suggestions(db, payload["user_id"])
+    finally:
+        db.close()
+    return run_coroutine(skill_suggestions(user_skills))
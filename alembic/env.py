@@ -0,0 +1,48 @@
+"""
+Alembic environment for the Skill Swap database
+Targets the metadata of models.py and the URL from database.settings
+"""
+
+from logging.config import fileConfig
+from alembic import context
+from database import Base, engine, settings
+import models  # noqa: F401 - registers the tables on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def run_migrations_offline():
+    """Emit the migration SQL without connecting (alembic upgrade head --sql)"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url") or settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """Run the migrations on a connection from the application engine (or one passed in by the caller)"""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_on_connection(connection)
+        return
+    with engine.connect() as connection:
+        _run_on_connection(connection)
+
+def _run_on_connection(connection):
+    # Batch mode lets ALTER-style operations work on SQLite during development
+    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
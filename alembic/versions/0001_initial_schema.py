@@ -0,0 +1,89 @@
+"""initial schema
+
+Tables as created by Base.metadata.create_all before migrations existed.
+Databases bootstrapped that way already have them, so existing tables are skipped.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def _has_table(name):
+    # Offline (--sql) runs cannot inspect, emit the full DDL
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+def upgrade():
+    if not _has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("username", sa.String(50), nullable=False),
+            sa.Column("email", sa.String(100), nullable=False),
+            sa.Column("password_hash", sa.String(255), nullable=False),
+            sa.Column("full_name", sa.String(100), nullable=False),
+            sa.Column("bio", sa.Text()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("is_active", sa.Boolean()),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if not _has_table("skills"):
+        op.create_table(
+            "skills",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("title", sa.String(100), nullable=False),
+            sa.Column("description", sa.Text(), nullable=False),
+            sa.Column("category", sa.String(50), nullable=False),
+            sa.Column("proficiency_level", sa.String(20), nullable=False),
+            sa.Column("value", sa.Integer()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("is_active", sa.Boolean()),
+        )
+        op.create_index("ix_skills_id", "skills", ["id"])
+
+    if not _has_table("skill_exchange_requests"):
+        op.create_table(
+            "skill_exchange_requests",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("skill_id", sa.Integer(), sa.ForeignKey("skills.id"), nullable=False),
+            sa.Column("requester_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("skill_owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("message", sa.Text(), nullable=False),
+            sa.Column("status", sa.String(20)),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+        op.create_index("ix_skill_exchange_requests_id", "skill_exchange_requests", ["id"])
+
+    if not _has_table("notifications"):
+        op.create_table(
+            "notifications",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("title", sa.String(200), nullable=False),
+            sa.Column("message", sa.Text(), nullable=False),
+            sa.Column("type", sa.String(50), nullable=False),
+            sa.Column("related_id", sa.Integer()),
+            sa.Column("is_read", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_notifications_id", "notifications", ["id"])
+
+def downgrade():
+    op.drop_table("notifications")
+    op.drop_table("skill_exchange_requests")
+    op.drop_table("skills")
+    op.drop_table("users")
@@ -0,0 +1,51 @@
+"""performance indexes
+
+Composite indexes for keyset pagination and the hot listing/count queries.
+Skips indexes already created by add_performance_indexes.py.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# name -> (table, columns)
+INDEXES = {
+    "ix_users_created_at_id": ("users", ["created_at", "id"]),
+    "ix_skills_active_category_created_at": ("skills", ["is_active", "category", "created_at", "id"]),
+    "ix_skills_user_active": ("skills", ["user_id", "is_active"]),
+    "ix_skill_exchange_requests_requester_created_at_id": ("skill_exchange_requests", ["requester_id", "created_at", "id"]),
+    "ix_skill_exchange_requests_owner_created_at_id": ("skill_exchange_requests", ["skill_owner_id", "created_at", "id"]),
+    "ix_notifications_user_created_at_id": ("notifications", ["user_id", "created_at", "id"]),
+    "ix_notifications_user_is_read": ("notifications", ["user_id", "is_read"]),
+}
+
+def _existing_indexes(table):
+    if context.is_offline_mode():
+        return set()
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+def upgrade():
+    for name, (table, columns) in INDEXES.items():
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+    # Filtered to active skills where the dialect supports partial indexes
+    if "ix_skills_created_at_id" not in _existing_indexes("skills"):
+        active = sa.text("is_active = true") if op.get_context().dialect.name == "postgresql" else sa.text("is_active = 1")
+        op.create_index(
+            "ix_skills_created_at_id", "skills", ["created_at", "id"],
+            sqlite_where=active, postgresql_where=active, mssql_where=active
+        )
+
+def downgrade():
+    op.drop_index("ix_skills_created_at_id", table_name="skills")
+    for name, (table, columns) in reversed(list(INDEXES.items())):
+        op.drop_index(name, table_name=table)
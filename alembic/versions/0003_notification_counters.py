@@ -0,0 +1,50 @@
+"""notification counters
+
+Per-user unread notification counters, backfilled from the notifications table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def _has_table(name):
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+def upgrade():
+    if not _has_table("notification_counters"):
+        op.create_table(
+            "notification_counters",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("unread_count", sa.Integer(), nullable=False),
+        )
+    counters = sa.table(
+        "notification_counters",
+        sa.column("user_id", sa.Integer()),
+        sa.column("unread_count", sa.Integer()),
+    )
+    notifications = sa.table(
+        "notifications",
+        sa.column("user_id", sa.Integer()),
+        sa.column("is_read", sa.Boolean()),
+    )
+    # Also when the table exists (create_all makes it empty): users with a counter keep it
+    op.execute(counters.insert().from_select(
+        ["user_id", "unread_count"],
+        sa.select(notifications.c.user_id, sa.func.count())
+        .where(notifications.c.is_read == sa.false())
+        .where(~sa.exists().where(counters.c.user_id == notifications.c.user_id))
+        .group_by(notifications.c.user_id)
+    ))
+
+def downgrade():
+    op.drop_table("notification_counters")
@@ -0,0 +1,41 @@
+"""notifications archive
+
+Destination table for the notification retention job in archive mode.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def _has_table(name):
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+def upgrade():
+    if _has_table("notifications_archive"):
+        return
+    op.create_table(
+        "notifications_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("related_id", sa.Integer()),
+        sa.Column("is_read", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_notifications_archive_user_created_at", "notifications_archive", ["user_id", "created_at"])
+
+def downgrade():
+    op.drop_table("notifications_archive")
@@ -0,0 +1,43 @@
+"""skill analyses
+
+Stored AI analysis per skill, computed in the background by skill_analysis.py.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def _has_table(name):
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+def upgrade():
+    if _has_table("skill_analyses"):
+        return
+    op.create_table(
+        "skill_analyses",
+        sa.Column("skill_id", sa.Integer(), sa.ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("suggested_proficiency", sa.String(20)),
+        sa.Column("suggested_category", sa.String(50)),
+        sa.Column("analysis", sa.JSON()),
+        sa.Column("categorization", sa.JSON()),
+        sa.Column("is_fallback", sa.Boolean()),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text()),
+        sa.Column("analyzed_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_skill_analyses_status", "skill_analyses", ["status"])
+
+def downgrade():
+    op.drop_table("skill_analyses")
@@ -0,0 +1,81 @@
+"""
+Per-token cache of authenticated users for routers.users.get_current_user
+A dashboard firing several API calls with the same token resolves the user once.
+
+The cache is per worker process: update_user invalidates entries in the worker
+that handled the change, other workers pick it up when their entries expire
+(AUTH_CACHE_TTL_SECONDS, and never later than the token's own expiry).
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from database import settings
+
+class CachedUser:
+    """Detached snapshot of the User columns handlers and UserResponse read"""
+
+    __slots__ = ("id", "username", "email", "full_name", "bio", "created_at", "is_active")
+
+    def __init__(self, user):
+        for field in self.__slots__:
+            setattr(self, field, getattr(user, field))
+
+class AuthenticatedUserCache:
+    """Bounded LRU of token -> CachedUser with per-entry expiry, safe across threadpool workers"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[CachedUser]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def put(self, token: str, user, token_expires_at: Optional[float] = None) -> CachedUser:
+        if self.ttl_seconds <= 0:
+            return CachedUser(user)
+        cached = CachedUser(user)
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (cached, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached token of a user (username change, deactivation)"""
+        with self._lock:
+            stale = [key for key, (user, _) in self._entries.items() if user.id == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+auth_cache = AuthenticatedUserCache(settings.auth_cache_ttl_seconds, settings.auth_cache_max_entries)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark the hot queries before and after the performance indexes
+Seeds a temporary SQLite database, prints EXPLAIN QUERY PLAN and timings for each query
+
+Usage: python benchmark_query_plans.py [users] [skills_per_user]
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, select, func, and_, or_, true, text, insert
+from database import Base
+from models import User, Skill, SkillExchangeRequest, Notification
+from add_performance_indexes import get_performance_indexes, add_performance_indexes
+
+CATEGORIES = ["Programming", "Design", "Music", "Business", "Writing", "Teaching", "Finance", "Other"]
+LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+
+def seed(engine, user_count, skills_per_user):
+    rng = random.Random(42)
+    start = datetime(2023, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x",
+             "full_name": f"User {i}", "is_active": True, "created_at": start + timedelta(minutes=i)}
+            for i in range(1, user_count + 1)
+        ])
+        skills = [
+            {"user_id": rng.randint(1, user_count), "title": f"Skill {i}", "description": "d",
+             "category": rng.choice(CATEGORIES), "proficiency_level": rng.choice(LEVELS), "value": 0,
+             "is_active": rng.random() > 0.2, "created_at": start + timedelta(seconds=i * 7)}
+            for i in range(user_count * skills_per_user)
+        ]
+        connection.execute(insert(Skill), skills)
+        connection.execute(insert(SkillExchangeRequest), [
+            {"skill_id": rng.randint(1, len(skills)), "requester_id": rng.randint(1, user_count),
+             "skill_owner_id": rng.randint(1, user_count), "message": "m", "status": "pending",
+             "created_at": start + timedelta(seconds=i * 11)}
+            for i in range(user_count * skills_per_user)
+        ])
+        connection.execute(insert(Notification), [
+            {"user_id": rng.randint(1, user_count), "title": "t", "message": "m", "type": "swap_request",
+             "is_read": rng.random() > 0.3, "created_at": start + timedelta(seconds=i * 5)}
+            for i in range(user_count * skills_per_user * 2)
+        ])
+
+def hot_queries(user_id):
+    return {
+        "active skills page": select(Skill).where(Skill.is_active == true()).order_by(Skill.created_at.desc(), Skill.id.desc()).limit(100),
+        "active skills by category": select(Skill).where(and_(Skill.is_active == true(), Skill.category == "Music")).order_by(Skill.created_at.desc(), Skill.id.desc()).limit(100),
+        "user's active skills": select(Skill).where(and_(Skill.user_id == user_id, Skill.is_active == true())),
+        "exchange inbox": select(SkillExchangeRequest).where(or_(SkillExchangeRequest.requester_id == user_id, SkillExchangeRequest.skill_owner_id == user_id)).order_by(SkillExchangeRequest.created_at.desc(), SkillExchangeRequest.id.desc()).limit(100),
+        "notifications page": select(Notification).where(Notification.user_id == user_id).order_by(Notification.created_at.desc(), Notification.id.desc()).limit(100),
+        "unread count": select(func.count(Notification.id)).where(and_(Notification.user_id == user_id, Notification.is_read == False)),
+        "users page": select(User).where(User.is_active == True).order_by(User.created_at.desc(), User.id.desc()).limit(100),
+    }
+
+def run(engine, label, user_id, repeat=20):
+    print(f"\n=== {label} ===")
+    with engine.connect() as connection:
+        for name, query in hot_queries(user_id).items():
+            sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            started = time.perf_counter()
+            for _ in range(repeat):
+                connection.execute(text(sql)).fetchall()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+            print(f"{name:28s} {elapsed_ms:8.3f} ms  | {' ; '.join(plan)}")
+
+def main():
+    user_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    skills_per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    engine = create_engine(f"sqlite:///{path}")
+
+    # Initial schema: everything except the performance indexes
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for index in get_performance_indexes():
+            index.drop(bind=connection)
+    print(f"Seeding {user_count} users, {user_count * skills_per_user} skills and requests...")
+    seed(engine, user_count, skills_per_user)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+
+    user_id = user_count // 2
+    run(engine, "before", user_id)
+    add_performance_indexes(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+    run(engine, "after", user_id)
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark list endpoint serialization: ORM objects + pydantic response models + json
+(what FastAPI does for response_model) against the fast_json path (column tuples + orjson)
+Seeds a temporary SQLite database and times fetching and encoding 100 and 1000 row pages
+
+Usage: python benchmark_serialization.py [repeats]
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import SkillExchangeRequest
+from schemas import SkillResponse, UserResponse
+from benchmark_query_plans import seed
+import crud
+import crud_async
+import fast_json
+
+PAGE_SIZES = [100, 1000]
+
+def fastapi_encode(content, adapter=None) -> bytes:
+    """Validate against the response model, jsonable_encoder, then json.dumps like JSONResponse"""
+    if adapter is not None:
+        content = adapter.validate_python(content, from_attributes=True)
+    content = jsonable_encoder(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def median_ms(samples):
+    return statistics.median(samples) * 1000
+
+async def time_async(fetch, encode, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encode(await fetch())
+        samples.append(time.perf_counter() - start)
+    return median_ms(samples)
+
+def time_sync(fetch, encode, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encode(fetch())
+        samples.append(time.perf_counter() - start)
+    return median_ms(samples)
+
+async def run(repeats):
+    owner_id = 1
+    path = os.path.join(tempfile.mkdtemp(), "serialization.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    seed(engine, 1200, 2)
+    # A busy inbox so exchange pages are full
+    with engine.begin() as connection:
+        connection.execute(insert(SkillExchangeRequest), [
+            {"skill_id": i + 1, "requester_id": owner_id, "skill_owner_id": i % 1199 + 2, "message": "m",
+             "status": "pending", "created_at": datetime(2024, 1, 1) + timedelta(seconds=i)}
+            for i in range(max(PAGE_SIZES))
+        ])
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+    skills_adapter = TypeAdapter(List[SkillResponse])
+    users_adapter = TypeAdapter(List[UserResponse])
+
+    print(f"{'endpoint':<12} {'rows':>5} {'pydantic ms':>12} {'fast_json ms':>13} {'speedup':>8}")
+    for limit in PAGE_SIZES:
+        results = {}
+        async with AsyncSession() as db:
+            results["skills"] = (
+                await time_async(lambda: crud_async.get_skills(db, limit=limit), lambda rows: fastapi_encode(rows, skills_adapter), repeats),
+                await time_async(lambda: crud_async.get_skill_rows(db, limit=limit), fast_json.dumps, repeats),
+            )
+            results["users"] = (
+                await time_async(lambda: crud_async.get_users(db, limit=limit), lambda rows: fastapi_encode(rows, users_adapter), repeats),
+                await time_async(lambda: crud_async.get_user_rows(db, limit=limit), fast_json.dumps, repeats),
+            )
+        db = sessionmaker(bind=engine)()
+        results["exchanges"] = (
+            time_sync(lambda: crud.get_skill_exchange_requests_for_user(db, owner_id, limit=limit), fastapi_encode, repeats),
+            time_sync(lambda: crud.get_skill_exchange_rows_for_user(db, owner_id, limit=limit), fast_json.dumps, repeats),
+        )
+        db.close()
+        for endpoint, (standard, fast) in results.items():
+            print(f"{endpoint:<12} {limit:>5} {standard:>12.2f} {fast:>13.2f} {standard / fast:>7.1f}x")
+    print(f"encoder: {'orjson' if fast_json.orjson else 'stdlib json'}")
+    await async_engine.dispose()
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    asyncio.run(run(repeats))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Build the frontend for production into frontend/dist
+Scripts and stylesheets get content-hashed names (style.3f2a9c1e.css) so they can be cached
+for a year, HTML pages are rewritten to reference them, and every compressible file gets
+.gz (and .br, with the brotli package installed) siblings that PrecompressedStaticFiles
+serves without compressing per request. A manifest.json maps source to hashed names.
+
+Usage: python build_static.py [source_dir] [output_dir]
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from compression import brotli
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+HASHED_EXTENSIONS = (".js", ".css")
+COMPRESSED_EXTENSIONS = (".html", ".js", ".css", ".json", ".svg", ".txt")
+# Precompressed files only when they save at least this much
+MIN_SAVING = 0.1
+# src="..." / href="..." references to local files
+ASSET_REFERENCE = re.compile(r"""(\b(?:src|href)=["'])([^"':?#]+)(["'])""")
+
+def hashed_name(name: str, content: bytes) -> str:
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:8]}{extension}"
+
+def write_compressed(path: str, content: bytes):
+    variants = [(".gz", gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(content, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) <= len(content) * (1 - MIN_SAVING):
+            with open(path + suffix, "wb") as f:
+                f.write(compressed)
+
+def rewrite_references(html: str, manifest: dict) -> str:
+    return ASSET_REFERENCE.sub(lambda m: m.group(1) + manifest.get(m.group(2), m.group(2)) + m.group(3), html)
+
+def build(source_dir: str = SOURCE_DIR, output_dir: str = None):
+    """Build source_dir into output_dir (default source_dir/dist) and return the manifest"""
+    output_dir = output_dir or os.path.join(source_dir, "dist")
+    if os.path.isdir(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+
+    files = sorted(
+        name for name in os.listdir(source_dir)
+        if os.path.isfile(os.path.join(source_dir, name))
+    )
+    manifest = {}
+    for name in files:
+        if name.endswith(HASHED_EXTENSIONS):
+            with open(os.path.join(source_dir, name), "rb") as f:
+                manifest[name] = hashed_name(name, f.read())
+
+    for name in files:
+        with open(os.path.join(source_dir, name), "rb") as f:
+            content = f.read()
+        if name.endswith(".html"):
+            content = rewrite_references(content.decode("utf-8"), manifest).encode("utf-8")
+        target = os.path.join(output_dir, manifest.get(name, name))
+        with open(target, "wb") as f:
+            f.write(content)
+        if name.endswith(COMPRESSED_EXTENSIONS):
+            write_compressed(target, content)
+
+    with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SOURCE_DIR
+    output = sys.argv[2] if len(sys.argv) > 2 else None
+    manifest = build(source, output)
+    print(f"SUCCESS: Built {source} with {len(manifest)} hashed assets ({'gzip + brotli' if brotli else 'gzip'})")
@@ -0,0 +1,80 @@
+"""
+Versioned cache for data derived from the public skill catalogue
+Skill writes and owner profile changes bump the catalogue version, which drops every
+cached entry at once; the TTL bounds how long a worker can serve data made stale by a
+write handled in another worker. The version also feeds the ETags of cached responses.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from database import settings
+
+class VersionedCache:
+    """Bounded LRU with per-entry expiry, cleared whenever the version is bumped"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version = 1
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self):
+        """Invalidate everything cached so far"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, version: int):
+        """
+        Store a value computed while the cache was at version; dropped if a write
+        bumped the version meanwhile, since the value may predate that write
+        """
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"version": self.version, "entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self):
+        return len(self._entries)
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag of a response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check, using the weak comparison RFC 7232 prescribes for GET"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any((candidate[2:] if candidate.startswith("W/") else candidate) == etag for candidate in candidates)
+
+skill_catalog_cache = VersionedCache(settings.skill_cache_ttl_seconds, settings.skill_cache_max_entries)
@@ -0,0 +1,189 @@
+"""
+Response compression for the API and precompressed static files for the frontend
+
+CompressionMiddleware gzip- or brotli-encodes compressible responses (JSON, HTML, text)
+once they reach COMPRESSION_MINIMUM_SIZE bytes. Streamed responses are compressed
+chunk by chunk with a flush after each one; text/event-stream is never compressed so
+notification events are not held back in a compressor buffer.
+
+PrecompressedStaticFiles serves the `.br` / `.gz` siblings that build_static.py writes
+next to each asset instead of compressing on every request, and marks content-hashed
+file names (style.3f2a9c1e.css) as immutable for a year.
+
+Brotli is used when the `brotli` package is installed, gzip otherwise.
+"""
+
+import os
+import re
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Media types worth compressing (parameters such as charset are ignored)
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "image/svg+xml",
+}
+
+# Names produced by build_static.py: <name>.<8+ hex digits>.<ext>
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# Precompressed sibling suffix per encoding, in order of preference
+STATIC_ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+def accepted_encodings(accept_encoding: str):
+    """Encodings a client accepts (q > 0) from its Accept-Encoding header"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding)
+    if "*" in accepted:
+        accepted.update({"br", "gzip"})
+    return accepted
+
+def choose_encoding(accept_encoding: str):
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+class _Compressor:
+    """Incremental gzip/brotli encoder whose output can be flushed per chunk"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31: gzip container
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+def _media_type(headers) -> str:
+    return headers.get("content-type", "").split(";")[0].strip().lower()
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses for clients that accept gzip or br"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        await self.app(scope, receive, _CompressingSend(self, encoding, send))
+
+class _CompressingSend:
+    """Holds back http.response.start until the first body chunk shows whether to compress"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message = None
+        self.compressor = None
+
+    def _should_compress(self, status: int, headers, body: bytes, more_body: bool) -> bool:
+        if self.encoding is None or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        if _media_type(headers) not in COMPRESSIBLE_TYPES:
+            return False
+        return more_body or len(body) >= self.middleware.minimum_size
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = MutableHeaders(scope=start_message)
+            if _media_type(headers) in COMPRESSIBLE_TYPES:
+                headers.add_vary_header("Accept-Encoding")
+            if self._should_compress(start_message["status"], headers, body, more_body):
+                self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+                body = self.compressor.compress(body, final=not more_body)
+                headers["Content-Encoding"] = self.encoding
+                # The encoded bytes differ from the identity representation the ETag names
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+            await self.send(start_message)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        if self.compressor is not None:
+            body = self.compressor.compress(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers build-time .br/.gz variants and sets long-lived cache headers for hashed names"""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        response = None
+        for encoding, suffix in STATIC_ENCODINGS:
+            variant = f"{full_path}{suffix}"
+            if encoding in accepted and os.path.isfile(variant):
+                response = FileResponse(
+                    variant,
+                    status_code=status_code,
+                    stat_result=os.stat(variant),
+                    media_type=FileResponse(full_path).media_type,
+                    headers={"Content-Encoding": encoding}
+                )
+                break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["Vary"] = "Accept-Encoding"
+        hashed = HASHED_NAME.search(os.path.basename(str(full_path))) is not None
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if hashed else REVALIDATE_CACHE_CONTROL
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
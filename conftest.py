@@ -0,0 +1,12 @@
+"""
+Shared pytest setup
+Runs before the test modules import database.settings: skill writes made by the tests
+do not queue AI analysis jobs, and anything queued goes to a throwaway queue file
+instead of the developer's JOB_QUEUE_PATH.
+"""
+
+import os
+import tempfile
+
+os.environ["SKILL_ANALYSIS_ON_WRITE"] = "false"
+os.environ["JOB_QUEUE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="test-jobs-"), "jobs.sqlite3")
@@ -1,10 +1,23 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
-from models import User, Skill, SkillExchangeRequest, Notification
-from schemas import UserCreate, UserUpdate, SkillCreate, SkillUpdate, SkillExchangeRequestCreate, SkillExchangeRequestUpdate, NotificationCreate
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, true, func, insert, bindparam
+from sqlalchemy.exc import IntegrityError
+from models import User, Skill, SkillExchangeRequest, Notification, NotificationCounter
+from schemas import UserCreate, UserUpdate, SkillCreate, SkillUpdate, SkillExchangeRequestCreate, SkillExchangeRequestUpdate, NotificationCreate, NotificationResponse, SkillResponse, UserResponse
 import bcrypt
-from typing import Optional, List
+import logging
+from typing import Optional, List, Dict
 from datetime import datetime
+from collections import defaultdict
+from pagination import apply_cursor, newest_first
+from auth_cache import auth_cache
+from notification_hub import notification_hub
+from skill_search import skill_search_index
+from catalog_cache import skill_catalog_cache
+from database import settings
+from skill_analysis import mark_pending, queue_analysis
+import fast_json
+
+logger = logging.getLogger(__name__)
 
 # Password hashing functions
 def hash_password(password: str) -> str:
@@ -27,8 +40,11 @@ def get_user_by_username(db: Session, username: str):
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(User).filter(User.is_active == True).order_by(User.created_at.desc()).offset(skip).limit(limit).all()
+def get_users(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(User).filter(User.is_active == True).order_by(*newest_first(User))
+    if cursor:
+        return apply_cursor(query, User, cursor).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
 def create_user(db: Session, user: UserCreate):
     hashed_password = hash_password(user.password)
@@ -52,6 +68,10 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate):
             setattr(db_user, field, value)
         db.commit()
         db.refresh(db_user)
+        # Cached tokens still carry the old username/active flag
+        auth_cache.invalidate_user(user_id)
+        # Public skill listings embed the owner's profile
+        skill_catalog_cache.bump()
     return db_user
 
 def authenticate_user(db: Session, username: str, password: str):
@@ -63,17 +83,60 @@ def authenticate_user(db: Session, username: str, password: str):
     return user
 
 # Skill CRUD operations
+def _skill_written(db_skill: Skill, analyze: bool = False):
+    """Bring in-process views of the catalogue up to date after a committed skill write"""
+    skill_search_index.index_skill(db_skill)
+    skill_catalog_cache.bump()
+    if analyze:
+        _queue_skill_analysis(db_skill.id, db_skill.user_id)
+
+def _queue_skill_analysis(skill_id: int, user_id: int):
+    """Queue the analysis of a skill marked pending by mark_pending in the committed transaction"""
+    if settings.skill_analysis_on_write:
+        queue_analysis([skill_id], user_id=user_id)
+
 def get_skill(db: Session, skill_id: int):
     return db.query(Skill).options(joinedload(Skill.owner)).filter(Skill.id == skill_id).first()
 
-def get_skills(db: Session, skip: int = 0, limit: int = 100, category: Optional[str] = None):
-    query = db.query(Skill).options(joinedload(Skill.owner)).filter(Skill.is_active == True).order_by(Skill.created_at.desc())
+def get_skills(db: Session, skip: int = 0, limit: int = 100, category: Optional[str] = None, cursor: Optional[str] = None):
+    query = db.query(Skill).options(joinedload(Skill.owner)).filter(Skill.is_active == true()).order_by(*newest_first(Skill))
     if category:
         query = query.filter(Skill.category == category)
+    if cursor:
+        return apply_cursor(query, Skill, cursor).limit(limit).all()
     return query.offset(skip).limit(limit).all()
 
+def get_skill_facet_counts(db: Session):
+    """Active skill counts per (category, proficiency_level) in one grouped query"""
+    return [tuple(row) for row in db.query(Skill.category, Skill.proficiency_level, func.count(Skill.id)).filter(
+        Skill.is_active == true()
+    ).group_by(Skill.category, Skill.proficiency_level).all()]
+
+def summarize_facets(facet_counts, category: Optional[str] = None, proficiency_level: Optional[str] = None):
+    """
+    Facet counts for a filter from get_skill_facet_counts rows. Each facet is counted with
+    the other facet's filter applied but not its own, so the UI can show every alternative.
+    """
+    categories, levels, total = defaultdict(int), defaultdict(int), 0
+    for row_category, row_level, count in facet_counts:
+        if proficiency_level is None or row_level == proficiency_level:
+            categories[row_category] += count
+        if category is None or row_category == category:
+            levels[row_level] += count
+            if proficiency_level is None or row_level == proficiency_level:
+                total += count
+    by_count = lambda counts: [{"value": value, "count": count} for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+    return {"total": total, "category": by_count(categories), "proficiency_level": by_count(levels)}
+
+def get_skills_by_ids(db: Session, skill_ids: List[int]):
+    """Active skills with owners for the given ids, in the order of skill_ids"""
+    skills = {skill.id: skill for skill in db.query(Skill).options(joinedload(Skill.owner)).filter(
+        and_(Skill.id.in_(skill_ids), Skill.is_active == true())
+    )}
+    return [skills[skill_id] for skill_id in skill_ids if skill_id in skills]
+
 def get_skills_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Skill).options(joinedload(Skill.owner)).filter(and_(Skill.user_id == user_id, Skill.is_active == True)).order_by(Skill.created_at.desc()).offset(skip).limit(limit).all()
+    return db.query(Skill).options(joinedload(Skill.owner)).filter(and_(Skill.user_id == user_id, Skill.is_active == true())).order_by(Skill.created_at.desc()).offset(skip).limit(limit).all()
 
 def create_skill(db: Session, skill: SkillCreate, user_id: int):
     db_skill = Skill(
@@ -85,8 +148,11 @@ def create_skill(db: Session, skill: SkillCreate, user_id: int):
         user_id=user_id
     )
     db.add(db_skill)
+    db.flush()
+    analyze = mark_pending(db, db_skill)
     db.commit()
     db.refresh(db_skill)
+    _skill_written(db_skill, analyze)
     return db_skill
 
 def update_skill(db: Session, skill_id: int, skill_update: SkillUpdate):
@@ -95,8 +161,10 @@ def update_skill(db: Session, skill_id: int, skill_update: SkillUpdate):
         update_data = skill_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_skill, field, value)
+        analyze = mark_pending(db, db_skill)
         db.commit()
         db.refresh(db_skill)
+        _skill_written(db_skill, analyze)
     return db_skill
 
 def delete_skill(db: Session, skill_id: int):
@@ -105,186 +173,202 @@ def delete_skill(db: Session, skill_id: int):
         db_skill.is_active = False
         db.commit()
         db.refresh(db_skill)
+        _skill_written(db_skill)
     return db_skill
 
 # Skill Exchange Request CRUD operations
 def get_skill_exchange_request(db: Session, request_id: int):
     return db.query(SkillExchangeRequest).filter(SkillExchangeRequest.id == request_id).first()
 
+def _exchange_request_to_dict(request: SkillExchangeRequest):
+    """Flatten an exchange request with its preloaded relationships into the listing dict shape"""
+    requester = request.requester
+    skill = request.skill
+    skill_owner = request.skill_owner
+    return {
+        'id': request.id,
+        'skill_id': request.skill_id,
+        'requester_id': request.requester_id,
+        'skill_owner_id': request.skill_owner_id,
+        'message': request.message,
+        'status': request.status,
+        'created_at': request.created_at.isoformat() if request.created_at else None,
+        'updated_at': request.updated_at.isoformat() if request.updated_at else None,
+        'requester': {
+            'id': requester.id,
+            'username': requester.username,
+            'email': requester.email,
+            'full_name': requester.full_name
+        } if requester else None,
+        'skill': {
+            'id': skill.id,
+            'title': skill.title,
+            'category': skill.category,
+            'proficiency_level': skill.proficiency_level
+        } if skill else None,
+        'skill_owner': {
+            'id': skill_owner.id,
+            'username': skill_owner.username,
+            'email': skill_owner.email,
+            'full_name': skill_owner.full_name
+        } if skill_owner else None
+    }
+
+def _exchange_requests_with_relations(db: Session):
+    # Requester, skill and skill owner are fetched with one IN query each for the whole page,
+    # so a listing costs a constant number of round trips instead of 3 per row
+    return db.query(SkillExchangeRequest).options(
+        selectinload(SkillExchangeRequest.requester),
+        selectinload(SkillExchangeRequest.skill),
+        selectinload(SkillExchangeRequest.skill_owner)
+    )
+
 def get_skill_exchange_requests(db: Session, skip: int = 0, limit: int = 100, status: Optional[str] = None):
     try:
-        query = db.query(SkillExchangeRequest).order_by(SkillExchangeRequest.created_at.desc())
-        
-        # Load relationships separately to avoid complex joins
+        query = _exchange_requests_with_relations(db).order_by(SkillExchangeRequest.created_at.desc())
         requests = query.offset(skip).limit(limit).all()
-        
-        # Manually load relationships
-        result = []
-        for request in requests:
-            # Load requester
-            requester = db.query(User).filter(User.id == request.requester_id).first()
-            # Load skill and owner
-            skill = db.query(Skill).filter(Skill.id == request.skill_id).first()
-            skill_owner = db.query(User).filter(User.id == request.skill_owner_id).first()
-            
-            # Create response dict
-            request_dict = {
-                'id': request.id,
-                'skill_id': request.skill_id,
-                'requester_id': request.requester_id,
-                'skill_owner_id': request.skill_owner_id,
-                'message': request.message,
-                'status': request.status,
-                'created_at': request.created_at.isoformat() if request.created_at else None,
-                'updated_at': request.updated_at.isoformat() if request.updated_at else None,
-                'requester': {
-                    'id': requester.id,
-                    'username': requester.username,
-                    'email': requester.email,
-                    'full_name': requester.full_name
-                } if requester else None,
-                'skill': {
-                    'id': skill.id,
-                    'title': skill.title,
-                    'category': skill.category,
-                    'proficiency_level': skill.proficiency_level
-                } if skill else None,
-                'skill_owner': {
-                    'id': skill_owner.id,
-                    'username': skill_owner.username,
-                    'email': skill_owner.email,
-                    'full_name': skill_owner.full_name
-                } if skill_owner else None
-            }
-            result.append(request_dict)
-        
-        return result
+        return [_exchange_request_to_dict(request) for request in requests]
     except Exception as e:
-        print(f"Error in get_skill_exchange_requests: {e}")
+        logger.error("Error in get_skill_exchange_requests: %s", e)
         # Return empty list as fallback
         return []
 
-def get_skill_exchange_requests_for_user(db: Session, user_id: int, skip: int = 0, limit: int = 100):
+def get_skill_exchange_requests_for_user(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
     try:
         # Get requests sent by user and requests for user's skills
-        query = db.query(SkillExchangeRequest).filter(
-            and_(
-                or_(
-                    SkillExchangeRequest.requester_id == user_id,
-                    SkillExchangeRequest.skill_owner_id == user_id
-                )
+        query = _exchange_requests_with_relations(db).filter(
+            or_(
+                SkillExchangeRequest.requester_id == user_id,
+                SkillExchangeRequest.skill_owner_id == user_id
             )
-        ).order_by(SkillExchangeRequest.created_at.desc())
-        
-        requests = query.offset(skip).limit(limit).all()
-        
-        # Manually load relationships
-        result = []
-        for request in requests:
-            # Load requester
-            requester = db.query(User).filter(User.id == request.requester_id).first()
-            # Load skill and owner
-            skill = db.query(Skill).filter(Skill.id == request.skill_id).first()
-            skill_owner = db.query(User).filter(User.id == request.skill_owner_id).first()
-            
-            # Create response dict
-            request_dict = {
-                'id': request.id,
-                'skill_id': request.skill_id,
-                'requester_id': request.requester_id,
-                'skill_owner_id': request.skill_owner_id,
-                'message': request.message,
-                'status': request.status,
-                'created_at': request.created_at.isoformat() if request.created_at else None,
-                'updated_at': request.updated_at.isoformat() if request.updated_at else None,
-                'requester': {
-                    'id': requester.id,
-                    'username': requester.username,
-                    'email': requester.email,
-                    'full_name': requester.full_name
-                } if requester else None,
-                'skill': {
-                    'id': skill.id,
-                    'title': skill.title,
-                    'category': skill.category,
-                    'proficiency_level': skill.proficiency_level
-                } if skill else None,
-                'skill_owner': {
-                    'id': skill_owner.id,
-                    'username': skill_owner.username,
-                    'email': skill_owner.email,
-                    'full_name': skill_owner.full_name
-                } if skill_owner else None
-            }
-            result.append(request_dict)
-        
-        return result
+        ).order_by(*newest_first(SkillExchangeRequest))
+        if cursor:
+            requests = apply_cursor(query, SkillExchangeRequest, cursor).limit(limit).all()
+        else:
+            requests = query.offset(skip).limit(limit).all()
+        return [_exchange_request_to_dict(request) for request in requests]
+    except ValueError:
+        # Malformed cursor, let the router turn it into a 400
+        raise
     except Exception as e:
-        print(f"Error in get_skill_exchange_requests_for_user: {e}")
+        logger.error("Error in get_skill_exchange_requests_for_user: %s", e)
         # Return empty list as fallback
         return []
 
+def get_skill_exchange_rows_for_user(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, fields: Optional[str] = None):
+    """
+    get_skill_exchange_requests_for_user as dicts built from one joined SELECT of columns, for fast_json.
+    `fields` narrows the selected columns and joins (see fast_json.Resource.project).
+    """
+    projection = fast_json.EXCHANGES.project(fields)
+    query = projection.join(db.query(*projection.columns).select_from(SkillExchangeRequest)).filter(
+        or_(
+            SkillExchangeRequest.requester_id == user_id,
+            SkillExchangeRequest.skill_owner_id == user_id
+        )
+    ).order_by(*newest_first(SkillExchangeRequest))
+    if cursor:
+        query = apply_cursor(query, SkillExchangeRequest, cursor)
+    else:
+        query = query.offset(skip)
+    return [projection.row(row) for row in query.limit(limit).all()]
+
 def create_skill_exchange_request(db: Session, request: SkillExchangeRequestCreate, requester_id: int, skill_owner_id: int):
     try:
-        print(f"DEBUG: Creating skill exchange request with data:")
-        print(f"  - skill_id: {request.skill_id}")
-        print(f"  - message: {request.message}")
-        print(f"  - requester_id: {requester_id}")
-        print(f"  - skill_owner_id: {skill_owner_id}")
-        
         db_request = SkillExchangeRequest(
             skill_id=request.skill_id,
             message=request.message,
             requester_id=requester_id,
             skill_owner_id=skill_owner_id
         )
-        
-        print(f"DEBUG: Adding request to database...")
         db.add(db_request)
-        
-        print(f"DEBUG: Committing to database...")
         db.commit()
-        
-        print(f"DEBUG: Refreshing request object...")
         db.refresh(db_request)
-        
-        print(f"DEBUG: Skill exchange request created successfully with ID: {db_request.id}")
+        logger.debug(
+            "Created skill exchange request %s for skill %s (requester %s, owner %s)",
+            db_request.id, request.skill_id, requester_id, skill_owner_id
+        )
         return db_request
         
     except Exception as e:
-        print(f"ERROR: Failed to create skill exchange request: {e}")
-        print(f"ERROR: Exception type: {type(e).__name__}")
-        print(f"ERROR: Exception details: {str(e)}")
+        logger.error("Failed to create skill exchange request: %s: %s", type(e).__name__, e)
         # Re-raise the exception so it shows up in the API response
         raise e
 
+def create_skill_exchange_request_with_notification(db: Session, request: SkillExchangeRequestCreate, requester, skill: Skill):
+    """
+    Create an exchange request and the skill owner's notification as one unit of work.
+    Both rows are inserted in a single transaction and the ids come back from the INSERTs,
+    so no refresh SELECT is issued. Returns a dict shaped like SkillExchangeRequestResponse
+    plus notification_id.
+    """
+    try:
+        now = datetime.utcnow()
+        db_request = SkillExchangeRequest(
+            skill_id=request.skill_id,
+            message=request.message,
+            requester_id=requester.id,
+            skill_owner_id=skill.user_id,
+            status="pending",
+            created_at=now
+        )
+        db.add(db_request)
+        db.flush()
+
+        db_notification = _add_notification(db, NotificationCreate(
+            title="New Skill Exchange Request",
+            message=f"{requester.full_name or requester.username} wants to learn your skill: {skill.title}",
+            type="exchange_request",
+            related_id=db_request.id,
+            user_id=skill.user_id
+        ), created_at=now)
+        db.flush()
+        _adjust_unread_count(db, skill.user_id, 1)
+
+        # Snapshot before commit, committing expires every loaded object
+        result = {
+            'id': db_request.id,
+            'skill_id': db_request.skill_id,
+            'requester_id': db_request.requester_id,
+            'skill_owner_id': db_request.skill_owner_id,
+            'message': db_request.message,
+            'status': db_request.status,
+            'created_at': now,
+            'updated_at': None,
+            'skill': SkillResponse.model_validate(skill).model_dump(),
+            'requester': UserResponse.model_validate(requester).model_dump(),
+            'skill_owner': UserResponse.model_validate(skill.owner).model_dump(),
+            'notification_id': db_notification.id
+        }
+        notification_payload = _notification_payload(db_notification)
+        db.commit()
+        notification_hub.publish(notification_payload['user_id'], notification_payload)
+        return result
+    except Exception:
+        db.rollback()
+        raise
+
 def update_skill_exchange_request_status(db: Session, request_id: int, status: str):
     """Update the status of a skill exchange request"""
     try:
-        print(f"DEBUG: Updating request {request_id} status to '{status}'")
-        
         # Get the request
         request = db.query(SkillExchangeRequest).filter(SkillExchangeRequest.id == request_id).first()
         
         if not request:
-            print(f"ERROR: Request {request_id} not found")
+            logger.debug("Skill exchange request %s not found", request_id)
             return None
         
         # Update status
         request.status = status
         request.updated_at = datetime.utcnow()
         
-        print(f"DEBUG: Committing status update...")
         db.commit()
         db.refresh(request)
-        
-        print(f"DEBUG: Request {request_id} status updated to '{status}'")
+        logger.debug("Skill exchange request %s status updated to %s", request_id, status)
         return request
         
     except Exception as e:
-        print(f"ERROR: Failed to update request status: {e}")
-        print(f"ERROR: Exception type: {type(e).__name__}")
-        print(f"ERROR: Exception details: {str(e)}")
+        logger.error("Failed to update skill exchange request %s status: %s: %s", request_id, type(e).__name__, e)
         raise e
 
 def update_skill_exchange_request(db: Session, request_id: int, request_update: SkillExchangeRequestUpdate):
@@ -298,33 +382,166 @@ def update_skill_exchange_request(db: Session, request_id: int, request_update:
     return db_request
 
 # Notification CRUD operations
-def create_notification(db: Session, notification: NotificationCreate):
+def _add_notification(db: Session, notification: NotificationCreate, created_at: Optional[datetime] = None):
+    """Stage a notification in the current transaction without committing"""
     db_notification = Notification(
         title=notification.title,
         message=notification.message,
         type=notification.type,
         related_id=notification.related_id,
-        user_id=notification.user_id
+        user_id=notification.user_id,
+        is_read=False
     )
+    if created_at is not None:
+        db_notification.created_at = created_at
     db.add(db_notification)
+    return db_notification
+
+def _notification_payload(db_notification: Notification):
+    """JSON-ready NotificationResponse dict pushed to subscribers of the notification stream"""
+    return NotificationResponse.model_validate(db_notification).model_dump(mode="json")
+
+def _count_unread(db: Session, user_id: int):
+    return db.query(func.count(Notification.id)).filter(
+        and_(Notification.user_id == user_id, Notification.is_read == False)
+    ).scalar()
+
+def _adjust_unread_count(db: Session, user_id: int, delta: int):
+    """
+    Apply delta to the user's unread counter inside the current transaction.
+    Notification rows of this transaction must already be flushed: a missing counter
+    row is seeded from COUNT(*), which then includes them.
+    """
+    updated = db.query(NotificationCounter).filter(NotificationCounter.user_id == user_id).update(
+        {NotificationCounter.unread_count: NotificationCounter.unread_count + delta},
+        synchronize_session=False
+    )
+    if updated:
+        return
+    try:
+        with db.begin_nested():
+            db.add(NotificationCounter(user_id=user_id, unread_count=_count_unread(db, user_id)))
+    except IntegrityError:
+        # A concurrent transaction created the row first
+        _adjust_unread_count(db, user_id, delta)
+
+def _adjust_unread_counts(db: Session, deltas: Dict[int, int]):
+    """_adjust_unread_count for many users, one executemany UPDATE for the existing counters"""
+    existing = {user_id for (user_id,) in db.query(NotificationCounter.user_id).filter(
+        NotificationCounter.user_id.in_(list(deltas))
+    )}
+    if existing:
+        counters = NotificationCounter.__table__
+        db.execute(
+            counters.update()
+            .where(counters.c.user_id == bindparam("counter_user_id"))
+            .values(unread_count=counters.c.unread_count + bindparam("delta")),
+            [{"counter_user_id": user_id, "delta": deltas[user_id]} for user_id in existing]
+        )
+    for user_id in set(deltas) - existing:
+        _adjust_unread_count(db, user_id, deltas[user_id])
+
+def create_notification(db: Session, notification: NotificationCreate):
+    db_notification = _add_notification(db, notification)
+    db.flush()
+    _adjust_unread_count(db, notification.user_id, 1)
     db.commit()
     db.refresh(db_notification)
+    notification_hub.publish(db_notification.user_id, _notification_payload(db_notification))
     return db_notification
 
-def get_user_notifications(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Notification).filter(Notification.user_id == user_id).order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+def create_notifications(db: Session, notifications: List[NotificationCreate]):
+    """
+    Bulk insert for fan-out notifications: one multi-row INSERT ... RETURNING
+    and one counter update per batch instead of a commit per recipient
+    """
+    if not notifications:
+        return []
+    now = datetime.utcnow()
+    rows = [dict(notification.model_dump(), is_read=False, created_at=now) for notification in notifications]
+    try:
+        # No sort_by_parameter_order: requiring it makes SQLite fall back to a statement per row
+        db_notifications = sorted(
+            db.scalars(insert(Notification).returning(Notification), rows).all(),
+            key=lambda n: n.id
+        )
+        deltas = defaultdict(int)
+        for notification in notifications:
+            deltas[notification.user_id] += 1
+        _adjust_unread_counts(db, deltas)
+        payloads = [(n.user_id, _notification_payload(n)) for n in db_notifications]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    for user_id, payload in payloads:
+        notification_hub.publish(user_id, payload)
+    return db_notifications
+
+def get_user_notifications(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(Notification).filter(Notification.user_id == user_id).order_by(*newest_first(Notification))
+    if cursor:
+        return apply_cursor(query, Notification, cursor).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
 def mark_notification_read(db: Session, notification_id: int, user_id: int):
-    db_notification = db.query(Notification).filter(
+    # Conditional UPDATE so concurrent calls decrement the counter only once
+    updated = db.query(Notification).filter(
+        and_(Notification.id == notification_id, Notification.user_id == user_id, Notification.is_read == False)
+    ).update({Notification.is_read: True}, synchronize_session=False)
+    if updated:
+        _adjust_unread_count(db, user_id, -updated)
+    db.commit()
+    return db.query(Notification).filter(
         and_(Notification.id == notification_id, Notification.user_id == user_id)
     ).first()
-    if db_notification:
-        db_notification.is_read = True
-        db.commit()
-        db.refresh(db_notification)
-    return db_notification
+
+def mark_notifications_read(db: Session, user_id: int, ids: Optional[List[int]] = None, up_to_id: Optional[int] = None):
+    """
+    Mark many of a user's notifications read with one set-based UPDATE,
+    selected by explicit ids or as everything up to and including up_to_id.
+    Returns the number of notifications that changed from unread to read.
+    """
+    conditions = [Notification.user_id == user_id, Notification.is_read == False]
+    if ids is not None:
+        conditions.append(Notification.id.in_(ids))
+    if up_to_id is not None:
+        conditions.append(Notification.id <= up_to_id)
+    updated = db.query(Notification).filter(and_(*conditions)).update(
+        {Notification.is_read: True}, synchronize_session=False
+    )
+    if updated:
+        _adjust_unread_count(db, user_id, -updated)
+    db.commit()
+    return updated
 
 def get_unread_notification_count(db: Session, user_id: int):
-    return db.query(Notification).filter(
-        and_(Notification.user_id == user_id, Notification.is_read == False)
-    ).count()
+    """O(1) primary key lookup of the maintained counter, COUNT(*) while it is missing"""
+    unread = db.query(NotificationCounter.unread_count).filter(NotificationCounter.user_id == user_id).scalar()
+    if unread is None:
+        # No counter yet, e.g. a database whose notification_counters table was created empty.
+        # Reads never write: the user's next notification write seeds it (_adjust_unread_count)
+        return _count_unread(db, user_id)
+    return unread
+
+def reconcile_notification_counters(db: Session):
+    """
+    Recompute every unread counter from the notifications table and fix drifted ones.
+    Returns the number of counters corrected.
+    """
+    actual = dict(db.query(Notification.user_id, func.count(Notification.id)).filter(
+        Notification.is_read == False
+    ).group_by(Notification.user_id).all())
+    counters = {counter.user_id: counter for counter in db.query(NotificationCounter).all()}
+    corrected = 0
+    for user_id in set(actual) | set(counters):
+        expected = actual.get(user_id, 0)
+        counter = counters.get(user_id)
+        if counter is None:
+            db.add(NotificationCounter(user_id=user_id, unread_count=expected))
+            corrected += 1
+        elif counter.unread_count != expected:
+            counter.unread_count = expected
+            corrected += 1
+    db.commit()
+    return corrected
@@ -0,0 +1,319 @@
+"""
+Async CRUD operations for the AsyncSession from database.get_async_db
+Mirrors crud.py so handlers can await the database instead of holding a thread
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import select, update, func, and_, or_, true
+from sqlalchemy.exc import IntegrityError
+from anyio import to_thread
+from models import User, Skill, SkillExchangeRequest, Notification, NotificationCounter
+from schemas import UserCreate, UserUpdate, SkillCreate, SkillUpdate, SkillExchangeRequestCreate, SkillExchangeRequestUpdate, NotificationCreate
+from crud import hash_password, verify_password, _exchange_request_to_dict, _notification_payload, _queue_skill_analysis, _skill_written
+from notification_hub import notification_hub
+from typing import Optional, List
+from datetime import datetime
+from pagination import apply_cursor, newest_first
+from auth_cache import auth_cache
+from catalog_cache import skill_catalog_cache
+from skill_analysis import mark_pending
+import fast_json
+
+# User CRUD operations
+async def get_user(db: AsyncSession, user_id: int):
+    return await db.get(User, user_id)
+
+async def get_user_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = select(User).where(User.is_active == True).order_by(*newest_first(User))
+    if cursor:
+        query = apply_cursor(query, User, cursor)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return result.scalars().all()
+
+async def get_user_rows(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, fields: Optional[str] = None):
+    """get_users as plain dicts built from column tuples, for fast_json; `fields` narrows the columns"""
+    projection = fast_json.USERS.project(fields)
+    query = select(*projection.columns).where(User.is_active == True).order_by(*newest_first(User))
+    if cursor:
+        query = apply_cursor(query, User, cursor)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return [projection.row(row) for row in result.all()]
+
+async def create_user(db: AsyncSession, user: UserCreate):
+    # bcrypt is CPU-bound, keep it off the event loop
+    hashed_password = await to_thread.run_sync(hash_password, user.password)
+    db_user = User(
+        username=user.username,
+        email=user.email,
+        full_name=user.full_name,
+        bio=user.bio,
+        password_hash=hashed_password
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def update_user(db: AsyncSession, user_id: int, user_update: UserUpdate):
+    db_user = await db.get(User, user_id)
+    if db_user:
+        update_data = user_update.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_user, field, value)
+        await db.commit()
+        await db.refresh(db_user)
+        auth_cache.invalidate_user(user_id)
+        # Public skill listings embed the owner's profile
+        skill_catalog_cache.bump()
+    return db_user
+
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await get_user_by_username(db, username)
+    if not user:
+        return False
+    if not await to_thread.run_sync(verify_password, password, user.password_hash):
+        return False
+    return user
+
+# Skill CRUD operations
+async def get_skill(db: AsyncSession, skill_id: int):
+    result = await db.execute(select(Skill).options(joinedload(Skill.owner)).where(Skill.id == skill_id))
+    return result.scalars().first()
+
+async def get_skills(db: AsyncSession, skip: int = 0, limit: int = 100, category: Optional[str] = None, cursor: Optional[str] = None):
+    query = select(Skill).options(joinedload(Skill.owner)).where(Skill.is_active == true()).order_by(*newest_first(Skill))
+    if category:
+        query = query.where(Skill.category == category)
+    if cursor:
+        query = apply_cursor(query, Skill, cursor)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return result.scalars().all()
+
+async def get_skill_rows(db: AsyncSession, skip: int = 0, limit: int = 100, category: Optional[str] = None, cursor: Optional[str] = None, fields: Optional[str] = None):
+    """get_skills as plain dicts built from column tuples, for fast_json; `fields` narrows the columns and joins"""
+    projection = fast_json.SKILLS.project(fields)
+    query = projection.join(select(*projection.columns).select_from(Skill)).where(
+        Skill.is_active == true()
+    ).order_by(*newest_first(Skill))
+    if category:
+        query = query.where(Skill.category == category)
+    if cursor:
+        query = apply_cursor(query, Skill, cursor)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return [projection.row(row) for row in result.all()]
+
+async def get_skill_facet_counts(db: AsyncSession):
+    result = await db.execute(select(Skill.category, Skill.proficiency_level, func.count(Skill.id)).where(
+        Skill.is_active == true()
+    ).group_by(Skill.category, Skill.proficiency_level))
+    return [tuple(row) for row in result.all()]
+
+async def get_skills_by_ids(db: AsyncSession, skill_ids: List[int]):
+    """Active skills with owners for the given ids, in the order of skill_ids"""
+    result = await db.execute(select(Skill).options(joinedload(Skill.owner)).where(
+        and_(Skill.id.in_(skill_ids), Skill.is_active == true())
+    ))
+    skills = {skill.id: skill for skill in result.scalars().all()}
+    return [skills[skill_id] for skill_id in skill_ids if skill_id in skills]
+
+async def get_skills_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100):
+    query = select(Skill).options(joinedload(Skill.owner)).where(
+        and_(Skill.user_id == user_id, Skill.is_active == true())
+    ).order_by(Skill.created_at.desc()).offset(skip).limit(limit)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+async def create_skill(db: AsyncSession, skill: SkillCreate, user_id: int):
+    db_skill = Skill(
+        title=skill.title,
+        description=skill.description,
+        category=skill.category,
+        proficiency_level=skill.proficiency_level,
+        value=skill.value,
+        user_id=user_id
+    )
+    db.add(db_skill)
+    await db.flush()
+    analyze = await db.run_sync(lambda session: mark_pending(session, db_skill))
+    await db.commit()
+    # Reload with the owner so the response can be serialized without lazy loading
+    db_skill = await get_skill(db, db_skill.id)
+    _skill_written(db_skill)
+    if analyze:
+        # Blocking SQLite enqueue, off the event loop
+        await to_thread.run_sync(_queue_skill_analysis, db_skill.id, db_skill.user_id)
+    return db_skill
+
+async def update_skill(db: AsyncSession, skill_id: int, skill_update: SkillUpdate):
+    db_skill = await get_skill(db, skill_id)
+    if db_skill:
+        update_data = skill_update.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_skill, field, value)
+        analyze = await db.run_sync(lambda session: mark_pending(session, db_skill))
+        await db.commit()
+        _skill_written(db_skill)
+        if analyze:
+            await to_thread.run_sync(_queue_skill_analysis, db_skill.id, db_skill.user_id)
+    return db_skill
+
+async def delete_skill(db: AsyncSession, skill_id: int):
+    db_skill = await get_skill(db, skill_id)
+    if db_skill:
+        db_skill.is_active = False
+        await db.commit()
+        _skill_written(db_skill)
+    return db_skill
+
+# Skill Exchange Request CRUD operations
+def _exchange_requests_with_relations():
+    return select(SkillExchangeRequest).options(
+        selectinload(SkillExchangeRequest.requester),
+        selectinload(SkillExchangeRequest.skill).joinedload(Skill.owner),
+        selectinload(SkillExchangeRequest.skill_owner)
+    )
+
+async def get_skill_exchange_request(db: AsyncSession, request_id: int):
+    result = await db.execute(_exchange_requests_with_relations().where(SkillExchangeRequest.id == request_id))
+    return result.scalars().first()
+
+async def get_skill_exchange_requests(db: AsyncSession, skip: int = 0, limit: int = 100, status: Optional[str] = None):
+    query = _exchange_requests_with_relations().order_by(SkillExchangeRequest.created_at.desc())
+    result = await db.execute(query.offset(skip).limit(limit))
+    return [_exchange_request_to_dict(request) for request in result.scalars().all()]
+
+async def get_skill_exchange_requests_for_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = _exchange_requests_with_relations().where(
+        or_(
+            SkillExchangeRequest.requester_id == user_id,
+            SkillExchangeRequest.skill_owner_id == user_id
+        )
+    ).order_by(*newest_first(SkillExchangeRequest))
+    if cursor:
+        query = apply_cursor(query, SkillExchangeRequest, cursor)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return [_exchange_request_to_dict(request) for request in result.scalars().all()]
+
+async def create_skill_exchange_request(db: AsyncSession, request: SkillExchangeRequestCreate, requester_id: int, skill_owner_id: int):
+    db_request = SkillExchangeRequest(
+        skill_id=request.skill_id,
+        message=request.message,
+        requester_id=requester_id,
+        skill_owner_id=skill_owner_id
+    )
+    db.add(db_request)
+    await db.commit()
+    await db.refresh(db_request)
+    return db_request
+
+async def update_skill_exchange_request_status(db: AsyncSession, request_id: int, status: str):
+    """Update the status of a skill exchange request"""
+    request = await db.get(SkillExchangeRequest, request_id)
+    if not request:
+        return None
+    request.status = status
+    request.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(request)
+    return request
+
+async def update_skill_exchange_request(db: AsyncSession, request_id: int, request_update: SkillExchangeRequestUpdate):
+    db_request = await db.get(SkillExchangeRequest, request_id)
+    if db_request:
+        update_data = request_update.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_request, field, value)
+        await db.commit()
+        await db.refresh(db_request)
+    return db_request
+
+# Notification CRUD operations
+async def _count_unread(db: AsyncSession, user_id: int):
+    return (await db.execute(select(func.count(Notification.id)).where(
+        and_(Notification.user_id == user_id, Notification.is_read == False)
+    ))).scalar()
+
+async def _adjust_unread_count(db: AsyncSession, user_id: int, delta: int):
+    """Async counterpart of crud._adjust_unread_count"""
+    result = await db.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(unread_count=NotificationCounter.unread_count + delta)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        return
+    unread = await _count_unread(db, user_id)
+    try:
+        async with db.begin_nested():
+            db.add(NotificationCounter(user_id=user_id, unread_count=unread))
+    except IntegrityError:
+        await _adjust_unread_count(db, user_id, delta)
+
+async def create_notification(db: AsyncSession, notification: NotificationCreate):
+    db_notification = Notification(
+        title=notification.title,
+        message=notification.message,
+        type=notification.type,
+        related_id=notification.related_id,
+        user_id=notification.user_id
+    )
+    db.add(db_notification)
+    await db.flush()
+    await _adjust_unread_count(db, notification.user_id, 1)
+    await db.commit()
+    await db.refresh(db_notification)
+    notification_hub.publish(db_notification.user_id, _notification_payload(db_notification))
+    return db_notification
+
+async def get_user_notifications(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = select(Notification).where(Notification.user_id == user_id).order_by(*newest_first(Notification))
+    if cursor:
+        query = apply_cursor(query, Notification, cursor)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return result.scalars().all()
+
+async def mark_notification_read(db: AsyncSession, notification_id: int, user_id: int):
+    result = await db.execute(
+        update(Notification)
+        .where(and_(Notification.id == notification_id, Notification.user_id == user_id, Notification.is_read == False))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        await _adjust_unread_count(db, user_id, -result.rowcount)
+    await db.commit()
+    # Sessions here do not expire on commit, overwrite any instance loaded before the UPDATE
+    result = await db.execute(select(Notification).where(
+        and_(Notification.id == notification_id, Notification.user_id == user_id)
+    ).execution_options(populate_existing=True))
+    return result.scalars().first()
+
+async def get_unread_notification_count(db: AsyncSession, user_id: int):
+    query = select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+    unread = (await db.execute(query)).scalar()
+    if unread is None:
+        # COUNT(*) without writing, like crud.get_unread_notification_count
+        return await _count_unread(db, user_id)
+    return unread
@@ -1,22 +1,136 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pydantic_settings import BaseSettings
+from typing import Optional
+from pool_metrics import InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool
 
 class Settings(BaseSettings):
     database_url: str = "mssql+pyodbc://DESKTOP-5TCAPE1/blogDb?driver=ODBC+Driver+17+for+SQL+Server&Trusted_Connection=yes"
+    # Defaults to database_url with its driver swapped for the asyncio one
+    async_database_url: Optional[str] = None
     secret_key: str = "skill-swap-secret-key-2024-jwt-authentication-secure"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    # Per-worker cache of token -> authenticated user (0 disables)
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 10000
+    # Connection pool, per engine and per worker process (ignored for SQLite except pre-ping/recycle)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Schema handling at worker boot: "create_all" (development) or "none" (schema managed by `alembic upgrade head`)
+    db_schema_mode: str = "create_all"
+    # Notification push: "local" (single worker) or "module:Class" cross-worker backend
+    notification_backend: str = "local"
+    notification_stream_max_pending: int = 100
+    notification_stream_keepalive_seconds: int = 15
+    # Notification retention (notification_retention.py): read notifications older than N days or
+    # beyond the newest N of a user are deleted or moved to notifications_archive (0 disables a rule)
+    notification_retention_days: int = 90
+    notification_retention_max_per_user: int = 500
+    notification_retention_mode: str = "delete"
+    notification_retention_batch_size: int = 500
+    notification_retention_batch_pause_seconds: float = 0.05
+    # Run the job inside each web worker every N seconds; 0 leaves it to cron/`python notification_retention.py`
+    notification_retention_interval_seconds: int = 0
+    # Rebuild each worker's skill search index in the background once older than this (0 never rebuilds,
+    # enough for a single worker since its own writes update the index in place)
+    skill_search_rebuild_seconds: int = 300
+    # Per-worker cache of skill catalogue facets and listings, also dropped on every skill write
+    skill_cache_ttl_seconds: int = 30
+    skill_cache_max_entries: int = 1000
+    # Serve list endpoints from column tuples encoded with orjson instead of ORM objects + pydantic (fast_json.py)
+    fast_json_listings: bool = False
+    # gzip/brotli compression of compressible responses at least this many bytes (0 disables, compression.py)
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    # Frontend served under /app, from frontend/dist (build_static.py) when it exists
+    static_mount_path: str = "/app"
+    # Logging (logging_config.py): root level, "module=LEVEL,..." overrides, "text" or "json" output,
+    # fraction of DEBUG records kept, and a background thread writing the records
+    log_level: str = "INFO"
+    log_module_levels: str = ""
+    log_format: str = "text"
+    log_debug_sample_rate: float = 1.0
+    log_queue: bool = True
+    # Queue an analysis job when a skill is created or its content changes (skill_analysis.py);
+    # with it off, pending analyses wait for a read of them or `python skill_analysis.py`
+    skill_analysis_on_write: bool = True
+    # Background jobs (job_queue.py): SQLite file shared by the processes on this host, worker
+    # threads per process (0: only `python job_queue.py` runs jobs), attempts per job, first retry
+    # delay (doubling after), seconds before a job of a dead worker is run again, poll interval,
+    # and how long results stay available
+    job_queue_path: str = "jobs.sqlite3"
+    job_workers: int = 2
+    job_max_attempts: int = 3
+    job_retry_base_seconds: float = 2
+    job_lease_seconds: float = 300
+    job_poll_interval_seconds: float = 0.5
+    job_result_ttl_seconds: int = 86400
+    # AI fan-out (/api/ai/my-skills-analysis): batch prompts in flight per request, seconds allowed per
+    # prompt, and skills packed into one analysis prompt (gemini_service.analyze_skills_batch)
+    ai_max_concurrency: int = 5
+    ai_call_timeout_seconds: float = 20
+    ai_batch_size: int = 10
+    # Gemini response cache (ai_cache.py): seconds entries live (0 disables it), in-memory entries
+    # per worker, SQLite file shared by the workers (empty: memory only) and rows kept in it
+    ai_cache_ttl_seconds: int = 604800
+    ai_cache_max_entries: int = 1000
+    ai_cache_path: str = "ai_cache.sqlite3"
+    ai_cache_disk_max_entries: int = 100000
+    # Max worker threads for sync route handlers (blocking DB and bcrypt work)
+    threadpool_max_workers: int = 40
 
     class Config:
         env_file = ".env"
+        extra = "ignore"
 
 settings = Settings()
 
-engine = create_engine(settings.database_url)
+# Sync driver prefix -> asyncio driver prefix
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "mssql+pyodbc://": "mssql+aioodbc://",
+    "postgresql://": "postgresql+asyncpg://",
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+}
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a sync database URL to the matching asyncio driver"""
+    for sync_prefix, async_prefix in ASYNC_DRIVERS.items():
+        if database_url.startswith(sync_prefix):
+            return async_prefix + database_url[len(sync_prefix):]
+    return database_url
+
+def get_pool_options(database_url: str, poolclass) -> dict:
+    """Engine pool keyword arguments from settings"""
+    options = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    # SQLite picks its own pool class, sizing only applies to server databases
+    if not database_url.startswith("sqlite"):
+        options.update({
+            "poolclass": poolclass,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+        })
+    return options
+
+engine = create_engine(settings.database_url, **get_pool_options(settings.database_url, InstrumentedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_database_url = settings.async_database_url or get_async_database_url(settings.database_url)
+async_engine = create_async_engine(async_database_url, **get_pool_options(async_database_url, InstrumentedAsyncAdaptedQueuePool))
+# expire_on_commit=False: expired attributes would need implicit IO, which AsyncSession cannot do
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -25,3 +139,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
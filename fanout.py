@@ -0,0 +1,37 @@
+"""
+Bounded-concurrency fan-out for independent async calls (model round trips)
+gather_bounded runs one call per item with at most `concurrency` in flight and a timeout
+per call, so N calls take about ceil(N / concurrency) round trips instead of N. A call
+that fails or times out yields None in its slot and the others still complete.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+async def gather_bounded(
+    call: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    concurrency: int,
+    timeout: Optional[float] = None
+) -> List[Optional[R]]:
+    """Results of call(item) in item order, None where a call raised or exceeded timeout seconds"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item):
+        async with semaphore:
+            # The timeout starts once a slot is free, queueing does not count against it
+            try:
+                return await asyncio.wait_for(call(item), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Call for {item!r} timed out after {timeout}s")
+            except Exception as e:
+                logger.warning(f"Call for {item!r} failed: {e}")
+            return None
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
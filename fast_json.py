@@ -0,0 +1,131 @@
+"""
+Fast serialization path for list endpoints (opt-in with FAST_JSON_LISTINGS)
+Rows are selected as plain column tuples, zipped into dicts shaped like the response
+schema and encoded straight to bytes with orjson. That skips building ORM instances,
+per-row pydantic validation and the jsonable_encoder + json.dumps pass FastAPI makes
+for response_model. Only meant for trusted database output, whose shape is fixed by
+the SELECT below rather than checked per row.
+
+The same projections serve sparse fieldsets (`fields=` on list endpoints): only the
+requested columns are selected and emitted, and related tables are joined only when
+one of their fields is asked for.
+
+Without orjson installed, encoding falls back to the stdlib json module.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy.orm import aliased
+from models import User, Skill, SkillExchangeRequest
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Field order of the response schemas, so both paths emit the same documents
+USER_FIELDS = ("username", "email", "full_name", "bio", "id", "created_at", "is_active")
+SKILL_FIELDS = ("title", "description", "category", "proficiency_level", "value", "id", "user_id", "created_at", "is_active")
+# Exchange listing shape, see crud._exchange_request_to_dict
+EXCHANGE_FIELDS = ("id", "skill_id", "requester_id", "skill_owner_id", "message", "status", "created_at", "updated_at")
+EXCHANGE_USER_FIELDS = ("id", "username", "email", "full_name")
+EXCHANGE_SKILL_FIELDS = ("id", "title", "category", "proficiency_level")
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+class ProjectedRow(dict):
+    """Response dict that remembers its row's (created_at, id) for the next page cursor"""
+    __slots__ = ("cursor_key",)
+
+class Projection:
+    """Columns to SELECT for one fieldset of a resource, and how to turn each row into its dict"""
+
+    def __init__(self, resource, fields, nested):
+        self.resource = resource
+        self.fields = fields
+        # name -> subfields, in schema order
+        self.nested = nested
+        self.columns = [getattr(resource.model, field) for field in fields]
+        for name, subfields in nested.items():
+            model = resource.nested[name][0]
+            # Related id first, it tells an outer joined row that is missing apart from one with NULL columns
+            self.columns += [model.id] + [getattr(model, field) for field in subfields]
+        # Cursor key, not part of the payload unless requested
+        self.columns += [resource.model.created_at, resource.model.id]
+
+    def row(self, row):
+        result = ProjectedRow(zip(self.fields, row))
+        offset = len(self.fields)
+        for name, subfields in self.nested.items():
+            if row[offset] is None:
+                result[name] = None
+            else:
+                result[name] = dict(zip(subfields, row[offset + 1:offset + 1 + len(subfields)]))
+            offset += 1 + len(subfields)
+        result.cursor_key = (row[offset], row[offset + 1])
+        return result
+
+    def join(self, query):
+        """Outer join the related tables this projection needs onto a query or select"""
+        for name in self.nested:
+            model, _, onclause = self.resource.nested[name]
+            query = query.outerjoin(model, onclause)
+        return query
+
+class Resource:
+    """A listing shape: columns of the model plus nested related objects (name -> (model, fields, join condition))"""
+
+    def __init__(self, model, fields, nested=None):
+        self.model = model
+        self.fields = fields
+        self.nested = nested or {}
+
+    def project(self, fields: Optional[str] = None) -> Projection:
+        """
+        Projection for a `fields=` parameter such as "id,title,owner.username": top-level
+        names, a nested name for the whole object or name.field for parts of it.
+        None selects everything; unknown names raise ValueError.
+        """
+        if fields is None:
+            return Projection(self, self.fields, {name: spec[1] for name, spec in self.nested.items()})
+        top, nested = set(), {}
+        for name in filter(None, (part.strip() for part in fields.split(","))):
+            parent, _, child = name.partition(".")
+            if parent in self.nested and not child:
+                nested[parent] = set(self.nested[parent][1])
+            elif parent in self.nested and child in self.nested[parent][1]:
+                nested.setdefault(parent, set()).add(child)
+            elif parent in self.fields and not child:
+                top.add(parent)
+            else:
+                raise ValueError(f"Unknown field '{name}'")
+        if not top and not nested:
+            raise ValueError("fields must name at least one field")
+        return Projection(
+            self,
+            [field for field in self.fields if field in top],
+            {name: [field for field in spec[1] if field in nested[name]] for name, spec in self.nested.items() if name in nested}
+        )
+
+Requester = aliased(User, name="requester")
+SkillOwner = aliased(User, name="skill_owner")
+
+# UserResponse
+USERS = Resource(User, USER_FIELDS)
+# SkillResponse with its owner
+SKILLS = Resource(Skill, SKILL_FIELDS, {"owner": (User, USER_FIELDS, Skill.user_id == User.id)})
+# Exchange listing dict with requester, skill and skill owner
+EXCHANGES = Resource(SkillExchangeRequest, EXCHANGE_FIELDS, {
+    "requester": (Requester, EXCHANGE_USER_FIELDS, SkillExchangeRequest.requester_id == Requester.id),
+    "skill": (Skill, EXCHANGE_SKILL_FIELDS, SkillExchangeRequest.skill_id == Skill.id),
+    "skill_owner": (SkillOwner, EXCHANGE_USER_FIELDS, SkillExchangeRequest.skill_owner_id == SkillOwner.id),
+})
@@ -4,15 +4,93 @@ Provides NLP capabilities for skill analysis, matching, and recommendations
 """
 
 import os
+import asyncio
 import json
 import logging
+import threading
+import weakref
 from typing import List, Dict, Optional, Any
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from ai_cache import ai_cache
+from database import settings
+from fanout import gather_bounded
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = "gemini-1.5-flash"
+
+# Output budget of a batch analysis prompt (AI_BATCH_SIZE skills each)
+BATCH_MAX_OUTPUT_TOKENS = 8192
+# Per-skill calls in flight when a batch response cannot be used
+BATCH_FALLBACK_CONCURRENCY = 4
+PROFICIENCY_LEVELS = ("Beginner", "Intermediate", "Advanced", "Expert")
+
+# Suggested to users without skills yet
+STARTER_SUGGESTIONS = [
+    {
+        "title": "Web Development",
+        "description": "Build modern, responsive websites using HTML, CSS, and JavaScript frameworks",
+        "category": "Programming",
+        "proficiency_level": "Intermediate",
+        "reason": "Popular skill with high demand in tech industry"
+    },
+    {
+        "title": "Digital Marketing",
+        "description": "Promote products and services using online marketing strategies and social media",
+        "category": "Marketing",
+        "proficiency_level": "Beginner",
+        "reason": "Valuable complementary skill for technical professionals"
+    },
+    {
+        "title": "Project Management",
+        "description": "Plan, execute, and oversee projects to completion using agile methodologies",
+        "category": "Business",
+        "proficiency_level": "Intermediate",
+        "reason": "Essential leadership skill for career advancement"
+    }
+]
+
+# Suggested when the model is unavailable or its answer does not parse
+FALLBACK_SUGGESTIONS = [
+    {
+        "title": "Data Analysis",
+        "description": "Analyze complex datasets and create actionable insights using statistical methods",
+        "category": "Programming",
+        "proficiency_level": "Intermediate",
+        "reason": "Builds on analytical skills valuable in any industry"
+    },
+    {
+        "title": "UX/UI Design",
+        "description": "Create user-centered designs that are both beautiful and functional",
+        "category": "Design",
+        "proficiency_level": "Beginner",
+        "reason": "Complements technical skills with creative design thinking"
+    },
+    {
+        "title": "Public Speaking",
+        "description": "Develop confidence and clarity in presenting ideas to groups",
+        "category": "Business",
+        "proficiency_level": "Intermediate",
+        "reason": "Essential leadership skill for career growth"
+    },
+    {
+        "title": "Content Writing",
+        "description": "Create engaging content for blogs, websites, and marketing materials",
+        "category": "Writing",
+        "proficiency_level": "Beginner",
+        "reason": "Valuable skill for personal branding and communication"
+    },
+    {
+        "title": "Financial Literacy",
+        "description": "Understand and manage personal finances, investments, and budgeting",
+        "category": "Finance",
+        "proficiency_level": "Intermediate",
+        "reason": "Important life skill for financial independence"
+    }
+]
+
 class GeminiAIService:
     """Gemini AI service for skill analysis and matching"""
     
@@ -20,6 +98,9 @@ class GeminiAIService:
         """Initialize Gemini AI service"""
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model = None
+        # Model per event loop: the SDK's async client stays bound to the loop that first used it
+        self._loop_models = weakref.WeakKeyDictionary()
+        self._loop_models_lock = threading.Lock()
         self._initialize_model()
     
     def _initialize_model(self):
@@ -31,27 +112,7 @@ class GeminiAIService:
             
             # Configure Gemini API
             genai.configure(api_key=self.api_key)
-            
-            # Initialize model with safety settings
-            generation_config = {
-                "temperature": 0.7,
-                "top_p": 0.8,
-                "top_k": 32,
-                "max_output_tokens": 2048,
-            }
-            
-            safety_settings = {
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            }
-            
-            self.model = genai.GenerativeModel(
-                model_name="gemini-1.5-flash",
-                generation_config=generation_config,
-                safety_settings=safety_settings
-            )
+            self.model = self._create_model()
             
             logger.info("Gemini AI model initialized successfully")
             
@@ -59,6 +120,40 @@ class GeminiAIService:
             logger.error(f"Failed to initialize Gemini AI: {e}")
             self.model = None
     
+    def _create_model(self):
+        """A Gemini model with safety settings"""
+        generation_config = {
+            "temperature": 0.7,
+            "top_p": 0.8,
+            "top_k": 32,
+            "max_output_tokens": 2048,
+        }
+        
+        safety_settings = {
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+        }
+        
+        return genai.GenerativeModel(
+            model_name=MODEL_NAME,
+            generation_config=generation_config,
+            safety_settings=safety_settings
+        )
+    
+    def _loop_model(self):
+        """
+        The model for the running event loop (the web loop, or a job worker's), created on
+        first use, so no async client is shared between loops
+        """
+        loop = asyncio.get_running_loop()
+        with self._loop_models_lock:
+            model = self._loop_models.get(loop)
+            if model is None:
+                model = self._loop_models[loop] = self._create_model()
+        return model
+    
     def is_available(self) -> bool:
         """Check if Gemini AI service is available"""
         return self.model is not None and self.api_key is not None
@@ -78,6 +173,11 @@ class GeminiAIService:
         if not self.is_available():
             return self._fallback_analysis(title, description, category)
         
+        cache_key = ai_cache.key("analyze_skill_description", MODEL_NAME, title, description, category)
+        cached = ai_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             prompt = f"""
             Analyze this skill and provide insights:
@@ -103,7 +203,7 @@ class GeminiAIService:
             }}
             """
             
-            response = await self.model.generate_content_async(prompt)
+            response = await self._loop_model().generate_content_async(prompt)
             result_text = response.text
             
             # Parse JSON response
@@ -117,6 +217,7 @@ class GeminiAIService:
                 result_text = result_text.strip()
                 
                 result = json.loads(result_text)
+                ai_cache.put(cache_key, result)
                 logger.info(f"Successfully analyzed skill: {title}")
                 return result
                 
@@ -128,6 +229,153 @@ class GeminiAIService:
             logger.error(f"Error analyzing skill with AI: {e}")
             return self._fallback_analysis(title, description, category)
     
+    async def analyze_skills_batch(
+        self,
+        skills: List[Dict],
+        concurrency: int = 1,
+        timeout: Optional[float] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyze many skills with one prompt per AI_BATCH_SIZE skills
+        
+        Args:
+            skills: Dicts with title, description and optional category
+            concurrency: Batch prompts in flight at once
+            timeout: Seconds allowed per batch prompt (including its per-skill fallbacks)
+        
+        Returns:
+            One analysis per skill, in order, shaped like analyze_skill_description's;
+            None for skills whose batch timed out
+        """
+        if not self.is_available():
+            return [
+                self._fallback_analysis(skill["title"], skill["description"], skill.get("category", ""))
+                for skill in skills
+            ]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(skills)
+        cache_keys = [
+            ai_cache.key("analyze_skill_description", MODEL_NAME, skill["title"], skill["description"], skill.get("category", ""))
+            for skill in skills
+        ]
+        pending = []
+        for position, cache_key in enumerate(cache_keys):
+            results[position] = ai_cache.get(cache_key)
+            if results[position] is None:
+                pending.append(position)
+        
+        batch_size = settings.ai_batch_size
+        chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+        
+        async def analyze_chunk(positions):
+            return await self._analyze_chunk([skills[position] for position in positions], [cache_keys[position] for position in positions])
+        
+        for positions, analyses in zip(chunks, await gather_bounded(analyze_chunk, chunks, concurrency, timeout)):
+            if analyses is not None:
+                for position, analysis in zip(positions, analyses):
+                    results[position] = analysis
+        return results
+    
+    async def _analyze_chunk(self, skills: List[Dict], cache_keys: List[str]) -> List[Dict[str, Any]]:
+        """One batch prompt; skills missing from or invalid in its response are analyzed one by one"""
+        items = [
+            {"index": index, "title": skill["title"], "description": skill["description"], "category": skill.get("category", "")}
+            for index, skill in enumerate(skills)
+        ]
+        prompt = f"""
+            Analyze each of these skills and provide insights:
+            
+            {json.dumps(items, ensure_ascii=False)}
+            
+            For every skill provide:
+            1. Enhanced description (more detailed and professional)
+            2. Key skills/keywords
+            3. Proficiency level suggestion (Beginner/Intermediate/Advanced/Expert)
+            4. Related skills
+            5. Potential applications/use cases
+            
+            Respond with only a JSON array holding one object per skill, with the skill's index:
+            [
+                {{
+                    "index": 0,
+                    "enhanced_description": "...",
+                    "keywords": ["...", "..."],
+                    "suggested_proficiency": "...",
+                    "related_skills": ["...", "..."],
+                    "applications": ["...", "..."]
+                }}
+            ]
+            """
+        
+        analyses: Dict[int, Dict[str, Any]] = {}
+        try:
+            response = await self._loop_model().generate_content_async(
+                prompt,
+                generation_config={"max_output_tokens": BATCH_MAX_OUTPUT_TOKENS}
+            )
+            parsed = self._parse_json_text(response.text)
+            if not isinstance(parsed, list):
+                raise ValueError("expected a JSON array")
+            for entry in parsed:
+                analysis = self._validate_analysis(entry)
+                if analysis is not None and 0 <= entry["index"] < len(skills):
+                    analyses.setdefault(entry["index"], analysis)
+        except Exception as e:
+            logger.error(f"Batch analysis of {len(skills)} skills failed, analyzing them one by one: {e}")
+        
+        for index, analysis in analyses.items():
+            ai_cache.put(cache_keys[index], analysis)
+        
+        missing = [index for index in range(len(skills)) if index not in analyses]
+        if missing:
+            if analyses:
+                logger.warning(f"Batch analysis returned no usable result for {len(missing)} of {len(skills)} skills")
+            fallbacks = await gather_bounded(
+                lambda index: self.analyze_skill_description(skills[index]["title"], skills[index]["description"], skills[index].get("category", "")),
+                missing,
+                BATCH_FALLBACK_CONCURRENCY
+            )
+            for index, analysis in zip(missing, fallbacks):
+                analyses[index] = analysis if analysis is not None else self._fallback_analysis(
+                    skills[index]["title"], skills[index]["description"], skills[index].get("category", "")
+                )
+        logger.info(f"Analyzed {len(skills)} skills in one batch ({len(missing)} individually)")
+        return [analyses[index] for index in range(len(skills))]
+    
+    @staticmethod
+    def _parse_json_text(result_text: str) -> Any:
+        """JSON from a model response, without the ```json fence it is sometimes wrapped in"""
+        result_text = result_text.strip()
+        if result_text.startswith("```json"):
+            result_text = result_text[7:]
+        elif result_text.startswith("```"):
+            result_text = result_text[3:]
+        if result_text.endswith("```"):
+            result_text = result_text[:-3]
+        return json.loads(result_text.strip())
+    
+    @staticmethod
+    def _validate_analysis(entry: Any) -> Optional[Dict[str, Any]]:
+        """A batch response item as an analysis dict, or None if it lacks the expected fields"""
+        if not isinstance(entry, dict) or not isinstance(entry.get("index"), int) or isinstance(entry["index"], bool):
+            # JSON true would otherwise pass as index 1
+            return None
+        if not isinstance(entry.get("enhanced_description"), str) or not entry["enhanced_description"].strip():
+            return None
+        if entry.get("suggested_proficiency") not in PROFICIENCY_LEVELS:
+            return None
+        for field in ("keywords", "related_skills", "applications"):
+            value = entry.get(field, [])
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                return None
+        return {
+            "enhanced_description": entry["enhanced_description"],
+            "keywords": entry.get("keywords", []),
+            "suggested_proficiency": entry["suggested_proficiency"],
+            "related_skills": entry.get("related_skills", []),
+            "applications": entry.get("applications", [])
+        }
+    
     async def find_skill_matches(self, user_skills: List[Dict], target_skills: List[Dict]) -> Dict[str, Any]:
         """
         Find skill matches between user skills and target skills
@@ -142,6 +390,11 @@ class GeminiAIService:
         if not self.is_available():
             return self._fallback_matching(user_skills, target_skills)
         
+        cache_key = ai_cache.key("find_skill_matches", MODEL_NAME, user_skills, target_skills)
+        cached = ai_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             user_skills_text = "\n".join([
                 f"- {skill['title']}: {skill['description']}" 
@@ -184,7 +437,7 @@ class GeminiAIService:
             }}
             """
             
-            response = await self.model.generate_content_async(prompt)
+            response = await self._loop_model().generate_content_async(prompt)
             result_text = response.text
             
             # Parse JSON response
@@ -197,6 +450,7 @@ class GeminiAIService:
                 result_text = result_text.strip()
                 
                 result = json.loads(result_text)
+                ai_cache.put(cache_key, result)
                 logger.info(f"Successfully found skill matches")
                 return result
                 
@@ -222,6 +476,11 @@ class GeminiAIService:
         if not self.is_available():
             return self._fallback_categorization(title, description)
         
+        cache_key = ai_cache.key("categorize_skill", MODEL_NAME, title, description)
+        cached = ai_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             prompt = f"""
             Categorize this skill:
@@ -242,7 +501,7 @@ class GeminiAIService:
             }}
             """
             
-            response = await self.model.generate_content_async(prompt)
+            response = await self._loop_model().generate_content_async(prompt)
             result_text = response.text
             
             # Parse JSON response
@@ -255,6 +514,7 @@ class GeminiAIService:
                 result_text = result_text.strip()
                 
                 result = json.loads(result_text)
+                ai_cache.put(cache_key, result)
                 logger.info(f"Successfully categorized skill: {title}")
                 return result
                 
@@ -266,6 +526,80 @@ class GeminiAIService:
             logger.error(f"Error categorizing skill with AI: {e}")
             return self._fallback_categorization(title, description)
     
+    async def suggest_skills(self, user_skills: List[Dict]) -> Dict[str, Any]:
+        """
+        Suggest new skills to learn based on the user's current skills
+        
+        Args:
+            user_skills: User's skills (title, description, category, proficiency_level)
+        
+        Returns:
+            Dictionary with suggestions and whether the AI produced them
+        """
+        if not user_skills:
+            return {"suggestions": STARTER_SUGGESTIONS, "ai_available": self.is_available()}
+        if not self.is_available():
+            return self._fallback_suggestions()
+        
+        cache_key = ai_cache.key("suggest_skills", MODEL_NAME, user_skills)
+        cached = ai_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        user_skills_text = "\n".join([
+            f"- {skill['title']}: {skill['description']} (Category: {skill['category']}, Level: {skill['proficiency_level']})"
+            for skill in user_skills
+        ])
+        
+        try:
+            prompt = f"""
+            Based on the user's current skills, suggest 5 new skills they could learn to enhance their career:
+            
+            User's Current Skills:
+            {user_skills_text}
+            
+            Please suggest skills that:
+            1. Complement their existing skills
+            2. Are in high demand in the job market
+            3. Offer good learning progression
+            4. Cover different categories if possible
+            
+            For each suggestion, provide:
+            - title (clear and concise)
+            - description (detailed but engaging)
+            - category (from: Programming, Design, Business, Marketing, Writing, Teaching, Healthcare, Finance, Other)
+            - proficiency_level (Beginner/Intermediate/Advanced/Expert)
+            - reason (why this skill is valuable for them)
+            
+            Respond in JSON format:
+            {{
+                "suggestions": [
+                    {{
+                        "title": "...",
+                        "description": "...",
+                        "category": "...",
+                        "proficiency_level": "...",
+                        "reason": "..."
+                    }}
+                ]
+            }}
+            """
+            
+            response = await self._loop_model().generate_content_async(prompt)
+            
+            try:
+                result = {"suggestions": self._parse_json_text(response.text).get("suggestions", []), "ai_available": True}
+                ai_cache.put(cache_key, result)
+                return result
+                
+            except (json.JSONDecodeError, AttributeError) as e:
+                logger.error(f"Failed to parse AI suggestions: {e}")
+                return self._fallback_suggestions()
+                
+        except Exception as e:
+            logger.error(f"AI suggestion generation failed: {e}")
+            return self._fallback_suggestions()
+    
     def _fallback_analysis(self, title: str, description: str, category: str) -> Dict[str, Any]:
         """Fallback analysis when AI is not available"""
         # Simple keyword-based analysis
@@ -312,6 +646,10 @@ class GeminiAIService:
             "fallback": True
         }
     
+    def _fallback_suggestions(self) -> Dict[str, Any]:
+        """Fallback suggestions when AI is not available"""
+        return {"suggestions": FALLBACK_SUGGESTIONS, "ai_available": False}
+    
     def _fallback_categorization(self, title: str, description: str) -> Dict[str, Any]:
         """Fallback categorization when AI is not available"""
         # Simple keyword-based categorization
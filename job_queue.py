@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Background jobs backed by a local SQLite file (no broker to run)
+Jobs are rows in JOB_QUEUE_PATH. Any process on the host can enqueue; worker threads in
+every web worker (JOB_WORKERS per process) or a standalone `python job_queue.py` claim
+them one at a time inside BEGIN IMMEDIATE, so each job runs once however many
+gunicorn workers poll the file. A claim is a lease: a job whose worker died is claimed
+again once JOB_LEASE_SECONDS pass.
+
+A failing job is retried up to JOB_MAX_ATTEMPTS times with exponential backoff from
+JOB_RETRY_BASE_SECONDS; its result or last error is kept for polling
+(GET /api/ai/jobs/{id}) for JOB_RESULT_TTL_SECONDS.
+
+Handlers are registered per kind with @job_queue.handler("kind") and receive the JSON
+payload; async handlers, and sync ones calling run_coroutine, run on one event loop per
+worker thread that lives as long as the thread.
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+from database import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Modules whose import registers job handlers, loaded by the workers
+HANDLER_MODULES = ["skill_analysis", "ai_jobs"]
+# Longest retry delay, whatever the attempt count
+MAX_RETRY_DELAY_SECONDS = 600
+# How often each worker deletes finished jobs older than the result TTL
+PURGE_INTERVAL_SECONDS = 3600
+
+_thread_loops = threading.local()
+
+def run_coroutine(coroutine):
+    """
+    Run a coroutine to completion on this thread's event loop, created on first use and
+    kept open (unlike asyncio.run), so clients bound to a loop, such as the Gemini SDK's,
+    stay usable across the jobs a worker thread runs
+    """
+    loop = getattr(_thread_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _thread_loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coroutine)
+
+def close_thread_loop():
+    """Close this thread's event loop, if run_coroutine created one"""
+    loop = getattr(_thread_loops, "loop", None)
+    if loop is not None and not loop.is_closed():
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+    _thread_loops.loop = None
+
+class JobQueue:
+    """SQLite job table with atomic claims, leases and retry scheduling"""
+
+    def __init__(self, path: str, max_attempts: int = 3, retry_base_seconds: float = 2, lease_seconds: float = 300):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.lease_seconds = lease_seconds
+        self.handlers: Dict[str, Callable] = {}
+        self._local = threading.local()
+
+    def handler(self, kind: str):
+        """Register the function running jobs of this kind"""
+        def register(function):
+            self.handlers[kind] = function
+            return function
+        return register
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+                "status TEXT NOT NULL, user_id INTEGER, dedupe_key TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "max_attempts INTEGER NOT NULL, run_at REAL NOT NULL, locked_until REAL, worker TEXT, "
+                "result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status_run_at ON jobs (status, run_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_jobs_dedupe_key ON jobs (dedupe_key, status)")
+            self._local.connection = connection
+        return connection
+
+    def _immediate(self):
+        """Write transaction taking the database lock up front, so concurrent claims serialize"""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        return connection
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        user_id: Optional[int] = None,
+        dedupe_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        delay_seconds: float = 0
+    ) -> int:
+        """
+        Queue a job and return its id. With dedupe_key, a job with the same key that is
+        still waiting to run is reused instead of queueing another one.
+        """
+        now = time.time()
+        connection = self._immediate()
+        try:
+            if dedupe_key is not None:
+                existing = connection.execute(
+                    "SELECT id FROM jobs WHERE dedupe_key = ? AND status = ? LIMIT 1", (dedupe_key, QUEUED)
+                ).fetchone()
+                if existing is not None:
+                    connection.execute("COMMIT")
+                    return existing["id"]
+            job_id = connection.execute(
+                "INSERT INTO jobs (kind, payload, status, user_id, dedupe_key, max_attempts, run_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, json.dumps(payload), QUEUED, user_id, dedupe_key, max_attempts or self.max_attempts, now + delay_seconds, now, now)
+            ).lastrowid
+            connection.execute("COMMIT")
+            return job_id
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def claim(self, worker: str) -> Optional[sqlite3.Row]:
+        """Take the next due job (or one whose lease expired) for this worker, or None"""
+        now = time.time()
+        connection = self._immediate()
+        try:
+            # Jobs whose worker died on their last attempt are not run again
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, locked_until = NULL, updated_at = ? "
+                "WHERE status = ? AND locked_until < ? AND attempts >= max_attempts",
+                (FAILED, "Worker lost (lease expired)", now, RUNNING, now)
+            )
+            job = connection.execute(
+                "SELECT * FROM jobs WHERE (status = ? AND run_at <= ?) OR (status = ? AND locked_until < ?) "
+                "ORDER BY run_at, id LIMIT 1",
+                (QUEUED, now, RUNNING, now)
+            ).fetchone()
+            if job is None:
+                connection.execute("COMMIT")
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, locked_until = ?, worker = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, now + self.lease_seconds, worker, now, job["id"])
+            )
+            job = connection.execute("SELECT * FROM jobs WHERE id = ?", (job["id"],)).fetchone()
+            connection.execute("COMMIT")
+            return job
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def complete(self, job: sqlite3.Row, result: Any):
+        """Store the result, unless the lease expired and another worker took the job over"""
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, locked_until = NULL, updated_at = ? "
+            "WHERE id = ? AND worker = ? AND attempts = ?",
+            (SUCCEEDED, json.dumps(result, default=str), time.time(), job["id"], job["worker"], job["attempts"])
+        )
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with jitter, so failed jobs do not retry in lockstep"""
+        delay = min(self.retry_base_seconds * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+        return delay * random.uniform(0.8, 1.2)
+
+    def fail(self, job: sqlite3.Row, error: str):
+        """Schedule a retry, or mark the job failed once it used its attempts"""
+        now = time.time()
+        if job["attempts"] < job["max_attempts"]:
+            status, run_at = QUEUED, now + self.retry_delay(job["attempts"])
+        else:
+            status, run_at = FAILED, job["run_at"]
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, run_at = ?, error = ?, locked_until = NULL, updated_at = ? "
+            "WHERE id = ? AND worker = ? AND attempts = ?",
+            (status, run_at, error, now, job["id"], job["worker"], job["attempts"])
+        )
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """A job as a dict for the poll endpoint, result decoded"""
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "user_id": row["user_id"],
+            "attempts": row["attempts"],
+            "max_attempts": row["max_attempts"],
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs last updated before the cutoff"""
+        return self._connection().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (SUCCEEDED, FAILED, time.time() - older_than_seconds)
+        ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._connection().execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["count"] for row in rows}
+
+    def run_one(self, worker: str) -> bool:
+        """Claim and run one job; returns whether there was one"""
+        job = self.claim(worker)
+        if job is None:
+            return False
+        function = self.handlers.get(job["kind"])
+        try:
+            if function is None:
+                raise LookupError(f"No handler for job kind '{job['kind']}'")
+            payload = json.loads(job["payload"])
+            result = run_coroutine(function(payload)) if asyncio.iscoroutinefunction(function) else function(payload)
+        except Exception as e:
+            logger.warning(f"Job {job['id']} ({job['kind']}) attempt {job['attempts']} failed: {e}")
+            self.fail(job, f"{type(e).__name__}: {e}")
+        else:
+            self.complete(job, result)
+            logger.debug("Job %s (%s) succeeded", job["id"], job["kind"])
+        return True
+
+class JobWorkerPool:
+    """Threads polling a JobQueue; several processes can run pools on the same file"""
+
+    def __init__(self, job_queue: JobQueue, workers: int, poll_interval_seconds: float = 0.5, result_ttl_seconds: float = 86400):
+        self.job_queue = job_queue
+        self.workers = workers
+        self.poll_interval_seconds = poll_interval_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return
+        for module in HANDLER_MODULES:
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                # Jobs of its kinds fail with "No handler" once out of attempts
+                logger.warning(f"Job handlers in {module} unavailable: {e}")
+        self._stop.clear()
+        prefix = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._run, args=(f"{prefix}-{number}",), name=f"job-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.workers} job workers on {self.job_queue.path}")
+
+    def _run(self, worker: str):
+        last_purge = None
+        try:
+            while not self._stop.is_set():
+                try:
+                    if last_purge is None or time.monotonic() - last_purge > PURGE_INTERVAL_SECONDS:
+                        self.job_queue.purge(self.result_ttl_seconds)
+                        last_purge = time.monotonic()
+                    if not self.job_queue.run_one(worker):
+                        self._stop.wait(self.poll_interval_seconds)
+                except sqlite3.Error as e:
+                    logger.error(f"Job worker {worker} database error: {e}")
+                    self._stop.wait(self.poll_interval_seconds)
+        finally:
+            close_thread_loop()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop polling; jobs in progress finish, or are reclaimed after their lease"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+job_queue = JobQueue(
+    settings.job_queue_path,
+    max_attempts=settings.job_max_attempts,
+    retry_base_seconds=settings.job_retry_base_seconds,
+    lease_seconds=settings.job_lease_seconds
+)
+job_workers = JobWorkerPool(job_queue, settings.job_workers, settings.job_poll_interval_seconds, settings.job_result_ttl_seconds)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    workers = JobWorkerPool(job_queue, max(1, settings.job_workers), settings.job_poll_interval_seconds, settings.job_result_ttl_seconds)
+    workers.start()
+    print(f"SUCCESS: Running {workers.workers} job workers on {job_queue.path}, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        workers.stop(timeout=30)
@@ -0,0 +1,119 @@
+"""
+Logging setup for the API
+configure_logging() installs one root handler from the LOG_* settings:
+- LOG_LEVEL for everything, LOG_MODULE_LEVELS ("crud=DEBUG,routers.users=WARNING") per logger
+- LOG_FORMAT "text" or "json" (one JSON object per line, extra={...} fields included)
+- LOG_DEBUG_SAMPLE_RATE keeps that fraction of DEBUG records, so debug can stay on under load
+- LOG_QUEUE hands records to a QueueListener thread, request threads never block on stdout
+
+Hot paths log with %-style arguments (logger.debug("... %s", value)), so at the default
+INFO level a debug call costs one isEnabledFor check and formats nothing.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from database import settings
+
+# LogRecord attributes that are not extra={...} fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, extra fields and exception"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class DebugSamplingFilter(logging.Filter):
+    """Lets through `rate` of DEBUG records at random, and every record above DEBUG"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """"crud=DEBUG, routers.users=warning" -> {"crud": 10, "routers.users": 30}"""
+    levels = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        name, separator, level = part.partition("=")
+        numeric = logging.getLevelName(level.strip().upper())
+        if not separator or not name.strip() or not isinstance(numeric, int):
+            raise ValueError(f"LOG_MODULE_LEVELS entries must look like module=LEVEL, got '{part}'")
+        levels[name.strip()] = numeric
+    return levels
+
+_listener: Optional[QueueListener] = None
+
+def configure_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    module_levels: Optional[str] = None,
+    debug_sample_rate: Optional[float] = None,
+    queued: Optional[bool] = None,
+    stream=None
+):
+    """Replace the root handlers according to the arguments, falling back to the LOG_* settings"""
+    global _listener
+    level = (level or settings.log_level).upper()
+    log_format = log_format or settings.log_format
+    if log_format not in ("text", "json"):
+        raise ValueError(f"LOG_FORMAT must be 'text' or 'json', got '{log_format}'")
+    levels = parse_module_levels(settings.log_module_levels if module_levels is None else module_levels)
+    debug_sample_rate = settings.log_debug_sample_rate if debug_sample_rate is None else debug_sample_rate
+    queued = settings.log_queue if queued is None else queued
+
+    shutdown_logging()
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+        existing.close()
+    root.setLevel(level)
+    for name, module_level in levels.items():
+        module_logger = logging.getLogger(name)
+        module_logger.setLevel(module_level)
+        # fileConfig (alembic env.py) disables loggers that exist at the time, a configured level turns them back on
+        module_logger.disabled = False
+
+    if queued:
+        records = queue.SimpleQueue()
+        _listener = QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+        handler = QueueHandler(records)
+    # Sample before a record is queued, dropped debug records cost no formatting
+    handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+    root.addHandler(handler)
+    return root
+
+def shutdown_logging():
+    """Flush and stop the queue listener thread, if one is running"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(shutdown_logging)
@@ -1,21 +1,28 @@
 from fastapi import FastAPI, Header, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from anyio import to_thread
 from sqlalchemy import text
 from sqlalchemy.orm import Session
-from database import engine, Base, get_db, SessionLocal, Settings
+from database import engine, async_engine, Base, get_db, SessionLocal, Settings
+from pool_metrics import get_pool_stats
+from compression import CompressionMiddleware, PrecompressedStaticFiles
+from logging_config import configure_logging
+from notification_retention import retention_metrics, start_retention_worker, stop_retention_worker
+from job_queue import job_workers
 from routers import users, skills, exchanges, notifications, ai
 from SIMPLE_ADMIN_FIXED import simple_admin_router
 from admin_auth_endpoint import admin_auth_router
-from crud import get_user_by_username, get_skill, create_skill_exchange_request, create_notification
-from schemas import SkillExchangeRequestCreate, NotificationCreate
+from crud import get_user_by_username, get_skill, create_skill_exchange_request_with_notification
+from schemas import SkillExchangeRequestCreate
 import logging
+import os
 import jwt
 
 # Settings instance
 settings = Settings()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (LOG_* settings, see logging_config.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 def create_database_tables():
@@ -27,7 +34,7 @@ def create_database_tables():
         with engine.connect() as connection:
             result = connection.execute(text("SELECT DB_NAME()"))
             current_db = result.scalar()
-            logger.info(f"Connected to database: {current_db}")
+            logger.info("Connected to database: %s", current_db)
         
         # Create all tables
         logger.info("Creating tables: users, skills, skill_exchange_requests")
@@ -40,14 +47,17 @@ def create_database_tables():
             for table in tables:
                 result = connection.execute(text(f"SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = '{table}'"))
                 exists = result.scalar() > 0
-                logger.info(f"Table '{table}': {'✓ Created' if exists else '✗ Not found'}")
+                logger.info("Table '%s': %s", table, "✓ Created" if exists else "✗ Not found")
             
     except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+        logger.error("Error creating database tables: %s", e)
         raise
 
-# Create database tables on startup
-create_database_tables()
+# Create database tables on startup unless migrations own the schema
+if settings.db_schema_mode == "create_all":
+    create_database_tables()
+else:
+    logger.info("Skipping schema creation, apply migrations with `alembic upgrade head`")
 
 app = FastAPI(
     title="Community Skill Swap Platform",
@@ -88,6 +98,15 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type", "*"],
 )
 
+# Compress JSON and text responses (added last so it wraps CORS and sees the final headers)
+if settings.compression_minimum_size > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality
+    )
+
 # Include admin auth router FIRST (before other routes)
 app.include_router(admin_auth_router)
 
@@ -103,6 +122,44 @@ app.include_router(exchanges.router, prefix="/api/exchanges")
 app.include_router(notifications.router, prefix="/api/notifications")
 app.include_router(ai.router)
 
+# Frontend: hashed, precompressed build from `python build_static.py` when present, else the sources
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+FRONTEND_BUILD_DIR = os.path.join(FRONTEND_DIR, "dist")
+if os.path.isdir(FRONTEND_DIR):
+    app.mount(
+        settings.static_mount_path,
+        PrecompressedStaticFiles(directory=FRONTEND_BUILD_DIR if os.path.isdir(FRONTEND_BUILD_DIR) else FRONTEND_DIR, html=True),
+        name="frontend"
+    )
+
+@app.on_event("startup")
+async def configure_threadpool():
+    """Bound the threadpool that runs sync handlers, so blocking DB and bcrypt work stays off the event loop"""
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_max_workers
+    logger.info("Threadpool limited to %s workers", settings.threadpool_max_workers)
+
+@app.on_event("startup")
+async def start_notification_retention():
+    """Periodic notification retention inside the worker, when not left to cron"""
+    if settings.notification_retention_interval_seconds > 0:
+        start_retention_worker(settings.notification_retention_interval_seconds)
+        logger.info("Notification retention every %ss", settings.notification_retention_interval_seconds)
+
+@app.on_event("shutdown")
+async def stop_notification_retention():
+    stop_retention_worker(timeout=5)
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Background AI job workers in this process, when not left to `python job_queue.py`"""
+    if settings.job_workers > 0:
+        job_workers.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """Jobs still queued stay in the queue file; a job cut short is rerun after its lease"""
+    job_workers.stop(timeout=5)
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Community Skill Swap Platform API"}
@@ -114,7 +171,7 @@ class Request(BaseModel):
     skill_id: int
 
 @app.post("/request-skill")
-async def direct_request_skill(
+def direct_request_skill(
     request: Request,
     db: Session = Depends(get_db),
     authorization: str = Header(None)
@@ -124,70 +181,54 @@ async def direct_request_skill(
     Matches frontend call to http://127.0.0.1:8000/request-skill
     """
     try:
-        print(f"DEBUG: Received skill exchange request")
-        print(f"DEBUG: Authorization header: {authorization}")
-        
         # Extract token from Authorization header
         if not authorization or not authorization.startswith("Bearer "):
-            print(f"ERROR: Invalid authorization header: {authorization}")
+            logger.debug("Skill request rejected: missing or non-Bearer authorization header")
             raise HTTPException(
                 status_code=401, 
                 detail="Authorization header required with Bearer token"
             )
         
         token = authorization.split(" ")[1]
-        print(f"DEBUG: Extracted token: {token[:30]}...")
         
         # Decode JWT token to get user
         try:
             payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
             username: str = payload.get("sub")
-            print(f"DEBUG: Decoded username: {username}")
-            
             if username is None:
-                print(f"ERROR: No username in token payload")
+                logger.debug("Skill request rejected: no subject in token")
                 raise HTTPException(status_code=401, detail="Invalid token")
                 
         except jwt.ExpiredSignatureError:
-            print(f"ERROR: Token has expired")
+            logger.debug("Skill request rejected: token expired")
             raise HTTPException(status_code=401, detail="Token has expired")
         except jwt.InvalidTokenError as e:
-            print(f"ERROR: Invalid token: {e}")
+            logger.debug("Skill request rejected: invalid token (%s)", e)
             raise HTTPException(status_code=401, detail="Invalid token")
         
         # Get user from database
         user = get_user_by_username(db, username=username)
         if user is None:
-            print(f"ERROR: User not found in database: {username}")
+            logger.debug("Skill request rejected: unknown user %s", username)
             raise HTTPException(status_code=401, detail="User not found")
         
-        print(f"DEBUG: Found user: {user.username} (ID: {user.id})")
-        
         # Extract request data
         message = request.message.strip()
         skill_id = request.skill_id
         
-        print(f"DEBUG: Request data - skill_id: {skill_id}, message: '{message}'")
-        
         if not message:
-            print(f"ERROR: Empty message")
             raise HTTPException(status_code=400, detail="Message is required")
         
         if not skill_id:
-            print(f"ERROR: Invalid skill_id: {skill_id}")
             raise HTTPException(status_code=400, detail="Skill ID is required")
         
         # Check if skill exists
         skill = get_skill(db, skill_id=skill_id)
         if not skill:
-            print(f"ERROR: Skill not found: {skill_id}")
             raise HTTPException(status_code=404, detail="Skill not found")
         
-        print(f"DEBUG: Found skill: {skill.title} (ID: {skill.id}, Owner: {skill.user_id})")
-        
         # Check if user is not requesting their own skill
         if skill.user_id == user.id:
-            print(f"ERROR: User requesting own skill: {skill.user_id} == {user.id}")
             raise HTTPException(status_code=400, detail="Cannot request your own skill")
         
         # Create exchange request
@@ -196,45 +237,21 @@ async def direct_request_skill(
             message=message
         )
         
-        print(f"DEBUG: Creating exchange request...")
-        db_request = create_skill_exchange_request(
-            db, 
-            request=skill_request, 
-            requester_id=user.id, 
-            skill_owner_id=skill.user_id
+        db_request = create_skill_exchange_request_with_notification(
+            db,
+            request=skill_request,
+            requester=user,
+            skill=skill
         )
         
-        print(f"DEBUG: Exchange request created with ID: {db_request.id}")
-        
-        # Create notification for skill owner
-        try:
-            print(f"DEBUG: Creating notification for skill owner...")
-            notification = NotificationCreate(
-                title="New Skill Exchange Request",
-                message=f"{user.full_name or user.username} wants to learn your skill: {skill.title}",
-                type="exchange_request",
-                related_id=db_request.id,
-                user_id=skill.user_id
-            )
-            create_notification(db, notification)
-            print(f"DEBUG: Notification created successfully")
-            
-        except Exception as e:
-            print(f"ERROR: Notification creation failed: {e}")
-            print(f"ERROR: Exception type: {type(e).__name__}")
-            print(f"ERROR: Exception details: {str(e)}")
-            # Don't re-raise - notification failure shouldn't crash the request
-            print("WARNING: Continuing without notification...")
-        
-        print(f"DEBUG: Preparing response...")
-        skill_owner_username = skill.owner.username if skill.owner else "Unknown"
-        print(f"DEBUG: Skill owner username: {skill_owner_username}")
+        logger.debug("User %s requested skill %s (exchange request %s)", user.id, skill_id, db_request['id'])
+        skill_owner_username = db_request['skill_owner']['username']
         
         return {
             "success": True,
             "message": "Skill request sent successfully",
-            "request_id": db_request.id,
-            "skill_title": skill.title,
+            "request_id": db_request['id'],
+            "skill_title": db_request['skill']['title'],
             "skill_owner": skill_owner_username
         }
         
@@ -242,14 +259,17 @@ async def direct_request_skill(
         # Re-raise HTTP exceptions (validation errors)
         raise
     except Exception as e:
-        print(f"ERROR: Unexpected error in direct_request_skill: {e}")
-        print(f"ERROR: Exception type: {type(e).__name__}")
-        print(f"ERROR: Exception details: {str(e)}")
+        logger.exception("Unexpected error in direct_request_skill: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/health")
 async def health_check(db: Session = Depends(get_db)):
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "database_pool": get_pool_stats(engine),
+        "async_database_pool": get_pool_stats(async_engine),
+        "notification_retention": retention_metrics.snapshot()
+    }
 
 @app.get("/database-status")
 async def database_status():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -20,6 +20,11 @@ class User(Base):
     skill_requests_sent = relationship("SkillExchangeRequest", foreign_keys="SkillExchangeRequest.requester_id", back_populates="requester")
     skill_requests_received = relationship("SkillExchangeRequest", foreign_keys="SkillExchangeRequest.skill_owner_id", back_populates="skill_owner")
     notifications = relationship("Notification", back_populates="user")
+    
+    # Keyset pagination indexes match the (created_at, id) cursor ordering
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
 class Skill(Base):
     __tablename__ = "skills"
@@ -37,6 +42,41 @@ class Skill(Base):
     # Relationships
     owner = relationship("User", foreign_keys=[user_id], back_populates="skills_offered")
     exchange_requests = relationship("SkillExchangeRequest", back_populates="skill")
+    analysis = relationship("SkillAnalysis", back_populates="skill", uselist=False, cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Filtered to active skills where the dialect supports partial indexes (plain index elsewhere)
+        Index(
+            "ix_skills_created_at_id", "created_at", "id",
+            sqlite_where=is_active == True,
+            postgresql_where=is_active == True,
+            mssql_where=is_active == True
+        ),
+        Index("ix_skills_active_category_created_at", "is_active", "category", "created_at", "id"),
+        Index("ix_skills_user_active", "user_id", "is_active"),
+    )
+
+class SkillAnalysis(Base):
+    __tablename__ = "skill_analyses"
+    
+    # AI analysis of a skill (skill_analysis.py), computed in the background for the content hashed in content_hash
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    content_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, ready, failed
+    suggested_proficiency = Column(String(20))
+    suggested_category = Column(String(50))
+    analysis = Column(JSON)  # analyze_skill_description result
+    categorization = Column(JSON)  # categorize_skill result
+    is_fallback = Column(Boolean, default=False)  # keyword fallback, AI was unavailable
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    analyzed_at = Column(DateTime(timezone=True))
+    
+    skill = relationship("Skill", back_populates="analysis")
+    
+    __table_args__ = (
+        Index("ix_skill_analyses_status", "status"),
+    )
 
 class SkillExchangeRequest(Base):
     __tablename__ = "skill_exchange_requests"
@@ -54,6 +94,11 @@ class SkillExchangeRequest(Base):
     skill = relationship("Skill", back_populates="exchange_requests")
     requester = relationship("User", foreign_keys=[requester_id], back_populates="skill_requests_sent")
     skill_owner = relationship("User", foreign_keys=[skill_owner_id], back_populates="skill_requests_received")
+    
+    __table_args__ = (
+        Index("ix_skill_exchange_requests_requester_created_at_id", "requester_id", "created_at", "id"),
+        Index("ix_skill_exchange_requests_owner_created_at_id", "skill_owner_id", "created_at", "id"),
+    )
 
 class Notification(Base):
     __tablename__ = "notifications"
@@ -69,3 +114,33 @@ class Notification(Base):
     
     # Relationships
     user = relationship("User", back_populates="notifications")
+    
+    __table_args__ = (
+        Index("ix_notifications_user_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_notifications_user_is_read", "user_id", "is_read"),
+    )
+
+class NotificationCounter(Base):
+    __tablename__ = "notification_counters"
+    
+    # Unread notifications per user, maintained by crud in the same transaction as the notification rows
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+
+class NotificationArchive(Base):
+    __tablename__ = "notifications_archive"
+    
+    # Notifications moved out by the retention job, keeping their original ids
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    title = Column(String(200), nullable=False)
+    message = Column(Text, nullable=False)
+    type = Column(String(50), nullable=False)
+    related_id = Column(Integer, nullable=True)
+    is_read = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_notifications_archive_user_created_at", "user_id", "created_at"),
+    )
@@ -0,0 +1,112 @@
+"""
+In-process pub/sub hub for pushing new notifications to connected clients
+crud publishes every committed notification here; routers.notifications streams
+them to subscribers over Server-Sent Events, so idle clients cost no DB queries.
+
+Publishing goes through a backend so notifications created in one gunicorn worker
+can reach clients connected to another. The "local" backend delivers inside the
+current process only; set NOTIFICATION_BACKEND to "module:Class" to plug in a
+broker-backed one (it needs start(deliver), publish(user_id, payload) and stop()).
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict
+from database import settings
+
+logger = logging.getLogger(__name__)
+
+class LocalNotificationBackend:
+    """Single-process stand-in for a cross-worker broker, delivers straight to this worker's hub"""
+
+    def __init__(self):
+        self._deliver = None
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, user_id: int, payload: Dict[str, Any]):
+        if self._deliver is not None:
+            self._deliver(user_id, payload)
+
+    def stop(self):
+        self._deliver = None
+
+BACKENDS = {
+    "local": LocalNotificationBackend,
+}
+
+def load_backend(name: str):
+    """Instantiate a backend by registered name or "module:Class" path"""
+    if name in BACKENDS:
+        return BACKENDS[name]()
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+class Subscription:
+    """One connected client: a bounded queue owned by the event loop that serves it"""
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, max_pending: int):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_pending)
+
+    def offer(self, payload):
+        # Runs on the subscriber's loop; a client that stopped reading drops events instead of growing memory
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning(f"Dropping notification for slow subscriber of user {self.user_id}")
+
+class NotificationHub:
+    """Fan-out of published notifications to this worker's subscribers, safe to publish from any thread"""
+
+    def __init__(self, backend, max_pending: int = 100):
+        self.backend = backend
+        self.max_pending = max_pending
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+        self.backend.start(self._deliver)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Register a subscriber; must be called from the event loop that will read it"""
+        subscription = Subscription(user_id, asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.user_id]
+
+    def subscriber_count(self, user_id: int = None) -> int:
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscriptions.get(user_id, ()))
+            return sum(len(subscribers) for subscribers in self._subscriptions.values())
+
+    def publish(self, user_id: int, payload: Dict[str, Any]):
+        """Publish to every worker through the backend; never raises into the caller's transaction code"""
+        try:
+            self.backend.publish(user_id, payload)
+        except Exception as e:
+            logger.error(f"Failed to publish notification for user {user_id}: {e}")
+
+    def _deliver(self, user_id: int, payload: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, payload)
+            except RuntimeError:
+                # Loop already closed, the stream is gone
+                self.unsubscribe(subscription)
+
+notification_hub = NotificationHub(load_backend(settings.notification_backend), settings.notification_stream_max_pending)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Retention job for the notifications table
+Read notifications older than NOTIFICATION_RETENTION_DAYS, and read notifications beyond
+the newest NOTIFICATION_RETENTION_MAX_PER_USER of a user, are deleted or moved to
+notifications_archive (NOTIFICATION_RETENTION_MODE = "delete" or "archive").
+
+Rows are purged in batches of NOTIFICATION_RETENTION_BATCH_SIZE, each in its own short
+transaction with a pause in between, so the job never holds long locks on a table the
+API reads on every request. Unread notifications are never purged, which keeps the
+per-user unread counters exact.
+
+Run it from cron with `python notification_retention.py`, or inside the web workers by
+setting NOTIFICATION_RETENTION_INTERVAL_SECONDS. Runners may overlap (every gunicorn
+worker runs one in-process): archiving skips rows already archived, and a batch another
+runner archived first is left to it.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from database import SessionLocal, settings
+from models import Notification, NotificationArchive
+from pagination import apply_cursor, encode_cursor, newest_first
+
+logger = logging.getLogger(__name__)
+
+MODES = ("delete", "archive")
+
+# Columns copied to notifications_archive, archived_at is filled by the database
+ARCHIVED_COLUMNS = ["id", "user_id", "title", "message", "type", "related_id", "is_read", "created_at"]
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+class RetentionMetrics:
+    """Thread-safe totals of what the retention job purged in this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.failures = 0
+        self.batches = 0
+        self.rows_deleted = 0
+        self.rows_archived = 0
+        self.last_run_at = None
+        self.last_duration_ms = None
+        self.last_result = None
+        self.last_error = None
+
+    def record_batch(self, purged: int, mode: str):
+        with self._lock:
+            self.batches += 1
+            if mode == "archive":
+                self.rows_archived += purged
+            else:
+                self.rows_deleted += purged
+
+    def record_run(self, started: float, result: Optional[dict] = None, error: Optional[Exception] = None):
+        with self._lock:
+            self.runs += 1
+            self.last_run_at = datetime.utcnow().isoformat()
+            self.last_duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            if error is not None:
+                self.failures += 1
+                self.last_error = str(error)
+            else:
+                self.last_result = result
+                self.last_error = None
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "failures": self.failures,
+                "batches": self.batches,
+                "rows_deleted": self.rows_deleted,
+                "rows_archived": self.rows_archived,
+                "last_run_at": self.last_run_at,
+                "last_duration_ms": self.last_duration_ms,
+                "last_result": self.last_result,
+                "last_error": self.last_error,
+            }
+
+retention_metrics = RetentionMetrics()
+
+def _archive_statement(db, ids):
+    """
+    INSERT ... SELECT of the batch into notifications_archive that skips ids already there,
+    so runners in several workers archiving the same batch do not collide on the primary key
+    """
+    rows = select(*[getattr(Notification, column) for column in ARCHIVED_COLUMNS]).where(
+        Notification.id.in_(ids),
+        ~exists().where(NotificationArchive.id == Notification.id)
+    )
+    dialect_insert = DIALECT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        return insert(NotificationArchive).from_select(ARCHIVED_COLUMNS, rows)
+    # Also covers a concurrent runner's rows committed after our NOT EXISTS check
+    return dialect_insert(NotificationArchive).from_select(ARCHIVED_COLUMNS, rows).on_conflict_do_nothing(index_elements=["id"])
+
+def _purge_batch(db, ids, mode: str) -> int:
+    """Archive (optionally) and delete one batch of notifications in its own transaction"""
+    try:
+        if mode == "archive":
+            db.execute(_archive_statement(db, ids))
+        purged = db.execute(
+            delete(Notification).where(Notification.id.in_(ids)).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+    except IntegrityError:
+        # Databases without ON CONFLICT: another runner archived this batch first and deletes it
+        db.rollback()
+        logger.info("Notification retention batch already archived by another runner")
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    retention_metrics.record_batch(purged, mode)
+    return purged
+
+def _purge(db, id_query, mode: str, batch_size: int, pause_seconds: float, stop: Optional[threading.Event]) -> int:
+    """Purge the rows selected by id_query, oldest ids first, until none are left"""
+    total = 0
+    while not (stop is not None and stop.is_set()):
+        ids = [row_id for (row_id,) in id_query.order_by(Notification.id).limit(batch_size)]
+        if not ids:
+            break
+        total += _purge_batch(db, ids, mode)
+        if len(ids) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return total
+
+def _purge_expired(db, cutoff: datetime, mode: str, batch_size: int, pause_seconds: float, stop) -> int:
+    expired = db.query(Notification.id).filter(Notification.is_read == True, Notification.created_at < cutoff)
+    return _purge(db, expired, mode, batch_size, pause_seconds, stop)
+
+def _purge_over_cap(db, max_per_user: int, mode: str, batch_size: int, pause_seconds: float, stop) -> int:
+    total = 0
+    over_cap = [user_id for (user_id,) in db.query(Notification.user_id).group_by(Notification.user_id).having(
+        func.count(Notification.id) > max_per_user
+    )]
+    for user_id in over_cap:
+        if stop is not None and stop.is_set():
+            break
+        # Oldest notification the user keeps; read ones after it in newest-first order go
+        boundary = db.query(Notification.created_at, Notification.id).filter(
+            Notification.user_id == user_id
+        ).order_by(*newest_first(Notification)).offset(max_per_user - 1).limit(1).first()
+        if boundary is None or boundary.created_at is None:
+            continue
+        older = apply_cursor(
+            db.query(Notification.id).filter(Notification.user_id == user_id, Notification.is_read == True),
+            Notification,
+            encode_cursor(boundary.created_at, boundary.id)
+        )
+        total += _purge(db, older, mode, batch_size, pause_seconds, stop)
+    return total
+
+def run_retention(db=None, now: Optional[datetime] = None, stop: Optional[threading.Event] = None):
+    """
+    Apply the configured retention policy once.
+    Returns {"mode", "expired", "over_cap"} with the number of notifications purged by each rule.
+    """
+    mode = settings.notification_retention_mode
+    if mode not in MODES:
+        raise ValueError(f"NOTIFICATION_RETENTION_MODE must be one of {', '.join(MODES)}, got '{mode}'")
+    batch_size = settings.notification_retention_batch_size
+    pause_seconds = settings.notification_retention_batch_pause_seconds
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        result = {"mode": mode, "expired": 0, "over_cap": 0}
+        if settings.notification_retention_days > 0:
+            cutoff = (now or datetime.utcnow()) - timedelta(days=settings.notification_retention_days)
+            result["expired"] = _purge_expired(db, cutoff, mode, batch_size, pause_seconds, stop)
+        if settings.notification_retention_max_per_user > 0:
+            result["over_cap"] = _purge_over_cap(db, settings.notification_retention_max_per_user, mode, batch_size, pause_seconds, stop)
+    except Exception as e:
+        retention_metrics.record_run(started, error=e)
+        raise
+    finally:
+        if own_session:
+            db.close()
+    retention_metrics.record_run(started, result)
+    logger.info(f"Notification retention: {result['expired']} expired and {result['over_cap']} over-cap notifications ({mode})")
+    return result
+
+_stop = threading.Event()
+_worker = None
+
+def _worker_loop(interval_seconds: int):
+    while not _stop.wait(interval_seconds):
+        try:
+            run_retention(stop=_stop)
+        except Exception as e:
+            logger.error(f"Notification retention failed: {e}")
+
+def start_retention_worker(interval_seconds: int):
+    """Run the retention job every interval_seconds on a daemon thread until stop_retention_worker()"""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return _worker
+    _stop.clear()
+    _worker = threading.Thread(target=_worker_loop, args=(interval_seconds,), name="notification-retention", daemon=True)
+    _worker.start()
+    return _worker
+
+def stop_retention_worker(timeout: Optional[float] = None):
+    """Stop the worker; a batch in progress finishes, the remaining ones are skipped"""
+    global _worker
+    _stop.set()
+    if _worker is not None:
+        _worker.join(timeout)
+        _worker = None
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        result = run_retention()
+        print(f"SUCCESS: Purged {result['expired']} expired and {result['over_cap']} over-cap notifications ({result['mode']})")
+    except Exception as e:
+        print(f"ERROR: Notification retention failed: {e}")
+        raise
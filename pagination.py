@@ -0,0 +1,89 @@
+"""
+Keyset (cursor) pagination helpers for list endpoints
+Lists are ordered newest first by (created_at, id); a cursor is an opaque token
+holding the position of the last row of the previous page, so fetching page N
+seeks straight into the (created_at, id) index instead of skipping N * limit rows
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import and_, or_, literal, DateTime, String
+from sqlalchemy.types import TypeDecorator
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class CursorTimestamp(TypeDecorator):
+    """
+    Binds the cursor timestamp in the text format SQLite stores DateTime in.
+    server_default=func.now() writes whole seconds as 'YYYY-MM-DD HH:MM:SS' while
+    values set from Python always carry '.ffffff', so on SQLite a tie on created_at
+    is matched as the range between the short and the fractional spelling.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def __init__(self, fractional: bool = False):
+        super().__init__()
+        self.fractional = fractional
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if dialect.name == "sqlite" and value is not None:
+            value = value.replace(tzinfo=None)
+            return value.strftime("%Y-%m-%d %H:%M:%S.%f" if self.fractional or value.microsecond else "%Y-%m-%d %H:%M:%S")
+        return value
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str):
+    """Decode a cursor into (created_at, id), raising ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+def newest_first(model):
+    """Ordering that matches the cursor key"""
+    return (model.created_at.desc(), model.id.desc())
+
+def apply_cursor(query, model, cursor: Optional[str]):
+    """Restrict a Query or Select to rows strictly after the cursor position"""
+    if not cursor:
+        return query
+    created_at, row_id = decode_cursor(cursor)
+    # Both bounds are the same timestamp everywhere except SQLite, see CursorTimestamp
+    lower = literal(created_at, CursorTimestamp())
+    upper = literal(created_at, CursorTimestamp(fractional=True))
+    return query.filter(or_(
+        model.created_at < lower,
+        and_(model.created_at >= lower, model.created_at <= upper, model.id < row_id)
+    ))
+
+def next_cursor(rows, limit: int) -> Optional[str]:
+    """Cursor for the page after rows, or None when this was the last page"""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    if getattr(last, "cursor_key", None) is not None:
+        # Projected rows carry their key even when created_at/id are not in the payload
+        created_at, row_id = last.cursor_key
+    elif isinstance(last, dict):
+        created_at, row_id = last.get("created_at"), last.get("id")
+    else:
+        created_at, row_id = last.created_at, last.id
+    if created_at is None:
+        return None
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return encode_cursor(created_at, row_id)
@@ -0,0 +1,78 @@
+"""
+Connection pool instrumentation for the database engines
+Tracks how long requests wait for a pooled connection and reports pool occupancy
+"""
+
+import threading
+import time
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# Upper bounds (milliseconds) of the checkout wait time histogram buckets
+WAIT_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+
+class WaitTimeHistogram:
+    """Thread-safe cumulative histogram of connection checkout wait times"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, wait_ms: float):
+        with self._lock:
+            index = len(WAIT_BUCKETS_MS)
+            for i, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    index = i
+                    break
+            self.bucket_counts[index] += 1
+            self.count += 1
+            self.total_ms += wait_ms
+            self.max_ms = max(self.max_ms, wait_ms)
+
+    def snapshot(self):
+        with self._lock:
+            buckets = {f"le_{bound}ms": count for bound, count in zip(WAIT_BUCKETS_MS, self.bucket_counts)}
+            buckets["le_inf"] = self.bucket_counts[-1]
+            return {
+                "count": self.count,
+                "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "buckets": buckets
+            }
+
+class WaitTimingMixin:
+    """Times QueuePool._do_get, which is where a checkout blocks when the pool is exhausted"""
+
+    def _do_get(self):
+        if not hasattr(self, "wait_histogram"):
+            self.wait_histogram = WaitTimeHistogram()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_histogram.observe((time.perf_counter() - start) * 1000)
+
+class InstrumentedQueuePool(WaitTimingMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncAdaptedQueuePool(WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+def get_pool_stats(engine):
+    """Current occupancy and wait statistics for an engine's pool (sync or async engine)"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        })
+    histogram = getattr(pool, "wait_histogram", None)
+    stats["checkout_wait"] = histogram.snapshot() if histogram else WaitTimeHistogram().snapshot()
+    return stats
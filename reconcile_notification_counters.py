@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Script to reconcile the per-user unread notification counters with the notifications table
+Counters are maintained transactionally by crud; run this periodically (cron) to repair
+drift from manual SQL edits or rows written outside the application.
+"""
+
+from database import SessionLocal
+import crud
+
+def reconcile_notification_counters():
+    """Recompute all unread counters and report how many were corrected"""
+    db = SessionLocal()
+    try:
+        corrected = crud.reconcile_notification_counters(db)
+        print(f"SUCCESS: Reconciled notification counters, {corrected} corrected")
+        return corrected
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR: Error reconciling notification counters: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    reconcile_notification_counters()
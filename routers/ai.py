@@ -3,8 +3,9 @@ AI Router for Skill Swap Platform
 Provides AI-powered endpoints for skill analysis and matching
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from anyio import to_thread
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Dict, Any
 import logging
 
@@ -13,17 +14,32 @@ from models import User, Skill
 from schemas import SkillResponse
 from routers.users import get_current_user
 from gemini_service import gemini_service
+from ai_cache import ai_cache
+from ai_jobs import skill_suggestions, user_skills_for_suggestions
+from job_queue import job_queue
+from skill_analysis import READY, analysis_to_dict, needs_analysis, queue_analysis, status_of
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/ai", tags=["AI"])
 
+def _job_accepted(response: Response, job_id: int, message: str) -> Dict[str, Any]:
+    """202 body pointing at the poll endpoint of a queued job"""
+    response.status_code = status.HTTP_202_ACCEPTED
+    return {
+        "success": True,
+        "data": {"job_id": job_id, "status_url": f"{router.prefix}/jobs/{job_id}"},
+        "message": message
+    }
+
 @router.post("/analyze-skill")
 async def analyze_skill(
     title: str,
     description: str,
+    response: Response,
     category: str = "",
+    background: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -34,15 +50,24 @@ async def analyze_skill(
         title: Skill title
         description: Skill description
         category: Skill category (optional)
+        background: Queue the analysis and answer 202 with a job id instead of waiting
         current_user: Authenticated user
         db: Database session
     
     Returns:
-        Enhanced skill analysis with AI insights
+        Enhanced skill analysis with AI insights, or the queued job
     """
     try:
         logger.info(f"Analyzing skill '{title}' for user {current_user.username}")
         
+        if background:
+            job_id = await to_thread.run_sync(lambda: job_queue.enqueue(
+                "analyze_skill",
+                {"title": title, "description": description, "category": category},
+                user_id=current_user.id
+            ))
+            return _job_accepted(response, job_id, "Skill analysis queued")
+        
         # Use Gemini AI service
         analysis = await gemini_service.analyze_skill_description(title, description, category)
         
@@ -161,7 +186,7 @@ async def find_skill_matches(
         )
 
 @router.get("/my-skills-analysis")
-async def get_my_skills_analysis(
+def get_my_skills_analysis(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -173,13 +198,14 @@ async def get_my_skills_analysis(
         db: Database session
     
     Returns:
-        Comprehensive analysis of user's skills with insights
+        Comprehensive analysis of user's skills with insights; skills whose stored
+        analysis is not ready yet have ai_analysis null and are queued
     """
     try:
         logger.info(f"Getting skills analysis for user {current_user.username}")
         
-        # Get user's skills from database
-        user_skills_query = db.query(Skill).filter(Skill.user_id == current_user.id)
+        # Get user's skills from database, with their stored AI analysis
+        user_skills_query = db.query(Skill).options(joinedload(Skill.analysis)).filter(Skill.user_id == current_user.id)
         user_skills = user_skills_query.all()
         
         if not user_skills:
@@ -198,7 +224,6 @@ async def get_my_skills_analysis(
         # Analyze skills
         categories = {}
         proficiency_levels = {}
-        enhanced_skills = []
         
         for skill in user_skills:
             # Count categories
@@ -212,30 +237,21 @@ async def get_my_skills_analysis(
                 proficiency_levels[skill.proficiency_level] += 1
             else:
                 proficiency_levels[skill.proficiency_level] = 1
-            
-            # Get AI analysis for each skill
-            try:
-                analysis = await gemini_service.analyze_skill_description(
-                    skill.title, skill.description, skill.category
-                )
-                enhanced_skills.append({
-                    "id": skill.id,
-                    "title": skill.title,
-                    "description": skill.description,
-                    "category": skill.category,
-                    "proficiency_level": skill.proficiency_level,
-                    "ai_analysis": analysis
-                })
-            except Exception as e:
-                logger.warning(f"Failed to analyze skill {skill.id}: {e}")
-                enhanced_skills.append({
-                    "id": skill.id,
-                    "title": skill.title,
-                    "description": skill.description,
-                    "category": skill.category,
-                    "proficiency_level": skill.proficiency_level,
-                    "ai_analysis": None
-                })
+        
+        # Serve the analyses computed in the background; missing or stale ones are queued, never awaited here
+        enhanced_skills = []
+        for skill in user_skills:
+            analysis_status = status_of(skill, skill.analysis)
+            enhanced_skills.append({
+                "id": skill.id,
+                "title": skill.title,
+                "description": skill.description,
+                "category": skill.category,
+                "proficiency_level": skill.proficiency_level,
+                "ai_analysis": analysis_to_dict(skill.analysis) if analysis_status == READY else None,
+                "ai_analysis_status": analysis_status
+            })
+        queue_analysis([skill.id for skill in user_skills if needs_analysis(skill, skill.analysis)], user_id=current_user.id)
         
         # Generate recommendations
         recommendations = []
@@ -260,7 +276,8 @@ async def get_my_skills_analysis(
                 "proficiency_levels": proficiency_levels,
                 "enhanced_skills": enhanced_skills,
                 "recommendations": recommendations,
-                "ai_available": gemini_service.is_available()
+                "ai_available": gemini_service.is_available(),
+                "partial": any(skill["ai_analysis"] is None for skill in enhanced_skills)
             },
             "message": "Skills analysis completed successfully"
         }
@@ -272,6 +289,40 @@ async def get_my_skills_analysis(
             detail=f"Failed to get skills analysis: {str(e)}"
         )
 
+@router.get("/skills/{skill_id}/analysis")
+def get_skill_analysis(
+    skill_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the stored AI analysis of a skill
+    
+    Args:
+        skill_id: Skill to read the analysis of
+        current_user: Authenticated user
+        db: Database session
+    
+    Returns:
+        The analysis with status "ready", or status "pending"/"failed" and no data
+    """
+    skill = db.query(Skill).options(joinedload(Skill.analysis)).filter(Skill.id == skill_id, Skill.is_active == True).first()
+    if skill is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill not found")
+    
+    analysis_status = status_of(skill, skill.analysis)
+    if needs_analysis(skill, skill.analysis):
+        queue_analysis([skill.id], user_id=skill.user_id)
+    return {
+        "success": True,
+        "data": {
+            "skill_id": skill.id,
+            "status": analysis_status,
+            "analysis": analysis_to_dict(skill.analysis) if analysis_status == READY else None
+        },
+        "message": "Skill analysis ready" if analysis_status == READY else f"Skill analysis {analysis_status}"
+    }
+
 @router.get("/ai-status")
 async def get_ai_status():
     """
@@ -292,7 +343,8 @@ async def get_ai_status():
                     "Automatic skill categorization",
                     "Skill matching and recommendations",
                     "Skills portfolio analysis"
-                ]
+                ],
+                "cache": ai_cache.stats()
             },
             "message": "AI status retrieved successfully"
         }
@@ -307,172 +359,42 @@ async def get_ai_status():
 
 @router.post("/suggest-skills")
 async def suggest_skills(
+    response: Response,
+    background: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Generate AI-powered skill suggestions based on user's existing skills
+    Generate AI-powered skill suggestions based on user's existing skills;
+    with background=true the suggestions are queued and 202 returns the job id
     """
     try:
         logger.info(f"Generating AI skill suggestions for user {current_user.username}")
         
-        # Get user's existing skills
-        user_skills_query = db.query(Skill).filter(Skill.user_id == current_user.id)
-        user_skills = user_skills_query.all()
-        
-        if not user_skills:
-            return {
-                "success": True,
-                "data": {
-                    "suggestions": [
-                        {
-                            "title": "Web Development",
-                            "description": "Build modern, responsive websites using HTML, CSS, and JavaScript frameworks",
-                            "category": "Programming",
-                            "proficiency_level": "Intermediate",
-                            "reason": "Popular skill with high demand in tech industry"
-                        },
-                        {
-                            "title": "Digital Marketing",
-                            "description": "Promote products and services using online marketing strategies and social media",
-                            "category": "Marketing",
-                            "proficiency_level": "Beginner",
-                            "reason": "Valuable complementary skill for technical professionals"
-                        },
-                        {
-                            "title": "Project Management",
-                            "description": "Plan, execute, and oversee projects to completion using agile methodologies",
-                            "category": "Business",
-                            "proficiency_level": "Intermediate",
-                            "reason": "Essential leadership skill for career advancement"
-                        }
-                    ],
-                    "ai_available": gemini_service.is_available()
-                },
-                "message": "Skill suggestions generated successfully"
-            }
+        if background:
+            job_id = await to_thread.run_sync(lambda: job_queue.enqueue(
+                "suggest_skills",
+                {"user_id": current_user.id},
+                user_id=current_user.id,
+                dedupe_key=f"suggest_skills:{current_user.id}"
+            ))
+            return _job_accepted(response, job_id, "Skill suggestions queued")
+        
+        # Blocking query in the threadpool, the model call on this loop
+        user_skills = await to_thread.run_sync(user_skills_for_suggestions, db, current_user.id)
+        suggestions = await skill_suggestions(user_skills)
+        based_on_skills = suggestions.get("based_on_skills")
+        if based_on_skills is None:
+            message = "Skill suggestions generated successfully"
+        elif suggestions["ai_available"]:
+            message = f"AI-generated suggestions based on your {based_on_skills} skills"
+        else:
+            message = f"Skill suggestions generated based on your {based_on_skills} skills"
         
-        # Convert user skills to format for AI analysis
-        user_skills_text = "\n".join([
-            f"- {skill.title}: {skill.description} (Category: {skill.category}, Level: {skill.proficiency_level})"
-            for skill in user_skills
-        ])
-        
-        # Use Gemini AI to generate personalized suggestions
-        if gemini_service.is_available():
-            try:
-                prompt = f"""
-                Based on the user's current skills, suggest 5 new skills they could learn to enhance their career:
-                
-                User's Current Skills:
-                {user_skills_text}
-                
-                Please suggest skills that:
-                1. Complement their existing skills
-                2. Are in high demand in the job market
-                3. Offer good learning progression
-                4. Cover different categories if possible
-                
-                For each suggestion, provide:
-                - title (clear and concise)
-                - description (detailed but engaging)
-                - category (from: Programming, Design, Business, Marketing, Writing, Teaching, Healthcare, Finance, Other)
-                - proficiency_level (Beginner/Intermediate/Advanced/Expert)
-                - reason (why this skill is valuable for them)
-                
-                Respond in JSON format:
-                {{
-                    "suggestions": [
-                        {{
-                            "title": "...",
-                            "description": "...",
-                            "category": "...",
-                            "proficiency_level": "...",
-                            "reason": "..."
-                        }}
-                    ]
-                }}
-                """
-                
-                ai_suggestions = await gemini_service.model.generate_content_async(prompt)
-                result_text = ai_suggestions.text
-                
-                # Parse JSON response
-                try:
-                    result_text = result_text.strip()
-                    if result_text.startswith("```json"):
-                        result_text = result_text[7:]
-                    if result_text.endswith("```"):
-                        result_text = result_text[:-3]
-                    result_text = result_text.strip()
-                    
-                    suggestions_data = json.loads(result_text)
-                    
-                    return {
-                        "success": True,
-                        "data": {
-                            "suggestions": suggestions_data.get("suggestions", []),
-                            "ai_available": True,
-                            "based_on_skills": len(user_skills)
-                        },
-                        "message": f"AI-generated suggestions based on your {len(user_skills)} skills"
-                    }
-                    
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse AI suggestions: {e}")
-                    # Fallback to default suggestions
-                    pass
-                    
-            except Exception as e:
-                logger.error(f"AI suggestion generation failed: {e}")
-                # Fallback to default suggestions
-                pass
-        
-        # Fallback suggestions if AI is not available
         return {
             "success": True,
-            "data": {
-                "suggestions": [
-                    {
-                        "title": "Data Analysis",
-                        "description": "Analyze complex datasets and create actionable insights using statistical methods",
-                        "category": "Programming",
-                        "proficiency_level": "Intermediate",
-                        "reason": "Builds on analytical skills valuable in any industry"
-                    },
-                    {
-                        "title": "UX/UI Design",
-                        "description": "Create user-centered designs that are both beautiful and functional",
-                        "category": "Design",
-                        "proficiency_level": "Beginner",
-                        "reason": "Complements technical skills with creative design thinking"
-                    },
-                    {
-                        "title": "Public Speaking",
-                        "description": "Develop confidence and clarity in presenting ideas to groups",
-                        "category": "Business",
-                        "proficiency_level": "Intermediate",
-                        "reason": "Essential leadership skill for career growth"
-                    },
-                    {
-                        "title": "Content Writing",
-                        "description": "Create engaging content for blogs, websites, and marketing materials",
-                        "category": "Writing",
-                        "proficiency_level": "Beginner",
-                        "reason": "Valuable skill for personal branding and communication"
-                    },
-                    {
-                        "title": "Financial Literacy",
-                        "description": "Understand and manage personal finances, investments, and budgeting",
-                        "category": "Finance",
-                        "proficiency_level": "Intermediate",
-                        "reason": "Important life skill for financial independence"
-                    }
-                ],
-                "ai_available": False,
-                "based_on_skills": len(user_skills)
-            },
-            "message": f"Skill suggestions generated based on your {len(user_skills)} skills"
+            "data": suggestions,
+            "message": message
         }
         
     except Exception as e:
@@ -481,6 +403,48 @@ async def suggest_skills(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate skill suggestions: {str(e)}"
         )
+
+@router.post("/reanalyze-skills")
+def reanalyze_skills(
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue a fresh AI analysis of all the user's active skills, replacing stored ones
+    
+    Returns:
+        The queued job; its result counts ready, failed and skipped skills
+    """
+    skill_ids = [skill_id for skill_id, in db.query(Skill.id).filter(Skill.user_id == current_user.id, Skill.is_active == True)]
+    if not skill_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No skills to analyze")
+    job_id = queue_analysis(skill_ids, force=True, user_id=current_user.id)
+    if job_id is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Job queue unavailable")
+    return _job_accepted(response, job_id, f"Re-analysis of {len(skill_ids)} skills queued")
+
+@router.get("/jobs/{job_id}")
+def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Poll a background AI job
+    
+    Returns:
+        The job's status (queued/running/succeeded/failed), its result once succeeded
+        and its last error; jobs of other users are not found
+    """
+    job = job_queue.get(job_id)
+    if job is None or job["user_id"] != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return {
+        "success": True,
+        "data": job,
+        "message": f"Job {job['status']}"
+    }
+
 async def enhance_skill_description(
     title: str,
     description: str,
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from database import get_db
+from database import get_db, settings
 from models import User, Skill, SkillExchangeRequest
-from schemas import SkillExchangeRequestCreate, SkillExchangeRequestUpdate, SkillExchangeRequestResponse
+from schemas import SkillExchangeRequestCreate, SkillExchangeRequestUpdate, SkillExchangeRequestResponse, NotificationCreate
 from crud import (
-    create_skill_exchange_request, 
+    create_skill_exchange_request_with_notification,
+    get_skill_exchange_requests,
     get_skill_exchange_requests_for_user,
+    get_skill_exchange_rows_for_user,
     get_skill, 
     get_skill_exchange_request, 
     update_skill_exchange_request,
@@ -14,11 +16,15 @@ from crud import (
     create_notification
 )
 from routers.users import get_current_user
+from pagination import next_cursor, NEXT_CURSOR_HEADER
+import fast_json
+import logging
 
 router = APIRouter(tags=["skill-exchanges"])
+logger = logging.getLogger(__name__)
 
 @router.post("/", response_model=SkillExchangeRequestResponse, status_code=status.HTTP_201_CREATED)
-async def create_exchange_request(
+def create_exchange_request(
     request: SkillExchangeRequestCreate, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -32,32 +38,16 @@ async def create_exchange_request(
     if skill.user_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot request your own skill")
     
-    # Create exchange request
-    db_request = create_skill_exchange_request(
-        db, 
-        request=request, 
-        requester_id=current_user.id, 
-        skill_owner_id=skill.user_id
+    # Create exchange request and the skill owner's notification in one transaction
+    return create_skill_exchange_request_with_notification(
+        db,
+        request=request,
+        requester=current_user,
+        skill=skill
     )
-    
-    # Create notification for skill owner
-    try:
-        notification = NotificationCreate(
-            title="New Skill Exchange Request",
-            message=f"{current_user.full_name or current_user.username} wants to learn your skill: {skill.title}",
-            type="exchange_request",
-            related_id=db_request.id,
-            user_id=skill.user_id
-        )
-        create_notification(db, notification)
-    except Exception as e:
-        # Log notification error but don't fail the request
-        print(f"Notification creation failed: {e}")
-    
-    return db_request
 
 @router.post("/request-skill", response_model=SkillExchangeRequestResponse, status_code=status.HTTP_201_CREATED)
-async def request_skill(
+def request_skill(
     request: SkillExchangeRequestCreate, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -75,43 +65,43 @@ async def request_skill(
     if skill.user_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot request your own skill")
     
-    # Create exchange request
-    db_request = create_skill_exchange_request(
-        db, 
-        request=request, 
-        requester_id=current_user.id, 
-        skill_owner_id=skill.user_id
+    # Create exchange request and the skill owner's notification in one transaction
+    return create_skill_exchange_request_with_notification(
+        db,
+        request=request,
+        requester=current_user,
+        skill=skill
     )
-    
-    # Create notification for skill owner
-    try:
-        notification = NotificationCreate(
-            title="New Skill Exchange Request",
-            message=f"{current_user.full_name or current_user.username} wants to learn your skill: {skill.title}",
-            type="exchange_request",
-            related_id=db_request.id,
-            user_id=skill.user_id
-        )
-        create_notification(db, notification)
-    except Exception as e:
-        # Log notification error but don't fail the request
-        print(f"Notification creation failed: {e}")
-    
-    return db_request
 
 @router.get("/", response_model=List[dict])
-async def read_exchange_requests(
+def read_exchange_requests(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    requests = get_skill_exchange_requests_for_user(db, user_id=current_user.id, skip=skip, limit=limit)
+    """Exchange requests sent or received by the current user; `fields` limits the payload, e.g. `fields=id,status,skill.title`"""
+    projected = bool(fields) or settings.fast_json_listings
+    try:
+        if projected:
+            requests = get_skill_exchange_rows_for_user(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor, fields=fields)
+        else:
+            requests = get_skill_exchange_requests_for_user(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cursor_token = next_cursor(requests, limit)
+    if cursor_token:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_token
+    if projected:
+        return Response(content=fast_json.dumps(requests), media_type="application/json", headers=dict(response.headers))
     return requests
 
 @router.get("/all", response_model=List[dict])
-async def read_all_exchange_requests(
+def read_all_exchange_requests(
     skip: int = 0, 
     limit: int = 100, 
     status: Optional[str] = None,
@@ -122,7 +112,7 @@ async def read_all_exchange_requests(
     return requests
 
 @router.get("/{request_id}", response_model=SkillExchangeRequestResponse)
-async def read_exchange_request(
+def read_exchange_request(
     request_id: int, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -138,7 +128,7 @@ async def read_exchange_request(
     return request
 
 @router.put("/{request_id}", response_model=SkillExchangeRequestResponse)
-async def update_exchange_request(
+def update_exchange_request(
     request_id: int,
     request_update: SkillExchangeRequestUpdate,
     db: Session = Depends(get_db),
@@ -165,14 +155,14 @@ async def update_exchange_request(
         }
         
         try:
-            create_notification(db, notification_data)
+            create_notification(db, NotificationCreate(**notification_data))
         except Exception as e:
-            print(f"Notification creation failed: {e}")
+            logger.error("Notification creation failed: %s", e)
     
     return updated_request
 
 @router.delete("/{request_id}")
-async def delete_exchange_request(
+def delete_exchange_request(
     request_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -192,7 +182,7 @@ async def delete_exchange_request(
     return {"message": "Exchange request deleted successfully"}
 
 @router.patch("/requests/{request_id}", response_model=dict)
-async def update_request_status(
+def update_request_status(
     request_id: int,
     status_update: dict,
     db: Session = Depends(get_db),
@@ -235,5 +225,5 @@ async def update_request_status(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"ERROR: Failed to update request status: {e}")
+        logger.exception("Failed to update request status: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,23 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from models import User
-from schemas import NotificationResponse
-from crud import get_user_notifications, mark_notification_read, get_unread_notification_count, create_notification
+from schemas import NotificationResponse, NotificationBulkRead
+from crud import get_user_notifications, mark_notification_read, mark_notifications_read, get_unread_notification_count, create_notification
 from routers.users import get_current_user
+from pagination import next_cursor, NEXT_CURSOR_HEADER
+from notification_hub import notification_hub
+from database import settings
+import asyncio
+import json
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 @router.get("/", response_model=List[NotificationResponse])
 def get_notifications(
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all notifications for the current user"""
-    notifications = get_user_notifications(db, user_id=current_user.id, skip=skip, limit=limit)
+    """Get all notifications for the current user, paged by `skip` or by the X-Next-Cursor `cursor`"""
+    try:
+        notifications = get_user_notifications(db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    cursor_token = next_cursor(notifications, limit)
+    if cursor_token:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_token
     return notifications
 
 @router.get("/unread-count")
@@ -29,6 +43,20 @@ def get_unread_count(
     count = get_unread_notification_count(db, user_id=current_user.id)
     return {"unread_count": count}
 
+@router.put("/read")
+def mark_many_as_read(
+    selection: NotificationBulkRead,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark several notifications as read: a list of `ids`, or every notification up to `up_to_id`"""
+    updated = mark_notifications_read(db, user_id=current_user.id, ids=selection.ids, up_to_id=selection.up_to_id)
+    return {
+        "message": f"{updated} notifications marked as read",
+        "updated": updated,
+        "unread_count": get_unread_notification_count(db, user_id=current_user.id)
+    }
+
 @router.put("/{notification_id}/read")
 def mark_as_read(
     notification_id: int,
@@ -43,3 +71,41 @@ def mark_as_read(
             detail="Notification not found"
         )
     return {"message": "Notification marked as read"}
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Server-Sent Events stream of new notifications for the current user.
+    Each new notification arrives as an `event: notification` with the NotificationResponse JSON;
+    comment lines keep idle connections open. No database queries are made while connected.
+    """
+    user_id = current_user.id
+    # The session is only needed for authentication, give its connection back before streaming
+    db.close()
+    subscription = notification_hub.subscribe(user_id)
+
+    async def event_stream():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(
+                        subscription.queue.get(),
+                        timeout=settings.notification_stream_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: notification\nid: {payload['id']}\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            notification_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
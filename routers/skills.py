@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Security
+from anyio import to_thread
+from fastapi import APIRouter, Depends, HTTPException, status, Security, Response, Query, Header
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from database import get_db
+from database import get_db, get_async_db, settings
 from models import User
-from schemas import SkillCreate, SkillResponse, SkillUpdate
-from crud import create_skill, get_skill, get_skills, get_skills_by_user, update_skill, delete_skill
+from schemas import SkillCreate, SkillResponse, SkillUpdate, SkillFacetsResponse
+from crud import create_skill, get_skill, get_skills_by_user, update_skill, delete_skill, summarize_facets
+import crud_async
 from routers.users import get_current_user
+from pagination import next_cursor, NEXT_CURSOR_HEADER
+from skill_search import skill_search_index
+from catalog_cache import skill_catalog_cache, make_etag, etag_matches
+import fast_json
+import logging
 
 router = APIRouter(tags=["skills"])
+logger = logging.getLogger(__name__)
 
 @router.post("/", response_model=SkillResponse, status_code=status.HTTP_201_CREATED, dependencies=[Security(get_current_user)])
-async def create_skill_endpoint(
+def create_skill_endpoint(
     skill: SkillCreate, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -30,8 +40,6 @@ async def create_skill_endpoint(
         HTTPException: If validation fails or user not authorized
     """
     try:
-        print(f"Creating skill for user {current_user.id}: {skill.title}")
-        
         # Validate skill data
         if not skill.title.strip():
             raise HTTPException(
@@ -65,30 +73,105 @@ async def create_skill_endpoint(
             )
         
         created_skill = create_skill(db=db, skill=skill, user_id=current_user.id)
-        print(f"Skill created successfully with ID: {created_skill.id}")
+        logger.debug("User %s created skill %s", current_user.id, created_skill.id)
         return created_skill
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error creating skill: {e}")
+        logger.exception("Error creating skill: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while creating the skill"
         )
 
+skill_list_adapter = TypeAdapter(List[SkillResponse])
+
+# Listings are public and identical for every visitor: let clients and proxies store them, but revalidate
+LISTING_CACHE_CONTROL = "public, no-cache"
+
 @router.get("/", response_model=List[SkillResponse])
 async def read_skills(
     skip: int = 0, 
     limit: int = 100, 
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    skills = get_skills(db, skip=skip, limit=limit, category=category)
-    return skills
+    """
+    List active skills, newest first.
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next one (skip is then ignored).
+    Responses carry an ETag; send it back as If-None-Match to get 304 Not Modified while nothing changed.
+    `fields` limits the payload, e.g. `fields=id,title,owner.username`.
+    """
+    cache_key = ("skills", skip, limit, category, cursor, fields)
+    cached = skill_catalog_cache.get(cache_key)
+    if cached is None:
+        version = skill_catalog_cache.version
+        try:
+            if fields or settings.fast_json_listings:
+                skills = await crud_async.get_skill_rows(db, skip=skip, limit=limit, category=category, cursor=cursor, fields=fields)
+                body = fast_json.dumps(skills)
+            else:
+                skills = await crud_async.get_skills(db, skip=skip, limit=limit, category=category, cursor=cursor)
+                body = skill_list_adapter.dump_json(skills)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        cached = (body, make_etag(body), next_cursor(skills, limit))
+        skill_catalog_cache.put(cache_key, cached, version)
+    body, etag, cursor_token = cached
+
+    headers = {"ETag": etag, "Cache-Control": LISTING_CACHE_CONTROL}
+    if cursor_token:
+        headers[NEXT_CURSOR_HEADER] = cursor_token
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/search", response_model=List[SkillResponse])
+async def search_skills(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = 20,
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Full-text search over skill titles and descriptions, best match first.
+    Every word must match; a word also matches longer words it starts ("pyth" finds "python").
+    """
+    if skill_search_index.loaded_at is None:
+        # First search of this worker builds the index from a sync session in the threadpool
+        await to_thread.run_sync(skill_search_index.ensure_loaded)
+    else:
+        skill_search_index.ensure_loaded()
+    skill_ids = skill_search_index.search(q, category=category)[skip:skip + limit]
+    if not skill_ids:
+        return []
+    return await crud_async.get_skills_by_ids(db, skill_ids)
+
+@router.get("/facets", response_model=SkillFacetsResponse)
+async def read_skill_facets(
+    category: Optional[str] = None,
+    proficiency_level: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Active skill counts per category and per proficiency level for the current filter.
+    Category counts ignore the category filter (and vice versa) so every option shows its count.
+    """
+    # One cached (category, level) -> count matrix serves every filter combination
+    facet_counts = skill_catalog_cache.get("facet_counts")
+    if facet_counts is None:
+        version = skill_catalog_cache.version
+        facet_counts = await crud_async.get_skill_facet_counts(db)
+        skill_catalog_cache.put("facet_counts", facet_counts, version)
+    return summarize_facets(facet_counts, category=category, proficiency_level=proficiency_level)
 
 @router.get("/my-skills", response_model=List[SkillResponse], dependencies=[Security(get_current_user)])
-async def read_my_skills(
+def read_my_skills(
     skip: int = 0, 
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -98,14 +181,14 @@ async def read_my_skills(
     return skills
 
 @router.get("/{skill_id}", response_model=SkillResponse)
-async def read_skill(skill_id: int, db: Session = Depends(get_db)):
-    db_skill = get_skill(db, skill_id=skill_id)
+async def read_skill(skill_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_skill = await crud_async.get_skill(db, skill_id=skill_id)
     if db_skill is None:
         raise HTTPException(status_code=404, detail="Skill not found")
     return db_skill
 
 @router.put("/{skill_id}", response_model=SkillResponse, dependencies=[Security(get_current_user)])
-async def update_skill_endpoint(
+def update_skill_endpoint(
     skill_id: int, 
     skill_update: SkillUpdate, 
     db: Session = Depends(get_db),
@@ -125,7 +208,7 @@ async def update_skill_endpoint(
     return updated_skill
 
 @router.delete("/{skill_id}", response_model=SkillResponse, dependencies=[Security(get_current_user)])
-async def delete_skill_endpoint(
+def delete_skill_endpoint(
     skill_id: int, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from jose.exceptions import JWTError as JoseJWTError
-from database import get_db, settings
+from database import get_db, get_async_db, settings
 from models import User
 from schemas import UserCreate, UserResponse, UserLogin, Token, UserUpdate
-from crud import create_user, get_user, get_user_by_username, get_user_by_email, authenticate_user, update_user
+from crud import create_user, get_user_by_username, get_user_by_email, authenticate_user, update_user
+import crud_async
+from pagination import next_cursor, NEXT_CURSOR_HEADER
+from auth_cache import auth_cache
+import fast_json
+import logging
 
 router = APIRouter(tags=["users"])
+logger = logging.getLogger(__name__)
 
 # Configure API key authentication for Swagger UI
 from fastapi.security import APIKeyHeader
@@ -42,7 +49,7 @@ def get_current_user(authorization: str = Depends(api_key_header), db: Session =
         db: Database session
         
     Returns:
-        User object if authentication successful
+        CachedUser snapshot of the user if authentication successful
         
     Raises:
         HTTPException: If authentication fails
@@ -53,25 +60,29 @@ def get_current_user(authorization: str = Depends(api_key_header), db: Session =
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    print(f" DEBUG: Authorization header received: {authorization[:50]}..." if authorization and len(authorization) > 50 else f" DEBUG: Authorization header: {authorization}")
-    
+    # Never log the header or token, they are credentials
     if not authorization:
-        print(" DEBUG: No authorization header provided")
+        logger.debug("Authentication failed: no authorization header")
         raise credentials_exception
     
     # Extract token from "Bearer <token>" format
     try:
         scheme, token = authorization.split()
         if scheme.lower() != "bearer":
-            print(f" DEBUG: Invalid scheme: {scheme}, expected 'bearer'")
+            logger.debug("Authentication failed: unsupported scheme")
             raise credentials_exception
     except ValueError:
-        print(f" DEBUG: Invalid authorization format: {authorization}")
+        logger.debug("Authentication failed: malformed authorization header")
         raise credentials_exception
     
-    print(f" DEBUG: Extracted token: {token[:20]}...")
-    print(f" DEBUG: Secret key: {settings.secret_key[:20]}...")
-    print(f" DEBUG: Algorithm: {settings.algorithm}")
+    cached_user = auth_cache.get(token)
+    if cached_user is not None:
+        if not cached_user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User account is not active"
+            )
+        return cached_user
     
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
@@ -90,6 +101,9 @@ def get_current_user(authorization: str = Depends(api_key_header), db: Session =
     user = get_user_by_username(db, username=username)
     if user is None:
         raise credentials_exception
+    
+    # Cache the resolved user for this token, including an inactive flag
+    user = auth_cache.put(token, user, token_expires_at=payload.get("exp"))
         
     if not user.is_active:
         raise HTTPException(
@@ -100,7 +114,7 @@ def get_current_user(authorization: str = Depends(api_key_header), db: Session =
     return user
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+def register_user(user: UserCreate, db: Session = Depends(get_db)):
     # Check if user already exists
     db_user = get_user_by_username(db, username=user.username)
     if db_user:
@@ -118,7 +132,7 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     return create_user(db=db, user=user)
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     user = authenticate_user(db, user_credentials.username, user_credentials.password)
     if not user:
         raise HTTPException(
@@ -133,23 +147,43 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def read_user(user_id: int, db: Session = Depends(get_db)):
-    db_user = get_user(db, user_id=user_id)
+async def read_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_user = await crud_async.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
 
 @router.get("/", response_model=List[UserResponse])
-async def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = get_users(db, skip=skip, limit=limit)
+async def read_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List active users, newest first; `fields` limits the payload, e.g. `fields=id,username`"""
+    projected = bool(fields) or settings.fast_json_listings
+    try:
+        if projected:
+            users = await crud_async.get_user_rows(db, skip=skip, limit=limit, cursor=cursor, fields=fields)
+        else:
+            users = await crud_async.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    cursor_token = next_cursor(users, limit)
+    if cursor_token:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_token
+    if projected:
+        return Response(content=fast_json.dumps(users), media_type="application/json", headers=dict(response.headers))
     return users
 
 @router.put("/{user_id}", response_model=UserResponse)
-async def update_user_info(
+def update_user_info(
     user_id: int, 
     user_update: UserUpdate, 
     db: Session = Depends(get_db),
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from datetime import datetime
 from typing import Optional, List
 
@@ -76,6 +76,15 @@ class SkillResponse(SkillBase):
     class Config:
         from_attributes = True
 
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class SkillFacetsResponse(BaseModel):
+    total: int
+    category: List[FacetCount]
+    proficiency_level: List[FacetCount]
+
 # Notification schemas
 class NotificationBase(BaseModel):
     title: str
@@ -86,6 +95,17 @@ class NotificationBase(BaseModel):
 class NotificationCreate(NotificationBase):
     user_id: int
 
+class NotificationBulkRead(BaseModel):
+    """Either explicit ids or every notification with id <= up_to_id"""
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=1000)
+    up_to_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        if (self.ids is None) == (self.up_to_id is None):
+            raise ValueError("Provide exactly one of ids or up_to_id")
+        return self
+
 class NotificationResponse(NotificationBase):
     id: int
     user_id: int
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Precomputed AI analysis for each skill (skill_analyses table)
+create_skill/update_skill mark a skill's analysis pending in the same transaction when its
+title, description or category change (content_hash), then queue an "analyze_skills" job
+(job_queue.py). The job analyzes pending skills in batches (GeminiAIService.analyze_skills_batch
+plus categorize_skill) and stores the result only if the content it analyzed is still
+current, so an edit made meanwhile is never overwritten with a stale analysis.
+
+The AI endpoints read the stored rows and never wait for the model; skills without a
+current analysis are reported as pending and queued.
+
+Backfill or retry failed and fallback analyses with `python skill_analysis.py [--all]`.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import update
+from database import SessionLocal, settings
+from fanout import gather_bounded
+from job_queue import close_thread_loop, job_queue, run_coroutine
+from models import Skill, SkillAnalysis
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+# Failed analyses are queued again from the AI endpoints until they failed this often
+MAX_ATTEMPTS = 3
+
+def content_hash(skill) -> str:
+    """Hash of the fields the analysis is computed from"""
+    payload = json.dumps([skill.title, skill.description, skill.category], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def mark_pending(db, skill) -> bool:
+    """
+    Mark the skill's analysis pending unless one for its current content exists.
+    Runs in the caller's transaction (the skill needs an id); returns whether the
+    skill should be queued once that transaction commits.
+    """
+    digest = content_hash(skill)
+    analysis = db.get(SkillAnalysis, skill.id)
+    if analysis is None:
+        db.add(SkillAnalysis(skill_id=skill.id, content_hash=digest, status=PENDING, attempts=0))
+    elif analysis.content_hash == digest and analysis.status != FAILED:
+        return False
+    else:
+        analysis.content_hash = digest
+        analysis.status = PENDING
+        analysis.attempts = 0
+        analysis.error = None
+    return True
+
+def is_current(skill, analysis: Optional[SkillAnalysis]) -> bool:
+    return analysis is not None and analysis.status == READY and analysis.content_hash == content_hash(skill)
+
+def status_of(skill, analysis: Optional[SkillAnalysis]) -> str:
+    """READY for a current analysis, FAILED once retries are exhausted, PENDING otherwise"""
+    if is_current(skill, analysis):
+        return READY
+    if analysis is not None and analysis.status == FAILED and analysis.content_hash == content_hash(skill):
+        return FAILED
+    return PENDING
+
+def needs_analysis(skill, analysis: Optional[SkillAnalysis]) -> bool:
+    """Whether a reader should queue the skill: active, not current and not out of retries"""
+    if not skill.is_active or is_current(skill, analysis):
+        return False
+    return status_of(skill, analysis) != FAILED or analysis.attempts < MAX_ATTEMPTS
+
+def analysis_to_dict(analysis: SkillAnalysis) -> Dict:
+    """Stored analysis in the shape the AI endpoints return for a skill"""
+    result = dict(analysis.analysis or {})
+    result.pop("fallback", None)
+    result["suggested_category"] = analysis.suggested_category
+    result["category_confidence"] = (analysis.categorization or {}).get("confidence")
+    result["fallback"] = bool(analysis.is_fallback)
+    result["analyzed_at"] = analysis.analyzed_at.isoformat() if analysis.analyzed_at else None
+    return result
+
+def _default_service():
+    # Imported on first use: the web app must start (and crud import) without the Gemini SDK
+    from gemini_service import gemini_service
+    return gemini_service
+
+async def _analyze(service, skills: List[Dict]):
+    analyses = await service.analyze_skills_batch(
+        skills,
+        concurrency=settings.ai_max_concurrency,
+        timeout=settings.ai_call_timeout_seconds
+    )
+    categorizations = await gather_bounded(
+        lambda skill: service.categorize_skill(skill["title"], skill["description"]),
+        skills,
+        settings.ai_max_concurrency,
+        settings.ai_call_timeout_seconds
+    )
+    return analyses, categorizations
+
+def analyze_skills(db, skill_ids: Iterable[int], service=None, force: bool = False) -> Dict[str, int]:
+    """
+    Analyze the given skills now and store the results.
+    Returns {"ready", "failed", "skipped"} counts; skipped skills are inactive, gone, or
+    already have a current analysis (re-analyzed anyway with force).
+    """
+    skill_ids = set(skill_ids)
+    candidates = db.query(Skill).filter(Skill.id.in_(skill_ids), Skill.is_active == True).all()
+    skills = []
+    for skill in candidates:
+        analysis = db.get(SkillAnalysis, skill.id)
+        if force or not is_current(skill, analysis):
+            # Rows must exist, for the current content, for the conditional updates below
+            if analysis is None or analysis.content_hash != content_hash(skill):
+                mark_pending(db, skill)
+            skills.append(skill)
+    db.commit()
+    counts = {"ready": 0, "failed": 0, "skipped": len(skill_ids) - len(skills)}
+    if not skills:
+        return counts
+    service = service or _default_service()
+    inputs = [{"title": skill.title, "description": skill.description, "category": skill.category} for skill in skills]
+    digests = [content_hash(skill) for skill in skills]
+
+    # This thread's persistent loop: the Gemini client is bound to the loop it first ran on
+    analyses, categorizations = run_coroutine(_analyze(service, inputs))
+
+    now = datetime.utcnow()
+    for skill, digest, analysis, categorization in zip(skills, digests, analyses, categorizations):
+        if analysis is None:
+            values = {"status": FAILED, "error": "Analysis timed out", "attempts": SkillAnalysis.attempts + 1}
+            counts["failed"] += 1
+        else:
+            categorization = categorization or {}
+            values = {
+                "status": READY,
+                "analysis": analysis,
+                "categorization": categorization,
+                "suggested_proficiency": analysis.get("suggested_proficiency"),
+                "suggested_category": categorization.get("suggested_category"),
+                "is_fallback": bool(analysis.get("fallback") or categorization.get("fallback")),
+                "error": None,
+                "attempts": SkillAnalysis.attempts + 1,
+                "analyzed_at": now,
+            }
+            counts["ready"] += 1
+        # Only if the skill was not edited while the model was working
+        db.execute(
+            update(SkillAnalysis).where(
+                SkillAnalysis.skill_id == skill.id,
+                SkillAnalysis.content_hash == digest
+            ).values(**values).execution_options(synchronize_session=False)
+        )
+    db.commit()
+    logger.info(f"Skill analysis: {counts['ready']} ready, {counts['failed']} failed, {counts['skipped']} skipped")
+    return counts
+
+def backfill_ids(db, include_ready: bool = False) -> List[int]:
+    """Active skills whose analysis is missing, pending, failed, a fallback, or stale"""
+    rows = db.query(Skill, SkillAnalysis).outerjoin(SkillAnalysis, SkillAnalysis.skill_id == Skill.id).filter(
+        Skill.is_active == True
+    ).order_by(Skill.id).all()
+    return [
+        skill.id for skill, analysis in rows
+        if include_ready or not is_current(skill, analysis) or analysis.is_fallback
+    ]
+
+def queue_analysis(skill_ids: Iterable[int], force: bool = False, user_id: Optional[int] = None) -> Optional[int]:
+    """
+    Queue an "analyze_skills" job for the skills and return its id. The same skills still
+    waiting in the queue share one job; if the queue is unusable the skills stay pending
+    for the next read or backfill and None is returned.
+    """
+    skill_ids = sorted(set(skill_ids))
+    if not skill_ids:
+        return None
+    try:
+        return job_queue.enqueue(
+            "analyze_skills",
+            {"skill_ids": skill_ids, "force": force},
+            user_id=user_id,
+            dedupe_key=f"analyze_skills:{int(force)}:{','.join(map(str, skill_ids))}"
+        )
+    except sqlite3.Error as e:
+        logger.error(f"Could not queue analysis of skills {skill_ids}: {e}")
+        return None
+
+@job_queue.handler("analyze_skills")
+def run_analysis_job(payload: Dict) -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        return analyze_skills(db, payload["skill_ids"], force=payload.get("force", False))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        skill_ids = backfill_ids(db, include_ready="--all" in sys.argv)
+        totals = {"ready": 0, "failed": 0, "skipped": 0}
+        batch_size = 50
+        for start in range(0, len(skill_ids), batch_size):
+            # Selected ids all need work, including current fallback analyses
+            for key, value in analyze_skills(db, skill_ids[start:start + batch_size], force=True).items():
+                totals[key] += value
+        print(f"SUCCESS: Analyzed {len(skill_ids)} skills ({totals['ready']} ready, {totals['failed']} failed, {totals['skipped']} skipped)")
+    except Exception as e:
+        print(f"ERROR: Skill analysis backfill failed: {e}")
+        raise
+    finally:
+        db.close()
+        close_thread_loop()
@@ -0,0 +1,230 @@
+"""
+In-process full-text index over active skills for /api/skills/search
+Skill titles and descriptions are tokenized into an inverted index (term -> skill id ->
+term frequency) ranked with BM25, so a search touches only the postings of its terms
+instead of scanning the catalogue. Every query term also matches longer terms it is a
+prefix of ("pyth" finds "python"), looked up by bisecting a sorted vocabulary.
+
+crud keeps the index current on create_skill/update_skill/delete_skill. The index is
+per worker process: writes handled by another worker are picked up by a background
+rebuild once the index is older than SKILL_SEARCH_REBUILD_SECONDS.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional
+from database import SessionLocal, settings
+from models import Skill
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Title terms count this many times, a match in the title outranks one in the description
+TITLE_WEIGHT = 2
+# Query terms beyond this are ignored
+MAX_QUERY_TERMS = 10
+# Longer terms one query term can expand to, and their score weight against an exact match
+MAX_PREFIX_EXPANSIONS = 50
+PREFIX_MATCH_WEIGHT = 0.7
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+class _Document:
+    __slots__ = ("terms", "length", "category")
+
+    def __init__(self, terms: Counter, category: Optional[str]):
+        self.terms = terms
+        self.length = sum(terms.values())
+        self.category = category
+
+class SkillSearchIndex:
+    """Inverted index with BM25 ranking, safe to read and update from threadpool workers"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        # Serializes first loads only, so index updates and searches never wait on the database
+        self._load_lock = threading.Lock()
+        self._reset()
+        self.loaded_at = None
+        self._rebuilding = False
+        self._pending = None
+
+    def _reset(self):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._vocabulary: List[str] = []
+        self._documents: Dict[int, _Document] = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._documents)
+
+    # Maintenance
+    def _add(self, skill_id: int, title: str, description: str, category: Optional[str]):
+        terms = Counter(tokenize(description))
+        for term in tokenize(title):
+            terms[term] += TITLE_WEIGHT
+        if not terms:
+            return
+        self._documents[skill_id] = _Document(terms, category)
+        self._total_length += sum(terms.values())
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            postings[skill_id] = frequency
+
+    def _remove(self, skill_id: int):
+        document = self._documents.pop(skill_id, None)
+        if document is None:
+            return
+        self._total_length -= document.length
+        for term in document.terms:
+            postings = self._postings[term]
+            del postings[skill_id]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+
+    def index_skill(self, skill):
+        """(Re)index a skill after a write, dropping it once it is inactive"""
+        self._record((skill.id, skill.title, skill.description, skill.category, bool(skill.is_active)))
+
+    def remove_skill(self, skill_id: int):
+        self._record((skill_id, None, None, None, False))
+
+    def _record(self, entry):
+        with self._lock:
+            if self._pending is not None:
+                # A load is reading the database, replay this write on the new index too
+                self._pending.append(entry)
+            elif self.loaded_at is None:
+                # Not loaded yet, the first search reads the committed write from the database
+                return
+            self._apply(entry)
+
+    def _apply(self, entry):
+        skill_id, title, description, category, is_active = entry
+        self._remove(skill_id)
+        if is_active:
+            self._add(skill_id, title, description, category)
+
+    # Loading
+    @staticmethod
+    def _read_active_skills(db):
+        return db.query(Skill.id, Skill.title, Skill.description, Skill.category).filter(Skill.is_active == True).all()
+
+    def load(self, db):
+        """Build the index from the database, replacing its content"""
+        with self._lock:
+            self._pending = []
+        try:
+            rows = self._read_active_skills(db)
+            fresh = SkillSearchIndex(self.k1, self.b)
+            for skill_id, title, description, category in rows:
+                fresh._add(skill_id, title, description, category)
+            with self._lock:
+                for entry in self._pending:
+                    fresh._apply(entry)
+                self._postings = fresh._postings
+                self._vocabulary = fresh._vocabulary
+                self._documents = fresh._documents
+                self._total_length = fresh._total_length
+                self.loaded_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+        logger.info(f"Skill search index built with {len(self._documents)} skills")
+
+    def ensure_loaded(self, db=None):
+        """
+        Load synchronously on first use, from db or a session of its own (the first call
+        blocks on the database: run it in the threadpool); afterwards refresh stale indexes
+        in the background
+        """
+        if self.loaded_at is None:
+            with self._load_lock:
+                if self.loaded_at is None:
+                    if db is not None:
+                        self.load(db)
+                    else:
+                        own_db = SessionLocal()
+                        try:
+                            self.load(own_db)
+                        finally:
+                            own_db.close()
+            return
+        max_age = settings.skill_search_rebuild_seconds
+        if max_age > 0 and time.monotonic() - self.loaded_at > max_age and not self._rebuilding:
+            self._rebuilding = True
+            threading.Thread(target=self._rebuild_in_background, name="skill-search-rebuild", daemon=True).start()
+
+    def _rebuild_in_background(self):
+        db = SessionLocal()
+        try:
+            self.load(db)
+        except Exception as e:
+            logger.error(f"Skill search index rebuild failed: {e}")
+        finally:
+            db.close()
+            self._rebuilding = False
+
+    # Querying
+    def _expand(self, query_term: str):
+        """Index terms matching a query term: itself, then terms it is a prefix of"""
+        matches = []
+        if query_term in self._postings:
+            matches.append((query_term, 1.0))
+        position = bisect_left(self._vocabulary, query_term)
+        while position < len(self._vocabulary) and len(matches) < MAX_PREFIX_EXPANSIONS:
+            term = self._vocabulary[position]
+            if not term.startswith(query_term):
+                break
+            if term != query_term:
+                matches.append((term, PREFIX_MATCH_WEIGHT))
+            position += 1
+        return matches
+
+    def search(self, query: str, category: Optional[str] = None) -> List[int]:
+        """Ids of skills matching every query term, best BM25 score first"""
+        query_terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+        if not query_terms:
+            return []
+        with self._lock:
+            document_count = len(self._documents)
+            if not document_count:
+                return []
+            average_length = self._total_length / document_count
+            scores = None
+            for query_term in query_terms:
+                # Best matching expansion per skill, so one prefix hitting several terms is not counted twice
+                term_scores: Dict[int, float] = {}
+                for term, weight in self._expand(query_term):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for skill_id, frequency in postings.items():
+                        document = self._documents[skill_id]
+                        if category and document.category != category:
+                            continue
+                        norm = self.k1 * (1 - self.b + self.b * document.length / average_length)
+                        score = weight * idf * frequency * (self.k1 + 1) / (frequency + norm)
+                        if score > term_scores.get(skill_id, 0.0):
+                            term_scores[skill_id] = score
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {skill_id: score + term_scores[skill_id] for skill_id, score in scores.items() if skill_id in term_scores}
+                if not scores:
+                    return []
+        return [skill_id for skill_id, _ in sorted(scores.items(), key=lambda item: (-item[1], -item[0]))]
+
+skill_search_index = SkillSearchIndex()
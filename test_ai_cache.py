@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test AI Response Cache
+Identical inputs hit the memory tier, other workers hit the shared SQLite tier, and
+entries expire and are evicted
+"""
+
+import os
+import tempfile
+import ai_cache
+from ai_cache import AIResponseCache
+
+ANALYSIS = {"enhanced_description": "Play chords", "keywords": ["guitar", "chords"], "suggested_proficiency": "Advanced"}
+
+def test_memory_and_disk_tiers():
+    print('Testing AI cache tiers...')
+    path = os.path.join(tempfile.mkdtemp(), "ai_cache.sqlite3")
+    worker = AIResponseCache(ttl_seconds=60, max_entries=10, path=path)
+    key = AIResponseCache.key("analyze_skill_description", "model", "Guitar", "Play chords", "Music")
+    assert key == AIResponseCache.key("analyze_skill_description", "model", "Guitar", "Play chords", "Music")
+    assert key != AIResponseCache.key("analyze_skill_description", "model", "Guitar", "Play chords ", "Music")
+    assert key != AIResponseCache.key("analyze_skill_description", "other-model", "Guitar", "Play chords", "Music")
+
+    assert worker.get(key) is None
+    worker.put(key, ANALYSIS)
+    cached = worker.get(key)
+    assert cached == ANALYSIS
+    # Callers get copies, mutating one does not change the cache
+    cached["keywords"].append("mutated")
+    assert worker.get(key) == ANALYSIS
+
+    other_worker = AIResponseCache(ttl_seconds=60, max_entries=10, path=path)
+    assert other_worker.get(key) == ANALYSIS
+    assert other_worker.get(key) == ANALYSIS
+    stats = other_worker.stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+    print('SUCCESS: AI cache tiers')
+
+def test_expiry_and_eviction():
+    print('Testing AI cache expiry and eviction...')
+    path = os.path.join(tempfile.mkdtemp(), "ai_cache.sqlite3")
+    cache = AIResponseCache(ttl_seconds=60, max_entries=2, path=path, disk_max_entries=3)
+    for i in range(4):
+        cache.put(f"key-{i}", {"i": i})
+    assert len(cache) == 2
+    # Evicted from memory, still on disk
+    assert cache.get("key-0") == {"i": 0}
+
+    original_interval = ai_cache.DISK_EVICTION_INTERVAL
+    ai_cache.DISK_EVICTION_INTERVAL = 1
+    try:
+        cache.put("key-4", {"i": 4})
+    finally:
+        ai_cache.DISK_EVICTION_INTERVAL = original_interval
+    rows = cache._connection().execute("SELECT key FROM ai_responses").fetchall()
+    assert len(rows) == 3
+    # key-0 was read most recently on disk, so the least recently used rows went first
+    assert {row[0] for row in rows} == {"key-0", "key-3", "key-4"}
+
+    now = [1000.0]
+    clock = lambda: now[0]
+    expiring = AIResponseCache(ttl_seconds=1, max_entries=10, path=path, clock=clock)
+    expiring.put("short", {"x": 1})
+    assert expiring.get("short") == {"x": 1}
+    now[0] += 5
+    assert expiring.get("short") is None
+    assert AIResponseCache(ttl_seconds=1, max_entries=10, path=path, clock=clock).get("short") is None
+
+    disabled = AIResponseCache(ttl_seconds=0, max_entries=10, path=None)
+    disabled.put("key", {"x": 1})
+    assert disabled.get("key") is None
+    print('SUCCESS: AI cache expiry and eviction')
+
+if __name__ == "__main__":
+    test_memory_and_disk_tiers()
+    test_expiry_and_eviction()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test AI Jobs on Worker Event Loops
+Async AI jobs run back-to-back on one worker's persistent loop while the web loop uses
+the same GeminiAIService; each loop gets its own model, like the SDK's loop-bound async
+client requires. Uses a fake model, no API key needed.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+import ai_jobs
+import gemini_service
+from ai_cache import AIResponseCache
+from gemini_service import GeminiAIService
+from job_queue import JobQueue, JobWorkerPool
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+class LoopBoundModel:
+    """Like the SDK's async client: bound to the first loop that uses it, unusable elsewhere"""
+
+    def __init__(self):
+        self.loop = None
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            raise RuntimeError("Task got Future attached to a different loop")
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        title = prompt.split("Title:", 1)[1].split("\n", 1)[0].strip()
+        return FakeResponse(json.dumps({
+            "enhanced_description": f"Expert {title}",
+            "keywords": [title.lower()],
+            "suggested_proficiency": "Advanced",
+            "related_skills": [],
+            "applications": []
+        }))
+
+def make_service():
+    service = GeminiAIService.__new__(GeminiAIService)
+    service.api_key = "test"
+    service.model = LoopBoundModel()
+    service._loop_models = weakref.WeakKeyDictionary()
+    service._loop_models_lock = threading.Lock()
+    service.created = []
+    def create_model():
+        model = LoopBoundModel()
+        service.created.append(model)
+        return model
+    service._create_model = create_model
+    return service
+
+def test_async_jobs_share_worker_loop_with_web_loop_running():
+    print('Testing AI jobs next to the web loop...')
+    service = make_service()
+    shared_service, shared_cache = ai_jobs.gemini_service, gemini_service.ai_cache
+    ai_jobs.gemini_service = service
+    # Memory only, and misses for every title below so each call reaches the model
+    gemini_service.ai_cache = AIResponseCache(ttl_seconds=3600, max_entries=100, path=None)
+    web_loop = asyncio.new_event_loop()
+    web_thread = threading.Thread(target=web_loop.run_forever, daemon=True)
+    web_thread.start()
+
+    def on_web_loop(title):
+        return asyncio.run_coroutine_threadsafe(service.analyze_skill_description(title, "Web request"), web_loop).result(5)
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, "jobs.sqlite3"), max_attempts=1)
+        queue.handler("analyze_skill")(ai_jobs.run_analyze_skill)
+        pool = JobWorkerPool(queue, 1, poll_interval_seconds=0.01)
+        try:
+            assert "fallback" not in on_web_loop("Guitar")
+            job_ids = [queue.enqueue("analyze_skill", {"title": title, "description": "Job"}) for title in ("Python", "Baking")]
+            pool.start()
+            deadline = time.time() + 10
+            while time.time() < deadline and any(queue.get(job_id)["status"] in ("queued", "running") for job_id in job_ids):
+                # The web loop keeps using the service while the jobs run
+                assert "fallback" not in on_web_loop(f"Piano {time.time()}")
+            jobs = [queue.get(job_id) for job_id in job_ids]
+            assert [job["status"] for job in jobs] == ["succeeded", "succeeded"], jobs
+            assert [job["result"]["enhanced_description"] for job in jobs] == ["Expert Python", "Expert Baking"]
+            assert all("fallback" not in job["result"] for job in jobs)
+            assert "fallback" not in on_web_loop("Drums")
+        finally:
+            pool.stop(timeout=5)
+            web_loop.call_soon_threadsafe(web_loop.stop)
+            web_thread.join(5)
+            web_loop.close()
+            ai_jobs.gemini_service, gemini_service.ai_cache = shared_service, shared_cache
+
+    # One model for the web loop, one for the worker's loop, both jobs on the latter
+    assert len(service.created) == 2
+    worker_models = [model for model in service.created if model.loop is not web_loop]
+    assert len(worker_models) == 1 and worker_models[0].calls == 2
+    print('SUCCESS: AI jobs next to the web loop')
+
+if __name__ == "__main__":
+    test_async_jobs_share_worker_loop_with_web_loop_running()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the Authenticated-User Cache used by get_current_user
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from fastapi import HTTPException
+from database import Base
+from models import User
+from schemas import UserUpdate, UserResponse
+from crud import update_user
+from auth_cache import AuthenticatedUserCache, auth_cache
+from routers.users import get_current_user, create_access_token
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    return sessionmaker(bind=engine)(), statements
+
+def test_cache_expiry_and_eviction():
+    cache = AuthenticatedUserCache(ttl_seconds=60, max_entries=2)
+    user = User(id=1, username="a", email="a@example.com", full_name="A", is_active=True)
+    cache.put("t1", user)
+    cache.put("t2", user, token_expires_at=time.time() - 1)
+    assert cache.get("t1").username == "a"
+    assert cache.get("t2") is None
+    cache.put("t3", user)
+    cache.put("t4", user)
+    assert cache.get("t1") is None
+    cache.invalidate_user(1)
+    assert len(cache) == 0
+
+def test_get_current_user_hits_cache():
+    """Repeated calls with one token must not query the users table again"""
+    print('Testing authenticated-user cache...')
+    auth_cache.clear()
+    db, statements = make_session()
+    db.add(User(username="alice", email="alice@example.com", full_name="Alice", password_hash="x", is_active=True))
+    db.commit()
+    token = create_access_token({"sub": "alice"})
+    header = f"Bearer {token}"
+
+    first = get_current_user(authorization=header, db=db)
+    statements.clear()
+    second = get_current_user(authorization=header, db=db)
+    print(f'   second lookup issued {len(statements)} queries')
+    assert statements == []
+    assert second.id == first.id
+    assert UserResponse.model_validate(second).username == "alice"
+
+    # Deactivation through update_user invalidates the cached entry
+    alice = db.query(User).filter(User.username == "alice").first()
+    alice.is_active = False
+    db.commit()
+    update_user(db, alice.id, UserUpdate(full_name="Alice B"))
+    try:
+        get_current_user(authorization=header, db=db)
+        assert False, "inactive user accepted"
+    except HTTPException as e:
+        assert e.status_code == 401
+    print('SUCCESS: Cache hit and invalidation working')
+    db.close()
+
+if __name__ == "__main__":
+    test_cache_expiry_and_eviction()
+    test_get_current_user_hits_cache()
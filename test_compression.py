@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test Response Compression and Precompressed Static Files
+Large JSON is gzip-encoded for clients that accept it, small or event-stream responses are
+left alone, and the frontend build is served from hashed, precompressed files
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import gzip
+import json
+import tempfile
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+from compression import CompressionMiddleware, PrecompressedStaticFiles, IMMUTABLE_CACHE_CONTROL, choose_encoding
+from build_static import build
+
+LARGE = [{"id": i, "title": f"Skill {i}", "category": "Music"} for i in range(200)]
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    def large():
+        return Response(json.dumps(LARGE), media_type="application/json", headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([json.dumps(LARGE[:100]), json.dumps(LARGE[100:])]), media_type="text/plain")
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(iter(["data: x\n\n" * 200]), media_type="text/event-stream")
+    return app
+
+def test_choose_encoding():
+    print('Testing Accept-Encoding negotiation...')
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("*") in ("br", "gzip")
+    print('SUCCESS: Accept-Encoding negotiation')
+
+def test_json_compression():
+    print('Testing JSON response compression...')
+    client = TestClient(make_app())
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == LARGE
+    assert int(response.headers["content-length"]) < len(json.dumps(LARGE))
+
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"abc"'
+
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == json.dumps(LARGE[:100]) + json.dumps(LARGE[100:])
+
+    response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    print('SUCCESS: JSON response compression')
+
+def test_precompressed_static_files():
+    print('Testing precompressed static files...')
+    source = tempfile.mkdtemp()
+    with open(os.path.join(source, "index.html"), "w") as f:
+        f.write('<link rel="stylesheet" href="style.css"><script src="script.js"></script><a href="https://example.com/x.js">')
+    with open(os.path.join(source, "style.css"), "w") as f:
+        f.write("body { color: #333; }\n" * 200)
+    with open(os.path.join(source, "script.js"), "w") as f:
+        f.write("console.log('skill swap');\n" * 200)
+    output = os.path.join(source, "dist")
+    manifest = build(source, output)
+    assert set(manifest) == {"style.css", "script.js"}
+    assert os.path.isfile(os.path.join(output, manifest["style.css"] + ".gz"))
+
+    app = FastAPI()
+    app.mount("/app", PrecompressedStaticFiles(directory=output, html=True), name="frontend")
+    client = TestClient(app)
+
+    page = client.get("/app/", headers={"Accept-Encoding": "gzip"})
+    assert page.status_code == 200
+    assert manifest["style.css"] in page.text and manifest["script.js"] in page.text
+    assert "https://example.com/x.js" in page.text
+    assert page.headers["cache-control"] == "public, no-cache"
+
+    css = client.get(f"/app/{manifest['style.css']}", headers={"Accept-Encoding": "gzip"})
+    assert css.headers["content-encoding"] == "gzip"
+    assert css.headers["content-type"].startswith("text/css")
+    assert css.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert css.text == "body { color: #333; }\n" * 200
+    with open(os.path.join(output, manifest["style.css"] + ".gz"), "rb") as f:
+        assert gzip.decompress(f.read()) == css.content
+
+    plain = client.get(f"/app/{manifest['style.css']}", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    not_modified = client.get(f"/app/{manifest['style.css']}", headers={"Accept-Encoding": "gzip", "If-None-Match": css.headers["etag"]})
+    assert not_modified.status_code == 304
+    print('SUCCESS: Precompressed static files')
+
+if __name__ == "__main__":
+    test_choose_encoding()
+    test_json_compression()
+    test_precompressed_static_files()
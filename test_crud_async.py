@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test Async CRUD Functions
+Runs against an in-memory aiosqlite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base
+from schemas import UserCreate, SkillCreate, SkillUpdate, SkillExchangeRequestCreate, SkillResponse
+import crud_async
+
+async def make_session():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(bind=engine, expire_on_commit=False)()
+
+async def run_crud_flow():
+    db = await make_session()
+
+    owner = await crud_async.create_user(db, UserCreate(username="owner", email="owner@example.com", full_name="Owner", password="secret"))
+    learner = await crud_async.create_user(db, UserCreate(username="learner", email="learner@example.com", full_name="Learner", password="secret"))
+    assert await crud_async.authenticate_user(db, "owner", "secret")
+    assert not await crud_async.authenticate_user(db, "owner", "wrong")
+
+    skill = await crud_async.create_skill(db, SkillCreate(title="Python", description="Basics", category="Programming", proficiency_level="Advanced", value=10), user_id=owner.id)
+    # Responses must serialize without lazy loading
+    assert SkillResponse.model_validate(skill).owner.username == "owner"
+
+    skill = await crud_async.update_skill(db, skill.id, SkillUpdate(title="Python 3"))
+    assert SkillResponse.model_validate(skill).title == "Python 3"
+    assert len(await crud_async.get_skills(db, category="Programming")) == 1
+
+    await crud_async.create_skill_exchange_request(db, SkillExchangeRequestCreate(skill_id=skill.id, message="Teach me"), requester_id=learner.id, skill_owner_id=owner.id)
+    requests = await crud_async.get_skill_exchange_requests_for_user(db, user_id=owner.id)
+    assert requests[0]['requester']['username'] == "learner"
+
+    await crud_async.delete_skill(db, skill.id)
+    assert await crud_async.get_skills(db) == []
+    await db.close()
+
+def test_crud_async_flow():
+    print('Testing async CRUD flow...')
+    asyncio.run(run_crud_flow())
+    print('SUCCESS: Async CRUD working')
+
+if __name__ == "__main__":
+    test_crud_async_flow()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test Batched Loading of Skill Exchange Request Listings
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base
+from models import User, Skill, SkillExchangeRequest
+from crud import get_skill_exchange_requests, get_skill_exchange_requests_for_user
+
+def make_session():
+    """Create a fresh in-memory database with a query counter attached"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    return sessionmaker(bind=engine)(), statements
+
+def seed(db, request_count=30):
+    owner = User(username="owner", email="owner@example.com", full_name="Skill Owner", password_hash="x")
+    users = [User(username=f"user{i}", email=f"user{i}@example.com", full_name=f"User {i}", password_hash="x") for i in range(5)]
+    db.add_all([owner] + users)
+    db.flush()
+    skills = [Skill(user_id=owner.id, title=f"Skill {i}", description="desc", category="Programming", proficiency_level="Beginner") for i in range(5)]
+    db.add_all(skills)
+    db.flush()
+    for i in range(request_count):
+        db.add(SkillExchangeRequest(
+            skill_id=skills[i % 5].id,
+            requester_id=users[i % 5].id,
+            skill_owner_id=owner.id,
+            message=f"Request {i}"
+        ))
+    db.commit()
+    return owner, users
+
+def test_listing_uses_constant_queries():
+    """Listing a page must not issue per-row lookups"""
+    print('Testing batched exchange request listing...')
+    db, statements = make_session()
+    owner, users = seed(db)
+    owner_id = owner.id
+    db.expunge_all()
+
+    statements.clear()
+    requests = get_skill_exchange_requests_for_user(db, user_id=owner_id)
+    print(f'   {len(requests)} requests loaded with {len(statements)} queries')
+    assert len(requests) == 30
+    assert len(statements) <= 4
+
+    statements.clear()
+    requests = get_skill_exchange_requests(db, limit=10)
+    assert len(requests) == 10
+    assert len(statements) <= 4
+    db.close()
+
+def test_listing_dict_shape():
+    """The batched path must keep the existing response dict shape"""
+    db, _ = make_session()
+    owner, users = seed(db, request_count=3)
+
+    requests = get_skill_exchange_requests_for_user(db, user_id=users[0].id)
+    assert len(requests) == 1
+    request = requests[0]
+    assert set(request.keys()) == {
+        'id', 'skill_id', 'requester_id', 'skill_owner_id', 'message', 'status',
+        'created_at', 'updated_at', 'requester', 'skill', 'skill_owner'
+    }
+    assert request['requester']['username'] == 'user0'
+    assert request['skill_owner']['username'] == 'owner'
+    assert set(request['skill'].keys()) == {'id', 'title', 'category', 'proficiency_level'}
+    print('SUCCESS: Listing shape unchanged')
+    db.close()
+
+if __name__ == "__main__":
+    test_listing_uses_constant_queries()
+    test_listing_dict_shape()
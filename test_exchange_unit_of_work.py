@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test Exchange Request + Notification Unit of Work
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base
+from models import User, Skill, SkillExchangeRequest, Notification
+from schemas import SkillExchangeRequestCreate, SkillExchangeRequestResponse
+from crud import create_skill_exchange_request_with_notification, get_skill
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    return sessionmaker(bind=engine)(), statements
+
+def seed(db):
+    owner = User(username="owner", email="owner@example.com", full_name="Owner", password_hash="x", is_active=True)
+    learner = User(username="learner", email="learner@example.com", full_name="Learner", password_hash="x", is_active=True)
+    db.add_all([owner, learner])
+    db.flush()
+    skill = Skill(user_id=owner.id, title="Guitar", description="Chords", category="Music", proficiency_level="Advanced", is_active=True)
+    db.add(skill)
+    db.commit()
+    return owner.id, learner.id, skill.id
+
+def test_request_and_notification_in_one_transaction():
+    print('Testing exchange request unit of work...')
+    db, statements = make_session()
+    owner_id, learner_id, skill_id = seed(db)
+    learner = db.get(User, learner_id)
+    skill = get_skill(db, skill_id)
+
+    statements.clear()
+    result = create_skill_exchange_request_with_notification(db, SkillExchangeRequestCreate(skill_id=skill_id, message="Teach me"), requester=learner, skill=skill)
+    print(f'   statements: {[s.split()[0] for s in statements]}')
+    # Request and notification rows, then the owner's unread counter (seeded on first use)
+    assert [s.split()[0] for s in statements][:3] == ["INSERT", "INSERT", "UPDATE"]
+
+    response = SkillExchangeRequestResponse.model_validate(result)
+    assert response.skill.owner.username == "owner"
+    assert response.requester.username == "learner"
+
+    notification = db.get(Notification, result['notification_id'])
+    assert notification.user_id == owner_id
+    assert notification.related_id == result['id']
+    print('SUCCESS: Request and notification created together')
+    db.close()
+
+def test_failure_rolls_back_both_rows():
+    db, _ = make_session()
+    owner_id, learner_id, skill_id = seed(db)
+    learner = db.get(User, learner_id)
+    skill = get_skill(db, skill_id)
+    skill.owner = None  # the response snapshot fails after both INSERTs were flushed
+    try:
+        create_skill_exchange_request_with_notification(db, SkillExchangeRequestCreate(skill_id=skill_id, message="Teach me"), requester=learner, skill=skill)
+        assert False, "expected failure"
+    except Exception:
+        pass
+    assert db.query(SkillExchangeRequest).count() == 0
+    assert db.query(Notification).count() == 0
+    db.close()
+
+if __name__ == "__main__":
+    test_request_and_notification_in_one_transaction()
+    test_failure_rolls_back_both_rows()
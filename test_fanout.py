@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test Bounded Fan-out
+Calls run concurrently up to the limit, results keep item order, and failed or timed
+out calls leave None without losing the others
+"""
+
+import asyncio
+import time
+from fanout import gather_bounded
+
+def test_concurrency_and_order():
+    print('Testing bounded concurrency...')
+    in_flight = 0
+    peak = 0
+
+    async def call(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return item * 10
+
+    started = time.perf_counter()
+    results = asyncio.run(gather_bounded(call, range(20), concurrency=5, timeout=1))
+    elapsed = time.perf_counter() - started
+    assert results == [item * 10 for item in range(20)]
+    assert peak == 5
+    # Four waves of 50ms, not twenty sequential calls
+    assert elapsed < 0.6, elapsed
+    print('SUCCESS: Bounded concurrency')
+
+def test_partial_results():
+    print('Testing partial results...')
+
+    async def call(item):
+        if item == "slow":
+            await asyncio.sleep(5)
+        if item == "broken":
+            raise RuntimeError("model unavailable")
+        return item.upper()
+
+    started = time.perf_counter()
+    results = asyncio.run(gather_bounded(call, ["a", "slow", "broken", "b"], concurrency=4, timeout=0.1))
+    assert results == ["A", None, None, "B"]
+    assert time.perf_counter() - started < 1
+    print('SUCCESS: Partial results')
+
+if __name__ == "__main__":
+    test_concurrency_and_order()
+    test_partial_results()
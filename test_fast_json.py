@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test Fast JSON Listing Path
+The column-tuple + orjson path must produce the same documents as the pydantic path
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import asyncio
+import json
+import tempfile
+from datetime import datetime
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import User, Skill, SkillExchangeRequest
+from schemas import SkillResponse, UserResponse
+import crud
+import crud_async
+import fast_json
+
+def seed(path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    owner = User(username="owner", email="owner@example.com", full_name="Owner", bio="Teaches", password_hash="x", is_active=True)
+    learner = User(username="learner", email="learner@example.com", full_name="Léarner", password_hash="x", is_active=True)
+    db.add_all([owner, learner])
+    db.flush()
+    for i in range(3):
+        skill = Skill(user_id=owner.id, title=f"Skill {i}", description="Details", category="Music", proficiency_level="Advanced", value=i, is_active=True,
+                      created_at=datetime(2026, 1, 1, 12, 0, i, 500 * i))
+        db.add(skill)
+        db.flush()
+        db.add(SkillExchangeRequest(skill_id=skill.id, requester_id=learner.id, skill_owner_id=owner.id, message="Teach me", status="pending"))
+    # Exchange whose skill row is gone: nested object is null on both paths
+    db.add(SkillExchangeRequest(skill_id=999, requester_id=learner.id, skill_owner_id=owner.id, message="Orphan", status="pending"))
+    db.commit()
+    return engine, db, learner.id
+
+def test_fast_path_matches_pydantic_path():
+    print('Testing fast_json parity...')
+    path = os.path.join(tempfile.mkdtemp(), "fast_json.db")
+    engine, db, learner_id = seed(path)
+
+    standard = crud.get_skill_exchange_requests_for_user(db, learner_id)
+    fast = crud.get_skill_exchange_rows_for_user(db, learner_id)
+    assert json.loads(fast_json.dumps(fast)) == json.loads(json.dumps(standard))
+    assert any(row["skill"] is None for row in fast)
+
+    async def compare_async():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+                skills = TypeAdapter(List[SkillResponse]).dump_json(await crud_async.get_skills(session, limit=2))
+                assert json.loads(fast_json.dumps(await crud_async.get_skill_rows(session, limit=2))) == json.loads(skills)
+                users = TypeAdapter(List[UserResponse]).dump_json(await crud_async.get_users(session))
+                assert json.loads(fast_json.dumps(await crud_async.get_user_rows(session))) == json.loads(users)
+        finally:
+            await async_engine.dispose()
+    asyncio.run(compare_async())
+    print('SUCCESS: Both paths emit the same documents')
+    db.close()
+
+def test_stdlib_fallback_encoding():
+    saved, fast_json.orjson = fast_json.orjson, None
+    try:
+        body = fast_json.dumps([{"at": datetime(2026, 1, 1, 12, 30), "name": "Léa"}])
+    finally:
+        fast_json.orjson = saved
+    assert json.loads(body) == [{"at": "2026-01-01T12:30:00", "name": "Léa"}]
+
+if __name__ == "__main__":
+    test_fast_path_matches_pydantic_path()
+    test_stdlib_fallback_encoding()
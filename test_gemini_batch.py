@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test Batched Gemini Skill Analysis
+A batch prompt answers several skills at once; items it gets wrong, and whole responses
+that do not parse, fall back to one call per skill. Uses a fake model, no API key needed.
+"""
+
+import asyncio
+import json
+import threading
+import weakref
+from contextlib import contextmanager
+import gemini_service
+from ai_cache import AIResponseCache
+from gemini_service import GeminiAIService
+
+SKILLS = [
+    {"title": "Guitar", "description": "Chords and strumming", "category": "Music"},
+    {"title": "Python", "description": "Scripts and automation", "category": "Programming"},
+    {"title": "Baking", "description": "Bread and pastry", "category": "Cooking"},
+]
+
+def analysis(title, index=None):
+    result = {
+        "enhanced_description": f"Expert {title}",
+        "keywords": [title.lower()],
+        "suggested_proficiency": "Advanced",
+        "related_skills": [],
+        "applications": ["teaching"]
+    }
+    if index is not None:
+        result["index"] = index
+    return result
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+class FakeModel:
+    """Answers batch prompts with batch_reply(items) and single prompts with a valid analysis"""
+
+    def __init__(self, batch_reply):
+        self.batch_reply = batch_reply
+        self.prompts = []
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if "JSON array" in prompt:
+            items = json.loads(prompt.split("insights:", 1)[1].split("For every skill", 1)[0])
+            return FakeResponse(self.batch_reply(items))
+        title = prompt.split("Title:", 1)[1].split("\n", 1)[0].strip()
+        return FakeResponse("```json\n" + json.dumps(analysis(title)) + "\n```")
+
+@contextmanager
+def private_cache():
+    """Memory-only cache for the test; the shared ai_cache may be backed by the developer's SQLite file"""
+    shared = gemini_service.ai_cache
+    gemini_service.ai_cache = AIResponseCache(ttl_seconds=3600, max_entries=1000, path=None)
+    try:
+        yield
+    finally:
+        gemini_service.ai_cache = shared
+
+def make_service(batch_reply):
+    service = GeminiAIService.__new__(GeminiAIService)
+    service.api_key = "test"
+    service.model = FakeModel(batch_reply)
+    service._loop_models = weakref.WeakKeyDictionary()
+    service._loop_models_lock = threading.Lock()
+    # Every loop gets the same fake, so service.model.prompts sees all calls
+    service._create_model = lambda: service.model
+    return service
+
+def test_batch_in_one_prompt():
+    print('Testing batched analysis...')
+    with private_cache():
+        service = make_service(lambda items: json.dumps([analysis(item["title"], item["index"]) for item in reversed(items)]))
+        results = asyncio.run(service.analyze_skills_batch(SKILLS))
+        assert [result["enhanced_description"] for result in results] == ["Expert Guitar", "Expert Python", "Expert Baking"]
+        assert len(service.model.prompts) == 1
+
+        # Cached per skill, shared with analyze_skill_description
+        service.model.prompts.clear()
+        assert asyncio.run(service.analyze_skill_description("Python", "Scripts and automation", "Programming"))["keywords"] == ["python"]
+        assert asyncio.run(service.analyze_skills_batch(SKILLS)) == results
+        assert service.model.prompts == []
+    print('SUCCESS: Batched analysis')
+
+def test_invalid_items_fall_back():
+    print('Testing batch fallbacks...')
+    def partly_wrong(items):
+        entries = [analysis(item["title"], item["index"]) for item in items]
+        entries[1]["suggested_proficiency"] = "Wizard"
+        return json.dumps(entries[:2])
+    with private_cache():
+        service = make_service(partly_wrong)
+        results = asyncio.run(service.analyze_skills_batch(SKILLS))
+        assert [result["enhanced_description"] for result in results] == ["Expert Guitar", "Expert Python", "Expert Baking"]
+        # One batch prompt, then one call each for the invalid and the missing item
+        assert len(service.model.prompts) == 3
+
+    def bool_index(items):
+        entries = [analysis(item["title"], item["index"]) for item in items]
+        entries[0]["index"] = True
+        return json.dumps(entries)
+    with private_cache():
+        service = make_service(bool_index)
+        results = asyncio.run(service.analyze_skills_batch(SKILLS))
+        # true is not index 1: Guitar is analyzed on its own, Python keeps its own analysis
+        assert [result["enhanced_description"] for result in results] == ["Expert Guitar", "Expert Python", "Expert Baking"]
+        assert len(service.model.prompts) == 2
+
+    with private_cache():
+        service = make_service(lambda items: "not json")
+        results = asyncio.run(service.analyze_skills_batch(SKILLS))
+        assert all("fallback" not in result for result in results)
+        assert len(service.model.prompts) == 1 + len(SKILLS)
+    print('SUCCESS: Batch fallbacks')
+
+if __name__ == "__main__":
+    test_batch_in_one_prompt()
+    test_invalid_items_fall_back()
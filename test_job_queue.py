@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test SQLite Job Queue
+Jobs are claimed once across queue instances sharing the file, failures are retried
+with backoff until out of attempts, jobs of dead workers are reclaimed after their lease,
+and a worker pool runs registered sync and async handlers
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from job_queue import JobQueue, JobWorkerPool, close_thread_loop, run_coroutine
+
+def make_queue(directory, **kwargs):
+    return JobQueue(os.path.join(directory, "jobs.sqlite3"), **kwargs)
+
+def test_enqueue_claim_complete():
+    print('Testing enqueue and claim...')
+    with tempfile.TemporaryDirectory() as directory:
+        queue = make_queue(directory)
+        first = queue.enqueue("echo", {"n": 1}, user_id=7)
+        second = queue.enqueue("echo", {"n": 2}, delay_seconds=60)
+        assert queue.get(first)["status"] == "queued" and queue.get(first)["user_id"] == 7
+
+        job = queue.claim("w1")
+        assert job["id"] == first and job["attempts"] == 1
+        # The delayed job is not due, the claimed one is leased
+        assert queue.claim("w2") is None
+        queue.complete(job, {"echo": 1})
+        assert queue.get(first)["status"] == "succeeded" and queue.get(first)["result"] == {"echo": 1}
+        assert queue.get(second)["status"] == "queued"
+        assert queue.get(12345) is None
+
+        # Queued jobs with the same key are shared, finished ones are not
+        keyed = queue.enqueue("echo", {}, dedupe_key="k")
+        assert queue.enqueue("echo", {}, dedupe_key="k") == keyed
+        queue.complete(queue.claim("w1"), None)
+        assert queue.enqueue("echo", {}, dedupe_key="k") != keyed
+    print('SUCCESS: Enqueue and claim')
+
+def test_retry_with_backoff():
+    print('Testing retries...')
+    with tempfile.TemporaryDirectory() as directory:
+        queue = make_queue(directory, max_attempts=2, retry_base_seconds=10)
+        job_id = queue.enqueue("flaky", {})
+        queue.fail(queue.claim("w1"), "RuntimeError: boom")
+        job = queue.get(job_id)
+        assert job["status"] == "queued" and job["error"] == "RuntimeError: boom"
+        # Backing off: not claimable until run_at
+        assert queue.claim("w1") is None
+        queue._connection().execute("UPDATE jobs SET run_at = 0")
+        queue.fail(queue.claim("w1"), "RuntimeError: boom again")
+        job = queue.get(job_id)
+        assert job["status"] == "failed" and job["attempts"] == 2
+
+        assert 8 <= queue.retry_delay(1) <= 12 and 16 <= queue.retry_delay(2) <= 24
+        assert queue.purge(0) == 1 and queue.get(job_id) is None
+    print('SUCCESS: Retries')
+
+def test_expired_lease_is_reclaimed():
+    print('Testing lease expiry...')
+    with tempfile.TemporaryDirectory() as directory:
+        queue = make_queue(directory, max_attempts=2, lease_seconds=0.05)
+        job_id = queue.enqueue("slow", {})
+        lost = queue.claim("dead-worker")
+        time.sleep(0.1)
+        job = queue.claim("w2")
+        assert job["id"] == job_id and job["attempts"] == 2 and job["worker"] == "w2"
+        # The first worker's late result does not overwrite the new attempt
+        queue.complete(lost, "stale")
+        assert queue.get(job_id)["status"] == "running"
+        # Out of attempts: a second lost lease fails the job
+        time.sleep(0.1)
+        assert queue.claim("w3") is None
+        assert queue.get(job_id)["status"] == "failed"
+    print('SUCCESS: Lease expiry')
+
+def test_worker_pool_across_queues():
+    print('Testing worker pools...')
+    with tempfile.TemporaryDirectory() as directory:
+        # Two "processes": one enqueues, both run workers on the same file
+        producer = make_queue(directory, max_attempts=2, retry_base_seconds=0.01)
+        consumer = make_queue(directory, max_attempts=2, retry_base_seconds=0.01)
+        runs = []
+        lock = threading.Lock()
+        for queue in (producer, consumer):
+            @queue.handler("square")
+            def square(payload):
+                with lock:
+                    runs.append(payload["n"])
+                return payload["n"] ** 2
+
+            @queue.handler("async_fail")
+            async def async_fail(payload):
+                raise ValueError("model unavailable")
+
+        job_ids = [producer.enqueue("square", {"n": n}) for n in range(20)]
+        failing = producer.enqueue("async_fail", {})
+        unknown = producer.enqueue("missing_kind", {})
+        pools = [JobWorkerPool(queue, 2, poll_interval_seconds=0.01) for queue in (producer, consumer)]
+        for pool in pools:
+            pool.start()
+        try:
+            deadline = time.time() + 10
+            while time.time() < deadline and any(
+                producer.get(job_id)["status"] in ("queued", "running") for job_id in job_ids + [failing, unknown]
+            ):
+                time.sleep(0.02)
+        finally:
+            for pool in pools:
+                pool.stop(timeout=5)
+
+        assert [producer.get(job_id)["result"] for job_id in job_ids] == [n ** 2 for n in range(20)]
+        # Each job ran exactly once across the four workers
+        assert sorted(runs) == list(range(20))
+        assert producer.get(failing)["status"] == "failed" and producer.get(failing)["attempts"] == 2
+        assert producer.get(failing)["error"] == "ValueError: model unavailable"
+        assert producer.get(unknown)["error"].startswith("LookupError")
+        assert producer.counts() == {"succeeded": 20, "failed": 2}
+    print('SUCCESS: Worker pools')
+
+def test_async_jobs_reuse_worker_loop():
+    print('Testing worker event loops...')
+    with tempfile.TemporaryDirectory() as directory:
+        queue = make_queue(directory)
+        loops = []
+
+        @queue.handler("async_echo")
+        async def async_echo(payload):
+            loops.append(asyncio.get_running_loop())
+            return payload
+
+        queue.enqueue("async_echo", {"n": 1})
+        queue.enqueue("async_echo", {"n": 2})
+        assert queue.run_one("w1") and queue.run_one("w1")
+        # One loop for the thread, still open between jobs
+        assert len(loops) == 2 and loops[0] is loops[1] and not loops[0].is_closed()
+        assert run_coroutine(asyncio.sleep(0, "same loop")) == "same loop"
+        close_thread_loop()
+        assert loops[0].is_closed()
+    print('SUCCESS: Worker event loops')
+
+if __name__ == "__main__":
+    test_enqueue_claim_complete()
+    test_retry_with_backoff()
+    test_expired_lease_is_reclaimed()
+    test_worker_pool_across_queues()
+    test_async_jobs_reuse_worker_loop()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test Keyset (Cursor) Pagination
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base
+from models import User, Notification
+from crud import get_user_notifications
+from pagination import next_cursor, decode_cursor, encode_cursor
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def test_cursor_pages_match_offset_pages():
+    """Walking the cursor must visit every row once, in the offset order"""
+    print('Testing cursor pagination...')
+    db = make_session()
+    user = User(username="reader", email="reader@example.com", full_name="Reader", password_hash="x")
+    db.add(user)
+    db.flush()
+    base = datetime(2024, 1, 1)
+    # Groups of rows share a timestamp so the id tiebreaker is exercised
+    for i in range(23):
+        db.add(Notification(user_id=user.id, title=f"N{i}", message="m", type="swap_request", created_at=base + timedelta(minutes=i // 3)))
+    # server_default timestamps, stored by SQLite without fractional seconds
+    for i in range(7):
+        db.add(Notification(user_id=user.id, title=f"S{i}", message="m", type="swap_request"))
+    db.commit()
+
+    expected = [n.id for n in get_user_notifications(db, user_id=user.id, limit=100)]
+    seen, cursor = [], None
+    while True:
+        page = get_user_notifications(db, user_id=user.id, limit=5, cursor=cursor)
+        seen.extend(n.id for n in page)
+        cursor = next_cursor(page, 5)
+        if not cursor:
+            break
+    print(f'   {len(seen)} rows visited')
+    assert seen == expected
+    print('SUCCESS: Cursor pagination working')
+    db.close()
+
+def test_cursor_roundtrip_and_validation():
+    created_at = datetime(2024, 5, 6, 7, 8, 9, 123)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    assert next_cursor([{"id": 3, "created_at": created_at.isoformat()}], 1) == encode_cursor(created_at, 3)
+    try:
+        decode_cursor("not-a-cursor")
+        assert False, "malformed cursor accepted"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_cursor_pages_match_offset_pages()
+    test_cursor_roundtrip_and_validation()
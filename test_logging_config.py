@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test Structured Logging
+JSON records carry extra fields, module levels and debug sampling apply, the queued
+handler delivers records, and the exchange hot path prints nothing at the default level
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import io
+import json
+import logging
+from contextlib import redirect_stdout
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import User, Skill
+from schemas import SkillExchangeRequestCreate
+from logging_config import configure_logging, shutdown_logging, parse_module_levels
+import crud
+
+def reset_levels(*names):
+    for name in names:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+def test_json_format_and_module_levels():
+    print('Testing JSON format and module levels...')
+    stream = io.StringIO()
+    try:
+        configure_logging(level="WARNING", log_format="json", module_levels="test.chatty=DEBUG", queued=False, stream=stream)
+        logging.getLogger("test.chatty").debug("skill %s indexed", 7, extra={"skill_id": 7})
+        logging.getLogger("test.quiet").info("dropped below WARNING")
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert len(lines) == 1
+        assert lines[0]["level"] == "DEBUG" and lines[0]["logger"] == "test.chatty"
+        assert lines[0]["message"] == "skill 7 indexed" and lines[0]["skill_id"] == 7
+
+        assert parse_module_levels(" crud=debug , routers.users=WARNING") == {"crud": logging.DEBUG, "routers.users": logging.WARNING}
+        for bad in ("crud", "crud=LOUD"):
+            try:
+                parse_module_levels(bad)
+                assert False, f"{bad} should be rejected"
+            except ValueError:
+                pass
+    finally:
+        reset_levels("test.chatty")
+        configure_logging(queued=False)
+    print('SUCCESS: JSON format and module levels')
+
+def test_debug_sampling_and_queue():
+    print('Testing debug sampling and queued handler...')
+    stream = io.StringIO()
+    try:
+        configure_logging(level="DEBUG", log_format="text", module_levels="", debug_sample_rate=0.0, queued=True, stream=stream)
+        logger = logging.getLogger("test.sampled")
+        for i in range(100):
+            logger.debug("debug %s", i)
+        logger.warning("kept")
+        shutdown_logging()
+        output = stream.getvalue()
+        assert "debug" not in output
+        assert "WARNING test.sampled: kept" in output
+    finally:
+        configure_logging(queued=False)
+    print('SUCCESS: Debug sampling and queued handler')
+
+def test_hot_path_is_silent_by_default():
+    print('Testing exchange hot path output...')
+    stream = io.StringIO()
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        configure_logging(level="INFO", module_levels="", queued=False, stream=stream)
+        owner = User(username="owner", email="owner@example.com", full_name="Owner", password_hash="x", is_active=True)
+        learner = User(username="learner", email="learner@example.com", full_name="Learner", password_hash="x", is_active=True)
+        db.add_all([owner, learner])
+        db.flush()
+        skill = Skill(user_id=owner.id, title="Guitar", description="Chords", category="Music", proficiency_level="Advanced", is_active=True)
+        db.add(skill)
+        db.commit()
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            request = crud.create_skill_exchange_request(db, SkillExchangeRequestCreate(skill_id=skill.id, message="Teach me"), learner.id, owner.id)
+            crud.update_skill_exchange_request_status(db, request.id, "accepted")
+        assert stdout.getvalue() == ""
+        assert stream.getvalue() == ""
+
+        configure_logging(level="INFO", module_levels="crud=DEBUG", queued=False, stream=stream)
+        crud.update_skill_exchange_request_status(db, request.id, "completed")
+        assert "status updated to completed" in stream.getvalue()
+    finally:
+        db.close()
+        reset_levels("crud")
+        configure_logging(queued=False)
+    print('SUCCESS: Exchange hot path output')
+
+if __name__ == "__main__":
+    test_json_format_and_module_levels()
+    test_debug_sampling_and_queue()
+    test_hot_path_is_silent_by_default()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test Bulk Notification Insert and Bulk Mark-As-Read
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from pydantic import ValidationError
+from database import Base
+from models import User, Notification
+from schemas import NotificationCreate, NotificationBulkRead
+import crud
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    db = sessionmaker(bind=engine)()
+    users = [User(username=f"user{i}", email=f"user{i}@example.com", full_name=f"User {i}", password_hash="x", is_active=True) for i in range(3)]
+    db.add_all(users)
+    db.commit()
+    return db, [user.id for user in users], statements
+
+def notify(user_id, title="Hello"):
+    return NotificationCreate(user_id=user_id, title=title, message="Body", type="system")
+
+def test_bulk_insert_fans_out():
+    print('Testing bulk notification insert...')
+    db, user_ids, statements = make_session()
+    crud.create_notification(db, notify(user_ids[0]))
+
+    statements.clear()
+    created = crud.create_notifications(db, [notify(user_id, f"Fan-out {i}") for i in range(50) for user_id in user_ids])
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO NOTIFICATIONS")]
+    print(f'   {len(created)} notifications, {len(inserts)} INSERT statement(s)')
+    assert len(created) == 150 and len(inserts) == 1
+    assert [n.title for n in created[:3]] == ["Fan-out 0"] * 3
+    assert all(n.id is not None and n.is_read is False for n in created)
+
+    assert crud.get_unread_notification_count(db, user_ids[0]) == 51
+    assert crud.get_unread_notification_count(db, user_ids[1]) == 50
+    assert crud.create_notifications(db, []) == []
+    print('SUCCESS: Bulk insert keeps counters in step')
+    db.close()
+
+def test_bulk_mark_read():
+    print('Testing bulk mark-as-read...')
+    db, user_ids, statements = make_session()
+    mine = crud.create_notifications(db, [notify(user_ids[0], f"Mine {i}") for i in range(10)])
+    theirs = crud.create_notifications(db, [notify(user_ids[1])])
+
+    statements.clear()
+    assert crud.mark_notifications_read(db, user_ids[0], ids=[mine[0].id, mine[1].id, theirs[0].id]) == 2
+    updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE NOTIFICATIONS ")]
+    assert len(updates) == 1
+    assert crud.get_unread_notification_count(db, user_ids[0]) == 8
+    # Other users' notifications are never touched
+    assert crud.get_unread_notification_count(db, user_ids[1]) == 1
+
+    # Already read rows in range are not counted twice
+    assert crud.mark_notifications_read(db, user_ids[0], up_to_id=mine[4].id) == 3
+    assert crud.get_unread_notification_count(db, user_ids[0]) == 5
+    assert db.query(Notification).filter(Notification.user_id == user_ids[0], Notification.is_read == False).count() == 5
+    print('SUCCESS: Bulk mark-as-read is one UPDATE')
+    db.close()
+
+def test_bulk_read_selector_validation():
+    for body in ({}, {"ids": [1], "up_to_id": 5}, {"ids": []}):
+        try:
+            NotificationBulkRead(**body)
+        except ValidationError:
+            continue
+        raise AssertionError(f"{body} should be rejected")
+    assert NotificationBulkRead(up_to_id=5).ids is None
+
+if __name__ == "__main__":
+    test_bulk_insert_fans_out()
+    test_bulk_mark_read()
+    test_bulk_read_selector_validation()
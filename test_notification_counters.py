@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test Materialized Unread Notification Counters
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import asyncio
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base
+from models import User, Notification, NotificationCounter
+from schemas import NotificationCreate
+import crud
+import crud_async
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    db = sessionmaker(bind=engine)()
+    user = User(username="reader", email="reader@example.com", full_name="Reader", password_hash="x", is_active=True)
+    db.add(user)
+    db.commit()
+    return db, user.id, statements
+
+def notify(user_id, title="Hello"):
+    return NotificationCreate(user_id=user_id, title=title, message="Body", type="system")
+
+def test_counter_follows_create_and_read():
+    print('Testing unread counter maintenance...')
+    db, user_id, statements = make_session()
+    # Pre-existing unread row written before counters existed is picked up when the counter is seeded
+    db.add(Notification(user_id=user_id, title="Legacy", message="Body", type="system", is_read=False))
+    db.commit()
+
+    first = crud.create_notification(db, notify(user_id))
+    crud.create_notification(db, notify(user_id))
+    assert crud.get_unread_notification_count(db, user_id) == 3
+
+    crud.mark_notification_read(db, first.id, user_id)
+    # Marking an already read notification again must not decrement twice
+    assert crud.mark_notification_read(db, first.id, user_id).is_read
+    assert crud.get_unread_notification_count(db, user_id) == 2
+
+    statements.clear()
+    crud.get_unread_notification_count(db, user_id)
+    assert all("notifications " not in statement.replace("\n", " ") + " " for statement in statements)
+    assert crud.mark_notification_read(db, 999, user_id) is None
+    print('SUCCESS: Counter follows creates and reads')
+    db.close()
+
+def test_reconcile_repairs_drift():
+    db, user_id, _ = make_session()
+    crud.create_notification(db, notify(user_id))
+    db.get(NotificationCounter, user_id).unread_count = 42
+    db.commit()
+
+    assert crud.reconcile_notification_counters(db) == 1
+    assert crud.get_unread_notification_count(db, user_id) == 1
+    assert crud.reconcile_notification_counters(db) == 0
+    print('SUCCESS: Reconciliation repairs drifted counters')
+    db.close()
+
+def test_missing_counter_is_seeded():
+    print('Testing counters missing on existing databases...')
+    db, user_id, _ = make_session()
+    db.add_all([Notification(user_id=user_id, title="Legacy", message="Body", type="system", is_read=False) for _ in range(2)])
+    db.commit()
+    assert db.get(NotificationCounter, user_id) is None
+    assert crud.get_unread_notification_count(db, user_id) == 2
+    # The read neither creates the counter nor commits the request's session
+    assert db.get(NotificationCounter, user_id) is None and not db.new and not db.dirty
+    db.add(Notification(user_id=user_id, title="Pending", message="Body", type="system", is_read=False))
+    assert crud.get_unread_notification_count(db, user_id) == 3
+    db.rollback()
+    assert crud.get_unread_notification_count(db, user_id) == 2
+    # The first write seeds it from COUNT(*), including the new notification
+    crud.create_notification(db, notify(user_id))
+    assert db.get(NotificationCounter, user_id).unread_count == 3
+    assert crud.get_unread_notification_count(db, user_id) == 3
+    print('SUCCESS: Missing counters are seeded')
+    db.close()
+
+def test_async_counter():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        try:
+            await check(async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+
+    async def check(session_factory):
+        async with session_factory() as db:
+            user = User(username="reader", email="reader@example.com", full_name="Reader", password_hash="x", is_active=True)
+            db.add(user)
+            await db.commit()
+            notification = await crud_async.create_notification(db, notify(user.id))
+            await crud_async.create_notification(db, notify(user.id))
+            assert await crud_async.get_unread_notification_count(db, user.id) == 2
+            await crud_async.mark_notification_read(db, notification.id, user.id)
+            assert (await crud_async.mark_notification_read(db, notification.id, user.id)).is_read
+            assert await crud_async.get_unread_notification_count(db, user.id) == 1
+
+            other = User(username="legacy", email="legacy@example.com", full_name="Legacy", password_hash="x", is_active=True)
+            db.add(other)
+            await db.flush()
+            db.add(Notification(user_id=other.id, title="Legacy", message="Body", type="system", is_read=False))
+            await db.commit()
+            assert await crud_async.get_unread_notification_count(db, other.id) == 1
+            assert await db.get(NotificationCounter, other.id) is None
+            await crud_async.create_notification(db, notify(other.id))
+            assert (await db.get(NotificationCounter, other.id)).unread_count == 2
+            assert await crud_async.get_unread_notification_count(db, other.id) == 2
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    test_counter_follows_create_and_read()
+    test_reconcile_repairs_drift()
+    test_missing_counter_is_seeded()
+    test_async_counter()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Notification Retention Job
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base, settings
+from models import User, Notification, NotificationArchive
+import crud
+import notification_retention
+from notification_retention import run_retention, retention_metrics
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    deletes = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statement.startswith("DELETE") and deletes.append(statement))
+    db = sessionmaker(bind=engine)()
+    users = [User(username=f"user{i}", email=f"user{i}@example.com", full_name=f"User {i}", password_hash="x", is_active=True) for i in range(2)]
+    db.add_all(users)
+    db.commit()
+    return db, [user.id for user in users], deletes
+
+def add_notifications(db, user_id, count, age_days, is_read):
+    for i in range(count):
+        db.add(Notification(
+            user_id=user_id, title=f"{age_days}d", message="Body", type="system",
+            is_read=is_read, created_at=NOW - timedelta(days=age_days, minutes=i)
+        ))
+    db.commit()
+
+def with_policy(**policy):
+    """Temporarily override NOTIFICATION_RETENTION_* settings"""
+    saved = {name: getattr(settings, f"notification_retention_{name}") for name in policy}
+    for name, value in policy.items():
+        setattr(settings, f"notification_retention_{name}", value)
+    return lambda: [setattr(settings, f"notification_retention_{name}", value) for name, value in saved.items()]
+
+def remaining(db, user_id):
+    return db.query(Notification).filter(Notification.user_id == user_id).count()
+
+def test_expired_read_notifications_deleted_in_batches():
+    print('Testing age-based retention...')
+    db, (user_id, _), deletes = make_session()
+    add_notifications(db, user_id, 25, age_days=200, is_read=True)
+    add_notifications(db, user_id, 3, age_days=200, is_read=False)
+    add_notifications(db, user_id, 4, age_days=10, is_read=True)
+    before = retention_metrics.snapshot()["rows_deleted"]
+
+    restore = with_policy(days=90, max_per_user=0, mode="delete", batch_size=10, batch_pause_seconds=0)
+    try:
+        result = run_retention(db, now=NOW)
+    finally:
+        restore()
+    print(f'   {result}, {len(deletes)} DELETE statements')
+    assert result["expired"] == 25 and len(deletes) == 3
+    # Unread and recent notifications survive
+    assert remaining(db, user_id) == 7
+    assert retention_metrics.snapshot()["rows_deleted"] - before == 25
+    print('SUCCESS: Old read notifications purged in batches')
+    db.close()
+
+def test_per_user_cap_archives_oldest_read():
+    print('Testing per-user cap in archive mode...')
+    db, (busy_id, quiet_id), _ = make_session()
+    add_notifications(db, busy_id, 8, age_days=1, is_read=True)
+    add_notifications(db, busy_id, 2, age_days=2, is_read=False)
+    add_notifications(db, busy_id, 5, age_days=3, is_read=True)
+    add_notifications(db, quiet_id, 5, age_days=3, is_read=True)
+    crud.reconcile_notification_counters(db)
+
+    restore = with_policy(days=0, max_per_user=6, mode="archive", batch_size=4, batch_pause_seconds=0)
+    try:
+        result = run_retention(db, now=NOW)
+    finally:
+        restore()
+    assert result["over_cap"] == 7
+    kept = db.query(Notification).filter(Notification.user_id == busy_id).all()
+    # The newest six plus the two unread ones, which the cap never removes
+    assert len(kept) == 8 and sum(1 for n in kept if not n.is_read) == 2
+    assert all(n.title in ("1d", "2d") for n in kept)
+    assert remaining(db, quiet_id) == 5
+    archived = db.query(NotificationArchive).filter(NotificationArchive.user_id == busy_id).all()
+    assert len(archived) == 7 and all(a.archived_at is not None for a in archived)
+    assert crud.get_unread_notification_count(db, busy_id) == 2
+    assert crud.reconcile_notification_counters(db) == 0
+    print('SUCCESS: Oldest read notifications archived beyond the cap')
+    db.close()
+
+def test_overlapping_runners_archive_once():
+    print('Testing overlapping archive runs...')
+    for dialect_inserts in (notification_retention.DIALECT_INSERTS, {}):
+        db, (user_id, _), _ = make_session()
+        add_notifications(db, user_id, 3, age_days=200, is_read=True)
+        # Another worker's runner archived the oldest one but has not deleted it yet
+        first = db.query(Notification).order_by(Notification.id).first()
+        db.add(NotificationArchive(**{column: getattr(first, column) for column in notification_retention.ARCHIVED_COLUMNS}))
+        db.commit()
+
+        saved = notification_retention.DIALECT_INSERTS
+        notification_retention.DIALECT_INSERTS = dialect_inserts
+        restore = with_policy(days=90, max_per_user=0, mode="archive", batch_size=10, batch_pause_seconds=0)
+        try:
+            assert run_retention(db, now=NOW)["expired"] == 3
+        finally:
+            restore()
+            notification_retention.DIALECT_INSERTS = saved
+        assert remaining(db, user_id) == 0
+        assert db.query(NotificationArchive).count() == 3
+        db.close()
+    print('SUCCESS: Overlapping archive runs')
+
+def test_invalid_mode_rejected():
+    db, _, _ = make_session()
+    restore = with_policy(mode="truncate")
+    try:
+        run_retention(db, now=NOW)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Invalid mode should be rejected")
+    finally:
+        restore()
+    db.close()
+
+def test_worker_start_stop():
+    worker = notification_retention.start_retention_worker(3600)
+    assert worker.is_alive()
+    notification_retention.stop_retention_worker(timeout=5)
+    assert not worker.is_alive()
+
+if __name__ == "__main__":
+    test_expired_read_notifications_deleted_in_batches()
+    test_per_user_cap_archives_oldest_read()
+    test_overlapping_runners_archive_once()
+    test_invalid_mode_rejected()
+    test_worker_start_stop()
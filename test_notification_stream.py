@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test the Notification Push Hub
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import asyncio
+import threading
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base
+from models import User
+from schemas import NotificationCreate
+from crud import create_notification
+from notification_hub import NotificationHub, LocalNotificationBackend, notification_hub
+
+def test_publish_from_worker_thread_reaches_subscriber():
+    """Sync handlers publish from threadpool threads, subscribers read on the event loop"""
+    print('Testing notification hub fan-out...')
+    hub = NotificationHub(LocalNotificationBackend(), max_pending=10)
+
+    async def scenario():
+        mine = hub.subscribe(user_id=1)
+        other = hub.subscribe(user_id=2)
+        thread = threading.Thread(target=hub.publish, args=(1, {"id": 7, "title": "New request"}))
+        thread.start()
+        thread.join()
+        payload = await asyncio.wait_for(mine.queue.get(), timeout=1)
+        assert payload["id"] == 7
+        assert other.queue.empty()
+        hub.unsubscribe(mine)
+        hub.unsubscribe(other)
+        assert hub.subscriber_count() == 0
+
+    asyncio.run(scenario())
+    print('SUCCESS: Published notification delivered')
+
+def test_create_notification_publishes():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(username="owner", email="owner@example.com", full_name="Owner", password_hash="x")
+    db.add(user)
+    db.commit()
+
+    async def scenario():
+        subscription = notification_hub.subscribe(user.id)
+        await asyncio.to_thread(create_notification, db, NotificationCreate(title="Hi", message="m", type="swap_request", user_id=user.id))
+        payload = await asyncio.wait_for(subscription.queue.get(), timeout=1)
+        notification_hub.unsubscribe(subscription)
+        return payload
+
+    payload = asyncio.run(scenario())
+    assert payload["title"] == "Hi" and payload["is_read"] is False
+    assert isinstance(payload["created_at"], str)
+    db.close()
+
+if __name__ == "__main__":
+    test_publish_from_worker_thread_reaches_subscriber()
+    test_create_notification_publishes()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test Connection Pool Metrics
+Uses an instrumented pool over a SQLite file, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import tempfile
+from sqlalchemy import create_engine, text
+from pool_metrics import InstrumentedQueuePool, get_pool_stats
+from database import get_async_database_url
+
+def test_pool_stats_track_checkouts():
+    print('Testing pool statistics...')
+    path = os.path.join(tempfile.mkdtemp(), "pool.db")
+    engine = create_engine(f"sqlite:///{path}", poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=1)
+
+    first = engine.connect()
+    second = engine.connect()
+    third = engine.connect()
+    first.execute(text("SELECT 1"))
+
+    stats = get_pool_stats(engine)
+    print(f'   {stats}')
+    assert stats["checked_out"] == 3
+    assert stats["overflow"] == 1
+    assert stats["checkout_wait"]["count"] == 3
+
+    for connection in (first, second, third):
+        connection.close()
+    stats = get_pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert sum(stats["checkout_wait"]["buckets"].values()) == 3
+    print('SUCCESS: Pool statistics working')
+
+def test_async_database_url():
+    assert get_async_database_url("sqlite:///./skill_swap.db") == "sqlite+aiosqlite:///./skill_swap.db"
+    assert get_async_database_url("mssql+pyodbc://server/db?driver=x").startswith("mssql+aioodbc://")
+
+if __name__ == "__main__":
+    test_pool_stats_track_checkouts()
+    test_async_database_url()
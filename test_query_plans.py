@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Test that the hot queries are served by the indexes declared in models.py
+Runs against a small seeded SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, text
+from database import Base
+from benchmark_query_plans import seed, hot_queries
+
+def test_hot_queries_use_indexes():
+    print('Checking query plans...')
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    seed(engine, user_count=50, skills_per_user=5)
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE"))
+        for name, query in hot_queries(user_id=10).items():
+            sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = " ; ".join(row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+            print(f'   {name}: {plan}')
+            assert "USING" in plan and "INDEX" in plan, f"{name} does not use an index"
+    print('SUCCESS: All hot queries use an index')
+
+if __name__ == "__main__":
+    test_hot_queries_use_indexes()
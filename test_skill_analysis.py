@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test Stored Skill Analysis
+Skill writes mark the analysis pending only when the analyzed content changes, the
+worker stores results for the content it analyzed, and edits made meanwhile win
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database import Base, settings
+from models import User, Skill, SkillAnalysis
+from schemas import SkillCreate, SkillUpdate
+import crud
+import skill_analysis
+from skill_analysis import analyze_skills, analysis_to_dict, backfill_ids, needs_analysis, status_of
+
+class FakeService:
+    """Stands in for GeminiAIService; on_batch runs while the 'model' is working"""
+
+    def __init__(self, on_batch=None, fail=False):
+        self.on_batch = on_batch
+        self.fail = fail
+        self.batches = []
+
+    async def analyze_skills_batch(self, skills, concurrency=1, timeout=None):
+        self.batches.append([skill["title"] for skill in skills])
+        if self.on_batch:
+            self.on_batch()
+        if self.fail:
+            return [None] * len(skills)
+        return [{
+            "enhanced_description": f"Professional {skill['title']}",
+            "keywords": [skill["title"].lower()],
+            "suggested_proficiency": "Advanced",
+            "related_skills": [],
+            "applications": []
+        } for skill in skills]
+
+    async def categorize_skill(self, title, description):
+        return {"suggested_category": "Music", "confidence": 0.9, "alternative_categories": [], "reasoning": "Instrument"}
+
+def make_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    owner = User(username="owner", email="owner@example.com", full_name="Owner", password_hash="x", is_active=True)
+    db.add(owner)
+    db.commit()
+    return Session, db, owner
+
+def new_skill(db, owner, title="Guitar"):
+    return crud.create_skill(db, SkillCreate(title=title, description="Chords and strumming", category="Music", proficiency_level="Beginner", value=1), owner.id)
+
+def test_pending_then_ready():
+    print('Testing skill analysis lifecycle...')
+    original = settings.skill_analysis_on_write
+    settings.skill_analysis_on_write = False
+    Session, db, owner = make_db()
+    try:
+        skill = new_skill(db, owner)
+        row = db.get(SkillAnalysis, skill.id)
+        assert row.status == "pending" and status_of(skill, row) == "pending"
+        assert needs_analysis(skill, row)
+        assert backfill_ids(db) == [skill.id]
+
+        service = FakeService()
+        assert analyze_skills(db, [skill.id], service) == {"ready": 1, "failed": 0, "skipped": 0}
+        db.expire_all()
+        row = db.get(SkillAnalysis, skill.id)
+        assert status_of(skill, row) == "ready" and not needs_analysis(skill, row)
+        stored = analysis_to_dict(row)
+        assert stored["enhanced_description"] == "Professional Guitar"
+        assert stored["suggested_category"] == "Music" and stored["category_confidence"] == 0.9
+        assert stored["fallback"] is False and row.suggested_proficiency == "Advanced"
+        assert backfill_ids(db) == []
+
+        # Current analyses are not redone
+        assert analyze_skills(db, [skill.id], service)["skipped"] == 1
+        assert len(service.batches) == 1
+
+        # A value change keeps the analysis, a description change makes it pending again
+        crud.update_skill(db, skill.id, SkillUpdate(value=5))
+        assert db.get(SkillAnalysis, skill.id).status == "ready"
+        crud.update_skill(db, skill.id, SkillUpdate(description="Fingerstyle"))
+        row = db.get(SkillAnalysis, skill.id)
+        assert row.status == "pending" and status_of(skill, row) == "pending"
+    finally:
+        settings.skill_analysis_on_write = original
+        db.close()
+    print('SUCCESS: Skill analysis lifecycle')
+
+def test_edit_during_analysis_wins():
+    print('Testing edits made during analysis...')
+    original = settings.skill_analysis_on_write
+    settings.skill_analysis_on_write = False
+    Session, db, owner = make_db()
+    try:
+        skill = new_skill(db, owner)
+
+        def edit_meanwhile():
+            other = Session()
+            crud.update_skill(other, skill.id, SkillUpdate(title="Bass guitar"))
+            other.close()
+
+        analyze_skills(db, [skill.id], FakeService(on_batch=edit_meanwhile))
+        db.expire_all()
+        skill = db.get(Skill, skill.id)
+        row = db.get(SkillAnalysis, skill.id)
+        # The analysis of "Guitar" was dropped, "Bass guitar" is still to be analyzed
+        assert row.status == "pending" and row.analysis is None
+        assert status_of(skill, row) == "pending"
+    finally:
+        settings.skill_analysis_on_write = original
+        db.close()
+    print('SUCCESS: Edits made during analysis')
+
+def test_failures_are_retried_then_reported():
+    print('Testing failed analyses...')
+    original = settings.skill_analysis_on_write
+    settings.skill_analysis_on_write = False
+    Session, db, owner = make_db()
+    try:
+        skill = new_skill(db, owner)
+        for attempt in range(1, skill_analysis.MAX_ATTEMPTS + 1):
+            assert analyze_skills(db, [skill.id], FakeService(fail=True))["failed"] == 1
+            db.expire_all()
+            row = db.get(SkillAnalysis, skill.id)
+            assert row.status == "failed" and row.attempts == attempt
+        assert status_of(skill, row) == "failed"
+        assert not needs_analysis(skill, row)
+        # The backfill still picks it up
+        assert backfill_ids(db) == [skill.id]
+    finally:
+        settings.skill_analysis_on_write = original
+        db.close()
+    print('SUCCESS: Failed analyses')
+
+def test_deleting_skill_deletes_analysis():
+    print('Testing skill deletion...')
+    original = settings.skill_analysis_on_write
+    settings.skill_analysis_on_write = False
+    Session, db, owner = make_db()
+    try:
+        skill = new_skill(db, owner)
+        skill_id = skill.id
+        db.delete(skill)
+        db.commit()
+        assert db.get(SkillAnalysis, skill_id) is None
+    finally:
+        settings.skill_analysis_on_write = original
+        db.close()
+    print('SUCCESS: Skill deletion')
+
+if __name__ == "__main__":
+    test_pending_then_ready()
+    test_edit_during_analysis_wins()
+    test_failures_are_retried_then_reported()
+    test_deleting_skill_deletes_analysis()
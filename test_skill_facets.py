@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test Skill Catalogue Facets
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base
+from models import User
+from schemas import SkillCreate, SkillUpdate, SkillFacetsResponse
+from catalog_cache import VersionedCache, skill_catalog_cache
+import crud
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    db = sessionmaker(bind=engine)()
+    owner = User(username="owner", email="owner@example.com", full_name="Owner", password_hash="x", is_active=True)
+    db.add(owner)
+    db.commit()
+    return db, owner.id, statements
+
+def add_skill(db, owner_id, category, level):
+    return crud.create_skill(db, SkillCreate(title=f"{category} {level}", description="Details", category=category, proficiency_level=level, value=1), owner_id)
+
+def counts(facet):
+    return {entry["value"]: entry["count"] for entry in facet}
+
+def test_disjunctive_facet_counts():
+    print('Testing facet counts...')
+    db, owner_id, statements = make_session()
+    for category, level in [("Music", "Beginner"), ("Music", "Advanced"), ("Music", "Advanced"), ("Programming", "Advanced"), ("Art", "Expert")]:
+        add_skill(db, owner_id, category, level)
+    crud.delete_skill(db, add_skill(db, owner_id, "Art", "Beginner").id)
+
+    statements.clear()
+    facet_counts = crud.get_skill_facet_counts(db)
+    assert len(statements) == 1
+
+    facets = crud.summarize_facets(facet_counts)
+    assert facets["total"] == 5
+    assert facets["category"][0] == {"value": "Music", "count": 3}
+    assert counts(facets["proficiency_level"]) == {"Advanced": 3, "Beginner": 1, "Expert": 1}
+
+    facets = crud.summarize_facets(facet_counts, category="Music", proficiency_level="Advanced")
+    assert facets["total"] == 2
+    # Each facet ignores its own filter
+    assert counts(facets["category"]) == {"Music": 2, "Programming": 1}
+    assert counts(facets["proficiency_level"]) == {"Advanced": 2, "Beginner": 1}
+    SkillFacetsResponse.model_validate(facets)
+    print('SUCCESS: Facets counted from one grouped query')
+    db.close()
+
+def test_cache_invalidated_by_skill_writes():
+    print('Testing facet cache invalidation...')
+    db, owner_id, _ = make_session()
+    skill = add_skill(db, owner_id, "Music", "Beginner")
+    version = skill_catalog_cache.version
+    skill_catalog_cache.put("facet_counts", crud.get_skill_facet_counts(db), version)
+    assert skill_catalog_cache.get("facet_counts") == [("Music", "Beginner", 1)]
+
+    crud.update_skill(db, skill.id, SkillUpdate(category="Art"))
+    assert skill_catalog_cache.version > version
+    assert skill_catalog_cache.get("facet_counts") is None
+    # A value computed before a write must not be stored under the new version
+    skill_catalog_cache.put("facet_counts", [("Music", "Beginner", 1)], version)
+    assert skill_catalog_cache.get("facet_counts") is None
+    print('SUCCESS: Skill writes invalidate cached facets')
+    db.close()
+
+def test_versioned_cache_bounds():
+    cache = VersionedCache(ttl_seconds=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper(), cache.version)
+    assert cache.get("a") is None and cache.get("c") == "C" and len(cache) == 2
+    assert VersionedCache(ttl_seconds=0, max_entries=2).put("a", 1, 1) is None
+
+if __name__ == "__main__":
+    test_disjunctive_facet_counts()
+    test_cache_invalidated_by_skill_writes()
+    test_versioned_cache_bounds()
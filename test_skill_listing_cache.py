@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test Cached Public Skill Listing (ETag / If-None-Match)
+Runs the skills router against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import asyncio
+import tempfile
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base, get_async_db
+from models import User
+from schemas import SkillCreate, UserUpdate
+from catalog_cache import skill_catalog_cache, etag_matches
+from routers import skills
+import crud
+
+def make_client(db_path):
+    """Sync session for seeding, and a client whose async sessions use the same SQLite file"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=StaticPool)
+    queries = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statement.startswith("SELECT") and queries.append(statement))
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(skills.router, prefix="/api/skills")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return sessionmaker(bind=engine)(), TestClient(app), queries, async_engine
+
+def test_listing_cached_with_etag():
+    print('Testing cached skill listing...')
+    db, client, queries, async_engine = make_client(os.path.join(tempfile.mkdtemp(), "listing.db"))
+    skill_catalog_cache.bump()
+    owner = User(username="owner", email="owner@example.com", full_name="Owner", password_hash="x", is_active=True)
+    db.add(owner)
+    db.commit()
+    skill = crud.create_skill(db, SkillCreate(title="Guitar", description="Chords", category="Music", proficiency_level="Advanced", value=1), owner.id)
+
+    first = client.get("/api/skills/?limit=10")
+    assert first.status_code == 200 and first.json()[0]["owner"]["username"] == "owner"
+    etag = first.headers["etag"]
+    query_count = len(queries)
+
+    # Served from the cache, then revalidated without a body
+    again = client.get("/api/skills/?limit=10")
+    assert again.content == first.content and again.headers["etag"] == etag
+    not_modified = client.get("/api/skills/?limit=10", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert len(queries) == query_count
+    # Different parameters are cached separately
+    assert client.get("/api/skills/?limit=10&category=Art").json() == []
+
+    # An owner profile change invalidates listings that embed it
+    crud.update_user(db, owner.id, UserUpdate(full_name="Renamed Owner"))
+    changed = client.get("/api/skills/?limit=10", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()[0]["owner"]["full_name"] == "Renamed Owner"
+    assert changed.headers["etag"] != etag
+
+    crud.delete_skill(db, skill.id)
+    assert client.get("/api/skills/?limit=10").json() == []
+    assert client.get("/api/skills/?cursor=garbage").status_code == 400
+    print('SUCCESS: Listing cached, revalidated and invalidated')
+    db.close()
+    asyncio.run(async_engine.dispose())
+
+def test_if_none_match_parsing():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"') and not etag_matches(None, '"b"')
+
+if __name__ == "__main__":
+    test_listing_cached_with_etag()
+    test_if_none_match_parsing()
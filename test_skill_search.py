@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test Skill Search Index
+Runs against an in-memory SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import threading
+import time
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base
+from models import User
+from schemas import SkillCreate, SkillUpdate
+from skill_search import SkillSearchIndex, skill_search_index
+import crud
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    owner = User(username="owner", email="owner@example.com", full_name="Owner", password_hash="x", is_active=True)
+    db.add(owner)
+    db.commit()
+    return db, owner.id
+
+def skill(title, description, category="Programming"):
+    return SkillCreate(title=title, description=description, category=category, proficiency_level="Advanced", value=5)
+
+def test_ranking_and_prefix_matching():
+    print('Testing BM25 ranking and prefix matching...')
+    index = SkillSearchIndex()
+    index.loaded_at = 0
+    index.index_skill(SimpleNamespace(id=1, title="Python web development", description="Flask and Django", category="Programming", is_active=True))
+    index.index_skill(SimpleNamespace(id=2, title="Guitar", description="Play python riffs on guitar", category="Music", is_active=True))
+    index.index_skill(SimpleNamespace(id=3, title="Pottery", description="Wheel throwing", category="Art", is_active=True))
+
+    # Title matches outrank description matches
+    assert index.search("python") == [1, 2]
+    assert index.search("pyth") == [1, 2]
+    assert index.search("PYTHON guitar") == [2]
+    assert index.search("python", category="Music") == [2]
+    assert index.search("po") == [3]
+    assert index.search("rust") == [] and index.search("  ") == []
+    print('SUCCESS: Ranking and prefix matching work')
+
+def test_index_follows_crud_writes():
+    print('Testing incremental index maintenance...')
+    db, owner_id = make_session()
+    first = crud.create_skill(db, skill("Spanish conversation", "Practice speaking Spanish"), owner_id)
+    skill_search_index.load(db)
+    assert skill_search_index.search("spanish") == [first.id]
+
+    second = crud.create_skill(db, skill("Italian cooking", "Fresh pasta from scratch", "Cooking"), owner_id)
+    assert skill_search_index.search("pasta") == [second.id]
+
+    crud.update_skill(db, first.id, SkillUpdate(title="French conversation", description="Practice speaking French"))
+    assert skill_search_index.search("spanish") == []
+    assert skill_search_index.search("fren") == [first.id]
+
+    crud.delete_skill(db, second.id)
+    assert skill_search_index.search("pasta") == []
+    assert len(skill_search_index) == 1
+    assert crud.get_skills_by_ids(db, [second.id, first.id]) == [crud.get_skill(db, first.id)]
+
+    # A rebuild from the database gives the same answers as the incremental updates
+    rebuilt = SkillSearchIndex()
+    rebuilt.ensure_loaded(db)
+    assert rebuilt.search("fren") == [first.id] and len(rebuilt) == 1
+    print('SUCCESS: Index follows creates, updates and deletes')
+    db.close()
+
+def test_concurrent_first_loads_build_once():
+    print('Testing concurrent first loads...')
+    reads = []
+    index_written = threading.Event()
+
+    class SlowIndex(SkillSearchIndex):
+        @staticmethod
+        def _read_active_skills(db):
+            reads.append(db)
+            # An index update arriving mid-load must not wait for the load to finish
+            updater = threading.Thread(target=index.index_skill, args=(
+                SimpleNamespace(id=2, title="Rust", description="Ownership", category="Programming", is_active=True),
+            ))
+            updater.start()
+            updater.join(timeout=2)
+            if not updater.is_alive():
+                index_written.set()
+            time.sleep(0.05)
+            return [(1, "Python", "Scripts", "Programming")]
+
+    index = SlowIndex()
+    threads = [threading.Thread(target=index.ensure_loaded, args=(object(),)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(reads) == 1 and index_written.is_set()
+    assert index.search("python") == [1] and index.search("rust") == [2]
+    print('SUCCESS: Concurrent first loads build once')
+
+if __name__ == "__main__":
+    test_ranking_and_prefix_matching()
+    test_index_follows_crud_writes()
+    test_concurrent_first_loads_build_once()
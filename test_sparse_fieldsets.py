@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test Sparse Fieldsets (fields=) on List Endpoints
+Runs against a temporary SQLite database, no server required
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import asyncio
+import tempfile
+from datetime import datetime
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import User, Skill, SkillExchangeRequest
+from pagination import next_cursor
+import crud
+import crud_async
+import fast_json
+
+def seed(path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    db = sessionmaker(bind=engine)()
+    owner = User(username="owner", email="owner@example.com", full_name="Owner", password_hash="x", is_active=True)
+    learner = User(username="learner", email="learner@example.com", full_name="Learner", password_hash="x", is_active=True)
+    db.add_all([owner, learner])
+    db.flush()
+    for i in range(5):
+        skill = Skill(user_id=owner.id, title=f"Skill {i}", description="Details", category="Music", proficiency_level="Advanced", value=i, is_active=True,
+                      created_at=datetime(2026, 1, 1, 12, 0, i))
+        db.add(skill)
+        db.flush()
+        db.add(SkillExchangeRequest(skill_id=skill.id, requester_id=learner.id, skill_owner_id=owner.id, message="Teach me", status="pending",
+                                    created_at=datetime(2026, 1, 2, 12, 0, i)))
+    db.commit()
+    return db, learner.id, statements
+
+def test_projection_parsing():
+    projection = fast_json.SKILLS.project("title, id,owner.username")
+    assert projection.fields == ["title", "id"] and projection.nested == {"owner": ["username"]}
+    assert list(fast_json.SKILLS.project("owner").nested["owner"]) == list(fast_json.USER_FIELDS)
+    assert fast_json.SKILLS.project("title").nested == {}
+    for bad in ("password_hash", "owner.password_hash", "title.x", " , "):
+        try:
+            fast_json.SKILLS.project(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad!r} should be rejected")
+
+def test_exchange_fields_narrow_sql_and_payload():
+    print('Testing sparse exchange listing...')
+    db, learner_id, statements = seed(os.path.join(tempfile.mkdtemp(), "sparse.db"))
+    statements.clear()
+    rows = crud.get_skill_exchange_rows_for_user(db, learner_id, limit=3, fields="id,status,skill.title")
+    sql = statements[-1]
+    assert "JOIN skills" in sql and "JOIN users" not in sql and "message" not in sql
+    assert rows[0] == {"id": 5, "status": "pending", "skill": {"title": "Skill 4"}}
+
+    # Cursor still works although created_at is not in the payload
+    cursor = next_cursor(rows, 3)
+    rest = crud.get_skill_exchange_rows_for_user(db, learner_id, limit=3, cursor=cursor, fields="id")
+    assert [row["id"] for row in rest] == [2, 1]
+    print('SUCCESS: Only requested columns selected and emitted')
+    db.close()
+
+def test_skill_and_user_fields():
+    path = os.path.join(tempfile.mkdtemp(), "sparse.db")
+    db, _, _ = seed(path)
+    db.close()
+
+    async def check():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        statements = []
+        event.listen(async_engine.sync_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+        try:
+            async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+                skills = await crud_async.get_skill_rows(session, limit=2, fields="id,title")
+                assert skills == [{"id": 5, "title": "Skill 4"}, {"id": 4, "title": "Skill 3"}]
+                assert "JOIN" not in statements[-1]
+                skills = await crud_async.get_skill_rows(session, limit=1, fields="title,owner.username")
+                assert skills == [{"title": "Skill 4", "owner": {"username": "owner"}}]
+                users = await crud_async.get_user_rows(session, fields="username")
+                assert sorted(user["username"] for user in users) == ["learner", "owner"]
+                assert "email" not in statements[-1]
+        finally:
+            await async_engine.dispose()
+    asyncio.run(check())
+
+if __name__ == "__main__":
+    test_projection_parsing()
+    test_exchange_fields_narrow_sql_and_payload()
+    test_skill_and_user_fields()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Test that DB-bound route handlers never block the event loop
+Sync-session handlers must be plain def (run on the threadpool),
+async handlers must use the AsyncSession from get_async_db
+"""
+
+import os
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import inspect
+from database import get_db
+from routers import users, skills, exchanges
+
+def uses_sync_session(endpoint):
+    return any(getattr(param.default, "dependency", None) is get_db for param in inspect.signature(endpoint).parameters.values())
+
+def test_db_handlers_do_not_block():
+    """Async handlers must not take a sync Session"""
+    print('Checking route handlers...')
+    for router in (users.router, skills.router, exchanges.router):
+        for route in router.routes:
+            is_async = inspect.iscoroutinefunction(route.endpoint)
+            print(f'   {route.path}: {route.endpoint.__name__} ({"async" if is_async else "threadpool"})')
+            assert not (is_async and uses_sync_session(route.endpoint)), f"{route.endpoint.__name__} blocks the event loop"
+    print('SUCCESS: No handler blocks the event loop')
+
+if __name__ == "__main__":
+    test_db_handlers_do_not_block()